@@ -0,0 +1,37 @@
+import sys
+import timeit
+
+import numpy as np
+import pandas as pd
+
+from cdnsim.requests import BaseRequests
+
+# Benchmark of BaseRequests.merge_requests: merge time by fan-in (number of merged DataFrames) and batch size (number of
+# contents per DataFrame), compared to the former recursive pairwise merge (while it fits in the recursion limit).
+
+
+def recursive(dfs: list) -> BaseRequests:
+    if len(dfs) == 1:
+        return dfs[0]
+    return dfs[0].add(recursive(dfs[1:]), fill_value=0)
+
+
+def batches(k: int, n: int, cbase: int, rng: np.random.Generator) -> list:
+    return [BaseRequests(data={'freq': rng.integers(1, 100, size=n)},
+                         index=pd.MultiIndex.from_arrays([rng.choice(cbase, size=n, replace=False)],
+                                                         names=['content']))
+            for _ in range(k)]
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    sys.setrecursionlimit(10000)
+
+    print(f"{'k':>6} {'batch':>8} {'merge [ms]':>12} {'recursive [ms]':>16}")
+    for n in [100, 10000]:
+        for k in [2, 10, 100, 1000]:
+            dfs = batches(k, n, 10 * n, rng)
+            number = max(1, 200 // k)
+            merge = timeit.timeit(lambda: BaseRequests.merge_requests(dfs), number=number) / number * 1000
+            old = timeit.timeit(lambda: recursive(dfs), number=1) * 1000 if k <= 100 else float('nan')
+            print(f"{k:>6} {n:>8} {merge:>12.2f} {old:>16.2f}")
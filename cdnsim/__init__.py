@@ -1,3 +1,7 @@
 from .client import Client
 from .origin import Origin
 from .cache import Cache
+from .router import HashRing, RouterMixIn
+from .stats import StatsMixIn, collect
+from .binlog import BinaryLog, read_log
+from .topology import Topology
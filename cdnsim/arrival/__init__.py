@@ -1 +1,3 @@
 from .arrival import Arrival
+from .chunked import ChunkedArrival
+from .processes import Poisson, Constant, Diurnal, MMPP, Trace
@@ -24,6 +24,26 @@ class Arrival(ABC):
             raise StopIteration
         return None
 
+    def _advance(self, n: int) -> int:
+        """
+        Move the tick forward by up to *n* ticks, ending the iteration if there are no ticks left.
+
+        :return: number of ticks moved
+        """
+        n = max(0, min(n, self.__ticks - self.__tick - 1))
+        if n == 0:
+            del self.__tick
+        else:
+            self.__tick += n
+        return n
+
+    @property
+    def ticks(self) -> int:
+        """
+        returns the number of ticks.
+        """
+        return self.__ticks
+
     @property
     def tick(self) -> int:
         """
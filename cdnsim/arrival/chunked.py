@@ -0,0 +1,64 @@
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+from cdnsim.arrival.arrival import Arrival
+
+
+class ChunkedArrival(Arrival, ABC):
+    """
+    Arrival process generating the number of requests of whole tick ranges at once, in NumPy chunks. Iterate it tick by
+    tick as any Arrival, or take many ticks at once with batch().
+    """
+    # number of ticks generated at once
+    chunk: int = 4096
+
+    def __iter__(self):
+        super().__iter__()
+        self.__counts = np.zeros(0, dtype=np.int64)
+        self.__start = 0
+        return self
+
+    def __next__(self) -> int:
+        super().__next__()
+        return int(self.__take(self.tick, 1)[0])
+
+    def batch(self, n: int) -> np.ndarray:
+        """
+        Take the next *n* ticks at once, the tick property moves to the last of them. Continues the current iteration,
+        starts one if there is none.
+
+        :param n: number of ticks
+        :return: number of requests of each tick, shorter at the end of the ticks, empty if there are no ticks left
+                 (this ends the iteration)
+        """
+        try:
+            first = self.tick + 1
+        except AttributeError:
+            iter(self)
+            first = 0
+        return self.__take(first, self._advance(n))
+
+    def __take(self, first: int, n: int) -> np.ndarray:
+        """
+        :return: the counts of the ticks [first, first + n), generating chunks as needed
+        """
+        offset = first - self.__start
+        missing = offset + n - len(self.__counts)
+        if missing > 0:
+            end = self.__start + len(self.__counts)
+            generated = self._generate(end, min(max(missing, self.chunk), self.ticks - end))
+            self.__counts = np.concatenate([self.__counts[offset:], np.asarray(generated, dtype=np.int64)])
+            self.__start, offset = first, 0
+        return self.__counts[offset:offset + n]
+
+    @abstractmethod
+    def _generate(self, start: int, n: int) -> np.ndarray:
+        """
+        Called with consecutive tick ranges.
+
+        :param start: first tick
+        :param n: number of ticks
+        :return: number of requests of the ticks [start, start + n)
+        """
+        ...
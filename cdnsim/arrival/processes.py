@@ -0,0 +1,137 @@
+from typing import Sequence
+
+import numpy as np
+
+from cdnsim.arrival.chunked import ChunkedArrival
+
+
+class Poisson(ChunkedArrival):
+    """
+    Poisson number of requests per tick.
+    """
+
+    def __init__(self, lam: float, rng: np.random.Generator = None, **kwargs):
+        """
+        :param lam: mean number of requests per tick
+        :param rng: random generator, a new one if not given
+        """
+        super().__init__(**kwargs)
+        if lam < 0:
+            raise ValueError(f"lambda for poisson should be non-negative, got: {lam}")
+        self.__lam = lam
+        self.__rng = np.random.default_rng() if rng is None else rng
+
+    def _generate(self, start: int, n: int) -> np.ndarray:
+        return self.__rng.poisson(self.__lam, n)
+
+
+class Constant(ChunkedArrival):
+    """
+    Constant rate: fractional rates are spread over the ticks, the first *t* ticks have floor(t * rate) requests (rate
+    1.1 gives 1, 1, 1, 1, 1, 1, 1, 1, 1, 2).
+    """
+
+    def __init__(self, rate: float, **kwargs):
+        """
+        :param rate: number of requests per tick
+        """
+        super().__init__(**kwargs)
+        if rate < 0:
+            raise ValueError(f"rate should be non-negative, got: {rate}")
+        self.__rate = rate
+
+    def _generate(self, start: int, n: int) -> np.ndarray:
+        return np.diff(np.floor(np.arange(start, start + n + 1) * self.__rate + 1e-9).astype(np.int64))
+
+
+class Diurnal(ChunkedArrival):
+    """
+    Sinusoidal daily pattern: mean * (1 + amplitude * sin(2 pi (tick / period) + phase)) requests per tick, Poisson
+    distributed.
+    """
+
+    def __init__(self, mean: float, amplitude: float, period: int, phase: float = 0, rng: np.random.Generator = None,
+                 **kwargs):
+        """
+        :param mean: mean number of requests per tick
+        :param amplitude: relative amplitude, in [0, 1]
+        :param period: ticks of a period (a day)
+        :param phase: phase shift in radians
+        :param rng: random generator, a new one if not given
+        """
+        super().__init__(**kwargs)
+        if mean < 0 or not 0 <= amplitude <= 1 or period <= 0:
+            raise ValueError(f"Wrong diurnal parameters: mean={mean}, amplitude={amplitude}, period={period}")
+        self.__mean = mean
+        self.__amplitude = amplitude
+        self.__period = period
+        self.__phase = phase
+        self.__rng = np.random.default_rng() if rng is None else rng
+
+    def rate(self, ticks: np.ndarray) -> np.ndarray:
+        """
+        :return: mean number of requests of the ticks
+        """
+        return self.__mean * (1 + self.__amplitude * np.sin(2 * np.pi * np.asarray(ticks) / self.__period +
+                                                            self.__phase))
+
+    def _generate(self, start: int, n: int) -> np.ndarray:
+        return self.__rng.poisson(self.rate(np.arange(start, start + n)))
+
+
+class MMPP(ChunkedArrival):
+    """
+    Markov modulated Poisson process: a Markov chain of states switches at tick boundaries, requests are Poisson
+    distributed with the rate of the current state.
+    """
+
+    def __init__(self, rates: Sequence[float], transitions: Sequence[Sequence[float]], state: int = 0,
+                 rng: np.random.Generator = None, **kwargs):
+        """
+        :param rates: mean number of requests per tick of each state
+        :param transitions: transition probabilities per tick, rows sum up to 1
+        :param state: initial state
+        :param rng: random generator, a new one if not given
+        """
+        super().__init__(**kwargs)
+        self.__rates = np.asarray(rates, dtype=float)
+        self.__transitions = np.asarray(transitions, dtype=float)
+        if self.__transitions.shape != (len(self.__rates), len(self.__rates)) or \
+                not np.allclose(self.__transitions.sum(axis=1), 1) or (self.__rates < 0).any():
+            raise ValueError(f"Wrong MMPP parameters: rates {rates}, transitions {transitions}")
+        self.__state = state
+        self.__rng = np.random.default_rng() if rng is None else rng
+
+    def _generate(self, start: int, n: int) -> np.ndarray:
+        # states by sojourns: a state is kept for a geometric number of ticks, then left by the off-diagonal transitions
+        states = np.empty(n, dtype=np.int64)
+        i = 0
+        while i < n:
+            stay = self.__transitions[self.__state, self.__state]
+            length = n - i + 1 if stay >= 1 else int(self.__rng.geometric(1 - stay))
+            if length > n - i:
+                # continues in the next chunk, the geometric sojourn is memoryless
+                states[i:] = self.__state
+                break
+            states[i:i + length] = self.__state
+            i += length
+            leave = self.__transitions[self.__state].copy()
+            leave[self.__state] = 0
+            self.__state = int(self.__rng.choice(len(leave), p=leave / leave.sum()))
+        return self.__rng.poisson(self.__rates[states])
+
+
+class Trace(ChunkedArrival):
+    """
+    Replays recorded numbers of requests per tick.
+    """
+
+    def __init__(self, counts: Sequence[int], **kwargs):
+        """
+        :param counts: number of requests of each tick
+        """
+        self.__counts = np.asarray(counts, dtype=np.int64)
+        super().__init__(ticks=len(self.__counts), **kwargs)
+
+    def _generate(self, start: int, n: int) -> np.ndarray:
+        return self.__counts[start:start + n]
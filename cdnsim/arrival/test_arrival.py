@@ -1,6 +1,8 @@
 from unittest import TestCase
 
-from cdnsim.arrival import Arrival
+import numpy as np
+
+from cdnsim.arrival import Arrival, Poisson, Constant, Diurnal, MMPP, Trace
 
 
 class TestArrival(TestCase):
@@ -18,3 +20,51 @@ class TestArrival(TestCase):
 
         with self.assertRaises(AttributeError):
             self.assertEqual(0, a.tick)
+
+
+class TestProcesses(TestCase):
+    def test_constant(self):
+        self.assertListEqual([1, 1, 1, 1, 1, 1, 1, 1, 1, 2], list(Constant(rate=1.1, ticks=10)))
+        self.assertListEqual([0, 1, 0, 1], list(Constant(rate=0.5, ticks=4)))
+        self.assertEqual(3300, sum(Constant(rate=1.1, ticks=3000)))
+
+    def test_batch(self):
+        c = Constant(rate=2.5, ticks=10)
+        c.chunk = 3
+        self.assertListEqual([2, 3, 2], list(c.batch(3)))
+        self.assertEqual(2, c.tick)
+        self.assertEqual(3, next(c))
+        self.assertListEqual([2, 3, 2, 3, 2, 3], list(c.batch(100)))
+        self.assertEqual(9, c.tick)
+        self.assertEqual(0, len(c.batch(1)))
+        with self.assertRaises(AttributeError):
+            c.tick
+
+        # same counts, by iteration or batches
+        p = Poisson(lam=10, ticks=100, rng=np.random.default_rng(0))
+        q = Poisson(lam=10, ticks=100, rng=np.random.default_rng(0))
+        q.chunk = 7
+        self.assertListEqual(list(p), list(q.batch(40)) + list(q.batch(60)))
+
+    def test_processes(self):
+        rng = np.random.default_rng(0)
+        self.assertAlmostEqual(10, Poisson(lam=10, ticks=10000, rng=rng).batch(10000).mean(), delta=0.2)
+
+        d = Diurnal(mean=100, amplitude=0.5, period=100, ticks=1000, rng=rng)
+        counts = d.batch(1000).reshape(10, 100).mean(axis=0)
+        self.assertGreater(counts[25], 130)
+        self.assertLess(counts[75], 70)
+
+        m = MMPP(rates=[1, 100], transitions=[[0.9, 0.1], [0.1, 0.9]], ticks=10000, rng=rng)
+        counts = m.batch(10000)
+        self.assertAlmostEqual(50.5, counts.mean(), delta=5)
+        self.assertGreater((counts < 10).mean(), 0.4)
+        # long sojourns
+        self.assertLess(np.count_nonzero(np.diff(counts > 50)), 2000)
+
+        self.assertListEqual([3, 1, 4], list(Trace(counts=[3, 1, 4])))
+
+        with self.assertRaises(ValueError):
+            Poisson(lam=-1, ticks=1)
+        with self.assertRaises(ValueError):
+            MMPP(rates=[1, 2], transitions=[[1, 0]], ticks=1)
@@ -0,0 +1,86 @@
+import json
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# format version of the metadata
+VERSION = 1
+
+
+class BinaryLog:
+    """
+    Append only, columnar log of per tick records of the nodes: a directory per node, holding a raw little endian int64
+    file per column and a meta.json of the column names. Columns are appended in bulk, and read back memory mapped
+    with load() or read_log().
+
+    Every node writes its own files only, so nodes may log from different threads and worker processes.
+    """
+
+    def __init__(self, path: str | Path, overwrite: bool = False):
+        """
+        :param path: log directory
+        :param overwrite: remove an existing log, otherwise an existing non-empty directory is an error
+        """
+        self.__path = Path(path)
+        if self.__path.exists() and any(self.__path.iterdir()):
+            if not overwrite:
+                raise FileExistsError(f"Log directory {self.__path} is not empty")
+            shutil.rmtree(self.__path)
+        self.__path.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def path(self) -> Path:
+        return self.__path
+
+    def append(self, node: str, columns: dict[str, np.ndarray]) -> None:
+        """
+        Append records of a node.
+
+        :param node: node name
+        :param columns: integer columns of the records, of the same length, always the same columns for a node
+        """
+        directory = self.__path / node.replace('/', '_')
+        meta = directory / 'meta.json'
+        if not meta.exists():
+            directory.mkdir()
+            meta.write_text(json.dumps({'version': VERSION, 'node': node, 'columns': list(columns)}))
+        elif json.loads(meta.read_text())['columns'] != list(columns):
+            raise ValueError(f"Columns of {node} changed: {list(columns)}")
+        for name, column in columns.items():
+            with open(directory / f"{name}.bin", 'ab') as f:
+                np.asarray(column).astype('<i8').tofile(f)
+
+
+def load(directory: str | Path) -> dict[str, np.ndarray]:
+    """
+    :param directory: directory of a node in a BinaryLog
+    :return: memory mapped columns of the node, by name
+    """
+    directory = Path(directory)
+    meta = json.loads((directory / 'meta.json').read_text())
+    if meta['version'] != VERSION:
+        raise ValueError(f"Unsupported log version {meta['version']}, expected {VERSION}")
+    sizes = [(directory / f"{name}.bin").stat().st_size // 8 for name in meta['columns']]
+    # a partially written chunk (of an interrupted run) is cut off
+    rows = min(sizes)
+    return {name: np.memmap(directory / f"{name}.bin", dtype='<i8', mode='r', shape=(rows,)) if rows else
+            np.zeros(0, dtype=np.int64) for name in meta['columns']}
+
+
+def read_log(path: str | Path) -> pd.DataFrame:
+    """
+    :param path: BinaryLog directory
+    :return: tidy DataFrame of the records of all nodes: node column, then the columns of the nodes (zero for columns a
+             node does not have)
+    """
+    frames = []
+    for meta in sorted(Path(path).glob('*/meta.json')):
+        frames.append(pd.DataFrame(load(meta.parent)).assign(node=json.loads(meta.read_text())['node']))
+    if not frames:
+        return pd.DataFrame(columns=['node'])
+    df = pd.concat(frames, ignore_index=True)
+    columns = [column for column in df.columns if column != 'node']
+    df[columns] = df[columns].fillna(0).astype(np.int64)
+    return df[['node', *columns]]
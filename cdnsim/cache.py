@@ -1,8 +1,16 @@
 from abc import ABC
 
+from cdnsim.stats import StatsMixIn
 from nodes.log import LoggerMixIn
 from nodes.node import INode
 
 
-class Cache(LoggerMixIn, INode, ABC):
-    ...
+class Cache(StatsMixIn, LoggerMixIn, INode, ABC):
+    def _split(self, requests) -> list:
+        """
+        Split the requests to the downstreams, as round-robin. See cdnsim.router.RouterMixIn for content routing.
+
+        :param requests: requests to send
+        :return: one part for each downstream
+        """
+        return requests.split_rr(len(self.downstreams))
@@ -0,0 +1,3 @@
+from .events import Events, EventsCodec
+from .cache import EventCache, LatencyHistogram
+from .client import EventMixIn
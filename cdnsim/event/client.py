@@ -0,0 +1,22 @@
+import numpy as np
+
+from cdnsim.event.events import Events
+
+
+class EventMixIn:
+    """
+    Sends Events instead of Requests: the requests of each tick are spread uniformly at random over the tick. Mix into a
+    Client (before it, and before a RouterMixIn), its _split() receives Events.
+    """
+
+    def __init__(self, interval: float = 1., rng: np.random.Generator = None, **kwargs):
+        """
+        :param interval: length of a tick, in seconds
+        :param rng: random generator, a new one if not given
+        """
+        self.__interval = interval
+        self.__rng = np.random.default_rng() if rng is None else rng
+        super().__init__(**kwargs)
+
+    def _split(self, requests) -> list:
+        return super()._split(Events.from_requests(requests, self.__interval, self.__rng))
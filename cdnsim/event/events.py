@@ -0,0 +1,155 @@
+from typing import List, Self, Sequence
+
+import numpy as np
+
+from cdnsim.requests import Requests, split
+from nodes.shm import Codec
+
+
+class Events:
+    """
+    NumPy backed batch of single requests with timestamps, for event level simulation within ticks: the time (in
+    seconds), content and size of each request, sorted by time. Unlike Requests, requests of the same content are not
+    aggregated.
+    """
+    __slots__ = ('time', 'content', 'size')
+
+    @classmethod
+    def _wrap(cls, time: np.ndarray, content: np.ndarray, size: np.ndarray) -> Self:
+        """
+        Create a batch of already sorted columns, without copying or validation.
+        """
+        events = object.__new__(cls)
+        events.time = time
+        events.content = content
+        events.size = size
+        return events
+
+    @classmethod
+    def merge_events(cls, batches: List[Self]) -> Self:
+        """
+        Merge batches into a single one, sorted by time. Requests of the same time keep the order of the batches.
+
+        :param batches: batches to merge
+        :return: merged batch
+        """
+        if len(batches) == 0:
+            raise ValueError("Cannot merge an empty list of Events")
+
+        if len(batches) == 1:
+            return batches[0]
+
+        time = np.concatenate([b.time for b in batches])
+        # sorted runs are merged by the stable sort (timsort) in linear time
+        order = np.argsort(time, kind='stable')
+        return cls._wrap(time[order], np.concatenate([b.content for b in batches])[order],
+                         np.concatenate([b.size for b in batches])[order])
+
+    @classmethod
+    def from_requests(cls, requests: Requests, interval: float = 1., rng: np.random.Generator = None) -> Self:
+        """
+        Spread the requests of each tick uniformly at random over the tick.
+
+        :param requests: requests to spread
+        :param interval: length of a tick, in seconds
+        :param rng: random generator, a new one if not given
+        :return: a request for each request of *requests*
+        """
+        rng = np.random.default_rng() if rng is None else rng
+        tick, content, size = (np.repeat(column, requests.freq) for column in
+                               (requests.tick, requests.content, requests.size))
+        time = (tick + rng.random(len(tick))) * interval
+        order = np.argsort(time, kind='stable')
+        return cls._wrap(time[order], content[order], size[order])
+
+    def __init__(self, time, content, size=None):
+        """
+        :param time: time of the requests, in seconds
+        :param content: integer content ids
+        :param size: size of the contents, zero if not given
+        """
+        time = np.asarray(time, dtype=np.float64)
+        content = np.asarray(content, dtype=np.int64)
+        size = np.zeros(len(content), dtype=np.int64) if size is None else np.asarray(size, dtype=np.int64)
+        if not time.ndim == content.ndim == size.ndim == 1 or not len(time) == len(content) == len(size):
+            raise ValueError(f"Column length mismatch: {len(time)} times, {len(content)} contents, {len(size)} size")
+
+        order = np.argsort(time, kind='stable')
+        self.time, self.content, self.size = time[order], content[order], size[order]
+
+    def __len__(self) -> int:
+        return len(self.content)
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} of {len(self)} requests>"
+
+    def split_rr(self, parts: int) -> List[Self]:
+        """
+        Split as round-robin, request by request.
+        """
+        if not isinstance(parts, int) or parts < 1:
+            raise ValueError(f"Cannot divide {self.__class__.__name__} into {parts} parts")
+
+        return [self.__select(slice(i, None, parts)) for i in range(parts)]
+
+    def split_random(self, parts: int | Sequence[float], rng: np.random.Generator = None) -> List[Self]:
+        """
+        Split at random, each request goes to a part with the probability of its weight.
+
+        :param parts: number of equal parts, or the weights of the parts
+        :param rng: random generator, a new one if not given
+        """
+        rng = np.random.default_rng() if rng is None else rng
+        weights = np.cumsum(split._weights(parts))
+        assigned = np.minimum(np.searchsorted(weights, rng.random(len(self)), side='right'), len(weights) - 1)
+        return self.split_by(assigned, len(weights))
+
+    def split_hash(self, parts: int | Sequence[float], seed: int = 0) -> List[Self]:
+        """
+        Split by the hash of the contents, all requests of a content go to the same part.
+
+        :param parts: number of equal parts, or the weights of the parts
+        :param seed: hash key, different seeds give independent splits
+        """
+        return self.split_by(split.hashed(self.content, parts, seed), split.nparts(parts))
+
+    def split_by(self, assigned: np.ndarray, parts: int) -> List[Self]:
+        """
+        Split by a given assignment of the requests.
+
+        :param assigned: part of each request, in [0, parts)
+        :param parts: number of parts
+        """
+        return [self.__select(rows) for rows in split.groups(assigned, parts)]
+
+    def __select(self, rows: np.ndarray | slice) -> Self:
+        return self._wrap(self.time[rows], self.content[rows], self.size[rows])
+
+    def to_requests(self, interval: float = 1.) -> Requests:
+        """
+        :param interval: length of a tick, in seconds
+        :return: the requests aggregated by tick and content
+        """
+        return Requests(content=self.content, freq=np.ones(len(self), dtype=np.int64), size=self.size,
+                        tick=(self.time // interval).astype(np.int64))
+
+
+class EventsCodec(Codec):
+    """
+    Shared memory codec of Events. Received batches are views of the shared memory, without copying.
+    """
+    fields = {'time': np.dtype(np.float64), 'content': np.dtype(np.int64), 'size': np.dtype(np.int64)}
+
+    def __init__(self, rows: int = Codec.rows):
+        """
+        :param rows: maximum number of rows passed through shared memory
+        """
+        self.rows = rows
+
+    def encode(self, msg) -> dict[str, np.ndarray] | None:
+        if not isinstance(msg, Events):
+            return None
+        return {name: getattr(msg, name) for name in Events.__slots__}
+
+    def decode(self, columns: dict[str, np.ndarray]) -> Events:
+        return Events._wrap(**columns)
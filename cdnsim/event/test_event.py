@@ -0,0 +1,115 @@
+from unittest import TestCase
+
+import numpy as np
+
+from cdnsim import RouterMixIn
+from cdnsim.arrival import Trace
+from cdnsim.event import Events, EventCache, EventMixIn, LatencyHistogram
+from cdnsim.policy import LRU
+from cdnsim.requests import Requests
+from cdnsim.workload import Zipf, ZipfClient
+from nodes.log import DummylogMixIn
+from nodes.node import LNode, Node
+
+
+class MySink(LNode, DummylogMixIn):
+    def _step(self, msgs: list) -> None:
+        self.received = getattr(self, 'received', []) + msgs
+
+
+class MyEventClient(EventMixIn, RouterMixIn, ZipfClient):
+    pass
+
+
+class TestEvents(TestCase):
+    def tearDown(self) -> None:
+        Node.terminate_all(1)
+        Node.backend = 'thread'
+
+    def test_events(self):
+        events = Events(time=[0.5, 0.1, 0.3, 0.2], content=[1, 2, 1, 3], size=[10, 20, 10, 30])
+        np.testing.assert_array_equal([0.1, 0.2, 0.3, 0.5], events.time)
+        np.testing.assert_array_equal([2, 3, 1, 1], events.content)
+
+        merged = Events.merge_events([events, Events(time=[0.15, 0.4], content=[4, 4])])
+        np.testing.assert_array_equal([2, 4, 3, 1, 4, 1], merged.content)
+
+        self.assertListEqual([[2, 1], [3, 1]], [list(part.content) for part in events.split_rr(2)])
+        self.assertListEqual([[2], [3, 1, 1]], [list(part.content) for part in events.split_by(events.content % 2, 2)])
+        for part in events.split_hash(3):
+            self.assertTrue((np.diff(part.time) > 0).all())
+        self.assertEqual(4, sum(len(part) for part in events.split_random([1, 2], np.random.default_rng(0))))
+
+        requests = Requests(content=[1, 2, 1], freq=[3, 1, 2], size=[10, 20, 10], tick=[0, 0, 1])
+        spread = Events.from_requests(requests, interval=2, rng=np.random.default_rng(0))
+        self.assertEqual(6, len(spread))
+        self.assertTrue((np.diff(spread.time) >= 0).all() and spread.time.min() >= 0 and spread.time.max() < 4)
+        back = spread.to_requests(interval=2)
+        for name in Requests.__slots__:
+            np.testing.assert_array_equal(getattr(requests, name), getattr(back, name))
+
+    def test_histogram(self):
+        histogram = LatencyHistogram()
+        self.assertTrue(np.isnan(histogram.percentile(50)))
+        histogram.add(np.r_[np.full(90, 0.01), np.full(10, 1.)])
+        self.assertEqual(100, len(histogram))
+        self.assertAlmostEqual(0.109, histogram.mean())
+        self.assertTrue(0.01 <= histogram.percentile(50) < 0.0113)
+        self.assertTrue(1 <= histogram.percentile(99) < 1.13)
+
+    def cache(self, **kwargs) -> EventCache:
+        cache = EventCache(name=f"cache{len(Node.list_all())}", **kwargs)
+        cache.connect_to(MySink(name=f"sink{len(Node.list_all())}"))
+        return cache
+
+    def test_queue(self):
+        cache = self.cache(policy=LRU(capacity=100), fetch=0, service=1, bandwidth=10)
+        # 1 second service and 1 second transfer: departures at 2, 4, 6 and 12
+        cache._step([Events(time=[0, 0, 0, 10], content=[1, 1, 1, 1], size=[10, 10, 10, 10])])
+        self.assertEqual(14 / 4, cache.latency.mean())
+        self.assertEqual(6 / 4, cache.wait.mean())
+        # the queue of the previous tick is served first
+        cache._step([Events(time=[11, 12], content=[1, 1], size=[10, 10])])
+        self.assertEqual(9 / 6, cache.wait.mean())
+        self.assertDictEqual({'hits': 5, 'coalesced': 0, 'misses': 1}, cache.counts)
+
+    def test_collapse(self):
+        cache = self.cache(policy=LRU(capacity=100), fetch=2)
+        fetched, = cache._step([Events(time=[0, 1, 3, 0.5], content=[7, 7, 7, 8], size=[1, 1, 1, 1])])
+        np.testing.assert_array_equal([0, 0.5], fetched.time)
+        np.testing.assert_array_equal([7, 8], fetched.content)
+        self.assertDictEqual({'hits': 1, 'coalesced': 1, 'misses': 2}, cache.counts)
+        # 2, 1, 0 and 2 seconds
+        self.assertEqual(5 / 4, cache.latency.mean())
+
+        # cached, all hits
+        fetched, = cache._step([Events(time=[4, 5], content=[7, 8], size=[1, 1])])
+        self.assertEqual(0, len(fetched))
+
+        # not admitted, fetched again after the fetch completes
+        cache = self.cache(policy=LRU(capacity=0), fetch=2)
+        fetched, = cache._step([Events(time=[0, 1, 3, 4], content=[7, 7, 7, 7], size=[1, 1, 1, 1])])
+        np.testing.assert_array_equal([0, 3], fetched.time)
+        self.assertDictEqual({'hits': 0, 'coalesced': 2, 'misses': 2}, cache.counts)
+
+    def test_simulation(self):
+        Node.backend = 'direct'
+        client = MyEventClient(name='client', zipf=Zipf(a=1.1, n=1000, rng=np.random.default_rng(0)),
+                               arrival=Trace(counts=[5000] * 4), size=np.full(1000, 10), interval=0.1,
+                               rng=np.random.default_rng(0))
+        caches = [EventCache(name=f"cache{i}", policy=LRU(capacity=5000), fetch=0.05, service=1e-5) for i in range(2)]
+        origin = MySink(name='origin')
+        for cache in caches:
+            client.connect_to(cache)
+            cache.connect_to(origin)
+        Node.start_all()
+        Node.join_all()
+
+        self.assertEqual(20000, sum(sum(cache.counts.values()) for cache in caches))
+        self.assertEqual(sum(cache.counts['misses'] for cache in caches), sum(len(events) for events in origin.received))
+        for cache in caches:
+            self.assertGreater(cache.counts['coalesced'], 0)
+            self.assertGreater(cache.counts['hits'], cache.counts['misses'])
+        # contents are routed to a single cache
+        contents = [np.unique(np.concatenate([e.content for e in origin.received[i::2]])) for i in range(2)]
+        self.assertEqual(0, len(np.intersect1d(*contents)))
@@ -1,8 +1,15 @@
 from abc import ABC
 
+from cdnsim.stats import StatsMixIn
 from nodes.log import LoggerMixIn
 from nodes.node import LNode
 
 
-class Origin(LoggerMixIn, LNode, ABC):
-    ...
+class Origin(StatsMixIn, LoggerMixIn, LNode, ABC):
+    def _step(self, msgs: list) -> None:
+        """
+        Serve all requests, recording the requests and bytes of each tick.
+
+        :param msgs: Requests or Events of the upstreams
+        """
+        self._record_requests(*msgs)
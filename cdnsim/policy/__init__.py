@@ -0,0 +1,5 @@
+from .policy import Admission, Policy, PriorityPolicy, LRU, FIFO, LFU, PerfectLFU
+from .s3fifo import S3FIFO
+from .arc import ARC
+from .tinylfu import CountMinSketch, TinyLFU
+from .cache import PolicyCache
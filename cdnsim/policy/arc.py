@@ -0,0 +1,93 @@
+import numpy as np
+
+from cdnsim.policy.heap import IndexedHeap
+from cdnsim.policy.policy import Policy, Admission
+
+# lists of the contents: cached once (T1), cached frequently (T2), and their ghosts
+_NONE, _T1, _T2, _B1, _B2 = 0, 1, 2, 3, 4
+
+
+class ARC(Policy):
+    """
+    Adaptive replacement cache, in bytes: balances the recently (T1) and frequently (T2) requested contents by the
+    requests of recently evicted contents (B1 and B2 ghosts). T1 is kept at the adaptive target size, evicting the
+    least recently used contents of the lists.
+
+    The lists are IndexedHeaps ordered by the last access, ties of the same tick broken by the fewer requests.
+    """
+
+    def __init__(self, capacity: int, ncontents: int = 0, admission: Admission = None):
+        super().__init__(capacity, ncontents, admission)
+        self._target = 0
+        self._bytes = np.zeros(5, dtype=np.int64)
+        self._list = self._array('_list', np.int8, _NONE)
+        self._last = self._array('_last', np.int64)
+        self._recent = self._array('_recent', np.int64)
+        self._lists = {lst: IndexedHeap(ncontents) for lst in (_T1, _T2, _B1, _B2)}
+
+    def access(self, content, freq, size):
+        # adapt the target size of T1 by the ghost hits
+        content = np.asarray(content, dtype=np.int64)
+        if len(content):
+            self._grow(int(content.max()) + 1)
+        lists = self._list[content]
+        size = np.asarray(size, dtype=np.int64)
+        b1, b2 = self._bytes[_B1], self._bytes[_B2]
+        if b1 > 0:
+            delta = size[lists == _B1].astype(float)
+            self._target = min(self._capacity, self._target + int((delta * max(1.0, b2 / b1)).sum()))
+        if b2 > 0:
+            delta = size[lists == _B2].astype(float)
+            self._target = max(0, self._target - int((delta * max(1.0, b1 / b2)).sum()))
+        return super().access(content, freq, size)
+
+    def __move(self, ids: np.ndarray, to: int) -> None:
+        for lst, heap in self._lists.items():
+            heap.remove(ids[self._list[ids] == lst])
+        np.subtract.at(self._bytes, self._list[ids], self._size[ids])
+        self._list[ids] = to
+        self._bytes[to] += int(self._size[ids].sum())
+        self._bytes[_NONE] = 0
+        if to != _NONE:
+            self._lists[to].push(ids, self._last[ids], self._recent[ids])
+
+    def __access(self, ids: np.ndarray, freq: np.ndarray) -> None:
+        self._last[ids] = self._tick
+        self._recent[ids] = freq
+
+    def _hit(self, ids: np.ndarray, freq: np.ndarray) -> None:
+        self.__access(ids, freq)
+        self.__move(ids, _T2)
+
+    def _insert(self, ids: np.ndarray, freq: np.ndarray) -> None:
+        self.__access(ids, freq)
+        ghost = self._list[ids] >= _B1
+        self.__move(ids[ghost], _T2)
+        self.__move(ids[~ghost], _T1)
+
+    def _victims(self, nbytes: int) -> np.ndarray:
+        victims = self.__take(nbytes)
+        for lst in (_T1, _T2):
+            self._lists[lst].restore(victims[self._list[victims] == lst])
+        return victims
+
+    def __take(self, nbytes: int) -> np.ndarray:
+        # T1 down to the target size, then T2, then the rest of T1
+        t1, t2 = self._lists[_T1], self._lists[_T2]
+        first = t1.take(min(nbytes, int(self._bytes[_T1]) - self._target), self._size)
+        victims = np.concatenate([first, t2.take(nbytes - int(self._size[first].sum()), self._size)])
+        return np.concatenate([victims, t1.take(nbytes - int(self._size[victims].sum()), self._size)])
+
+    def _evict(self, nbytes: int) -> None:
+        victims = self.__take(nbytes)
+        self._remove(victims)
+        t1 = self._list[victims] == _T1
+        self.__move(victims[t1], _B1)
+        self.__move(victims[~t1], _B2)
+
+        # ghosts: T1 + B1 at most the capacity, all lists at most twice the capacity
+        self.__forget(_B1, int(self._bytes[_T1] + self._bytes[_B1]) - self._capacity)
+        self.__forget(_B2, int(self._bytes.sum()) - 2 * self._capacity)
+
+    def __forget(self, lst: int, nbytes: int) -> None:
+        self.__move(self._lists[lst].take(nbytes, self._size), _NONE)
@@ -0,0 +1,30 @@
+from cdnsim.cache import Cache
+from cdnsim.policy.policy import Policy
+from cdnsim.requests import Requests
+
+
+class PolicyCache(Cache):
+    """
+    Cache of a Policy: serves the hits, forwards the misses to the downstreams. Expects Requests messages, of a single
+    tick.
+    """
+
+    def __init__(self, policy: Policy, **kwargs):
+        """
+        :param policy: the eviction (and admission) policy
+        """
+        super().__init__(**kwargs)
+        self._policy = policy
+
+    @property
+    def policy(self) -> Policy:
+        return self._policy
+
+    def _step(self, msgs: list) -> list:
+        requests = Requests.merge_requests(msgs)
+        hits, misses = self._policy.access(requests.content, requests.freq, requests.size)
+        self._record_requests(requests, hits=int(hits.sum()), misses=int(misses.sum()),
+                              hitbytes=int((hits * requests.size).sum()), missbytes=int((misses * requests.size).sum()))
+        missed = misses > 0
+        return self._split(Requests._wrap(requests.tick[missed], requests.content[missed], misses[missed],
+                                          requests.size[missed]))
@@ -0,0 +1,137 @@
+import numpy as np
+
+
+class IndexedHeap:
+    """
+    Binary min heap of content ids ordered by (key, tie), with the heap position of each content: pushing, changing the
+    key of, removing or popping a content costs O(log n).
+
+    Positions and keys are NumPy arrays indexed by the content id, grown on demand.
+    """
+
+    def __init__(self, ncontents: int = 0):
+        """
+        :param ncontents: expected number of contents, to allocate upfront
+        """
+        self._heap = np.zeros(ncontents, dtype=np.int64)
+        self._pos = np.full(ncontents, -1, dtype=np.int64)
+        self._key = np.zeros(ncontents, dtype=np.int64)
+        self._tie = np.zeros(ncontents, dtype=np.int64)
+        self._len = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __contains__(self, content: int) -> bool:
+        return content < len(self._pos) and self._pos[content] >= 0
+
+    def _grow(self, n: int) -> None:
+        if n <= len(self._pos):
+            return
+        extra = max(n, 2 * len(self._pos)) - len(self._pos)
+        self._heap = np.concatenate([self._heap, np.zeros(extra, dtype=np.int64)])
+        self._pos = np.concatenate([self._pos, np.full(extra, -1, dtype=np.int64)])
+        self._key = np.concatenate([self._key, np.zeros(extra, dtype=np.int64)])
+        self._tie = np.concatenate([self._tie, np.zeros(extra, dtype=np.int64)])
+
+    def push(self, ids: np.ndarray, keys: np.ndarray, ties: np.ndarray) -> None:
+        """
+        Push the contents, or change their keys if already in the heap.
+
+        :param ids: content ids
+        :param keys: primary keys
+        :param ties: secondary keys
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        if len(ids) == 0:
+            return
+        self._grow(int(ids.max()) + 1)
+        keys = np.broadcast_to(np.asarray(keys, dtype=np.int64), ids.shape).tolist()
+        ties = np.broadcast_to(np.asarray(ties, dtype=np.int64), ids.shape).tolist()
+        # one by one, sifting assumes all other contents are in heap order
+        for content, key, tie in zip(ids.tolist(), keys, ties):
+            self._key[content] = key
+            self._tie[content] = tie
+            i = int(self._pos[content])
+            if i < 0:
+                i = self._len
+                self._heap[i] = content
+                self._pos[content] = i
+                self._len += 1
+            self._siftdown(self._siftup(i))
+
+    def remove(self, ids: np.ndarray) -> None:
+        """
+        Remove the contents from the heap, if they are in it.
+        """
+        for content in np.asarray(ids, dtype=np.int64).tolist():
+            if content in self:
+                self._delete(int(self._pos[content]))
+
+    def pop(self) -> int:
+        """
+        :return: the content of the smallest key, removed from the heap
+        """
+        if self._len == 0:
+            raise IndexError("Pop from an empty heap")
+        content = int(self._heap[0])
+        self._delete(0)
+        return content
+
+    def take(self, nbytes: int, size: np.ndarray) -> np.ndarray:
+        """
+        Pop contents in order, until they sum up to at least *nbytes*.
+
+        :param nbytes: bytes to free
+        :param size: size of the contents by content id
+        :return: the popped contents
+        """
+        popped, freed = [], 0
+        while freed < nbytes and self._len > 0:
+            content = self.pop()
+            popped.append(content)
+            freed += int(size[content])
+        return np.array(popped, dtype=np.int64)
+
+    def restore(self, ids: np.ndarray) -> None:
+        """
+        Push back popped contents, with their last keys.
+        """
+        self.push(ids, self._key[ids], self._tie[ids])
+
+    def _less(self, a: int, b: int) -> bool:
+        ka, kb = self._key[a], self._key[b]
+        return ka < kb or (ka == kb and self._tie[a] < self._tie[b])
+
+    def _swap(self, i: int, j: int) -> None:
+        a, b = int(self._heap[i]), int(self._heap[j])
+        self._heap[i], self._heap[j] = b, a
+        self._pos[a], self._pos[b] = j, i
+
+    def _siftup(self, i: int) -> int:
+        while i > 0:
+            parent = (i - 1) >> 1
+            if not self._less(int(self._heap[i]), int(self._heap[parent])):
+                break
+            self._swap(i, parent)
+            i = parent
+        return i
+
+    def _siftdown(self, i: int) -> int:
+        while True:
+            smallest, left = i, 2 * i + 1
+            for child in (left, left + 1):
+                if child < self._len and self._less(int(self._heap[child]), int(self._heap[smallest])):
+                    smallest = child
+            if smallest == i:
+                return i
+            self._swap(i, smallest)
+            i = smallest
+
+    def _delete(self, i: int) -> None:
+        content = int(self._heap[i])
+        self._len -= 1
+        if i != self._len:
+            self._swap(i, self._len)
+            self._siftdown(self._siftup(i))
+        self._pos[content] = -1
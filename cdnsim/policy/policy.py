@@ -0,0 +1,285 @@
+from abc import ABC, abstractmethod
+from typing import Tuple
+
+import numpy as np
+
+from cdnsim.policy.heap import IndexedHeap
+
+
+class Admission(ABC):
+    """
+    Admission filter of a Policy: decides which of the missed contents are inserted into the cache.
+    """
+
+    @abstractmethod
+    def record(self, content: np.ndarray, freq: np.ndarray) -> None:
+        """
+        Called with every batch, before the lookup.
+
+        :param content: content ids
+        :param freq: number of requests
+        """
+        ...
+
+    @abstractmethod
+    def admit(self, policy: 'Policy', content: np.ndarray, freq: np.ndarray, size: np.ndarray) -> np.ndarray:
+        """
+        :param policy: the cache policy
+        :param content: missed content ids
+        :param freq: number of requests
+        :param size: content sizes
+        :return: mask of the admitted contents
+        """
+        ...
+
+
+class Policy(ABC):
+    """
+    Cache eviction policy simulated at tick granularity: a batch of the requests of a tick is looked up, the missed
+    contents are inserted, then contents are evicted until the cache fits its capacity (in bytes).
+
+    The state is kept in arrays indexed by the content id, grown on demand, so content ids should be dense (0..n-1).
+    Contents of a batch must be unique, as the contents of a Requests batch of a single tick, and the size of a content
+    should not change.
+    """
+
+    def __init__(self, capacity: int, ncontents: int = 0, admission: Admission = None):
+        """
+        :param capacity: cache capacity in bytes
+        :param ncontents: expected number of contents, to allocate the state upfront
+        :param admission: admission filter, all missed contents are admitted if not given
+        """
+        if capacity < 0:
+            raise ValueError(f"Capacity must be non-negative, got: {capacity}")
+        self._capacity = capacity
+        self._admission = admission
+        self._used = 0
+        self._tick = 0
+        self.__arrays = {}
+        self._resident = self._array('_resident', bool)
+        self._size = self._array('_size', np.int64)
+        self._grow(ncontents)
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def used(self) -> int:
+        """
+        Bytes in the cache.
+        """
+        return self._used
+
+    @property
+    def resident(self) -> np.ndarray:
+        """
+        Content ids in the cache.
+        """
+        return np.flatnonzero(self._resident)
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self._resident))
+
+    def contains(self, content) -> np.ndarray:
+        """
+        :param content: content ids
+        :return: whether the contents are in the cache
+        """
+        content = np.asarray(content, dtype=np.int64)
+        known = content < len(self._resident)
+        contains = np.zeros(len(content), dtype=bool)
+        contains[known] = self._resident[content[known]]
+        return contains
+
+    def access(self, content, freq, size) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Look up a batch of requests, then update the cache.
+
+        Requests of contents in the cache at the beginning of the batch are hits, all requests of the other contents
+        are misses.
+
+        :param content: unique content ids
+        :param freq: number of requests
+        :param size: content sizes
+        :return: hits and misses of each content
+        """
+        content = np.asarray(content, dtype=np.int64)
+        freq = np.asarray(freq, dtype=np.int64)
+        size = np.asarray(size, dtype=np.int64)
+        self._tick += 1
+        if len(content):
+            self._grow(int(content.max()) + 1)
+        if self._admission is not None:
+            self._admission.record(content, freq)
+
+        resident = self._resident[content]
+        hits = np.where(resident, freq, 0)
+        self._hit(content[resident], freq[resident])
+
+        missed = np.flatnonzero(~resident & (size <= self._capacity))
+        if self._admission is not None and len(missed):
+            missed = missed[self._admission.admit(self, content[missed], freq[missed], size[missed])]
+        ids = content[missed]
+        self._resident[ids] = True
+        self._size[ids] = size[missed]
+        self._used += int(size[missed].sum())
+        self._insert(ids, freq[missed])
+
+        if self._used > self._capacity:
+            self._evict(self._used - self._capacity)
+        return hits, freq - hits
+
+    def _array(self, name: str, dtype: type, fill=0) -> np.ndarray:
+        """
+        Register a state array, grown together with the others.
+
+        :param name: attribute name
+        :param dtype: element type
+        :param fill: initial value of the elements
+        :return: the (empty) array
+        """
+        self.__arrays[name] = (dtype, fill)
+        array = np.full(len(self._resident) if hasattr(self, '_resident') else 0, fill, dtype=dtype)
+        setattr(self, name, array)
+        return array
+
+    def _grow(self, n: int) -> None:
+        if n <= len(self._resident):
+            return
+        n = max(n, 2 * len(self._resident))
+        for name, (dtype, fill) in self.__arrays.items():
+            array = getattr(self, name)
+            setattr(self, name, np.concatenate([array, np.full(n - len(array), fill, dtype=dtype)]))
+
+    def _remove(self, ids: np.ndarray) -> None:
+        """
+        Remove contents from the cache.
+        """
+        self._resident[ids] = False
+        self._used -= int(self._size[ids].sum())
+
+    def _prefix(self, ordered: np.ndarray, nbytes: int) -> np.ndarray:
+        """
+        :param ordered: content ids in eviction order
+        :param nbytes: bytes to free
+        :return: the shortest prefix of *ordered* freeing at least *nbytes*
+        """
+        if nbytes <= 0:
+            return ordered[:0]
+        return ordered[:np.searchsorted(np.cumsum(self._size[ordered]), nbytes) + 1]
+
+    @abstractmethod
+    def _hit(self, ids: np.ndarray, freq: np.ndarray) -> None:
+        """
+        Update the state of the hit contents.
+        """
+        ...
+
+    @abstractmethod
+    def _insert(self, ids: np.ndarray, freq: np.ndarray) -> None:
+        """
+        Update the state of the inserted contents.
+        """
+        ...
+
+    @abstractmethod
+    def _victims(self, nbytes: int) -> np.ndarray:
+        """
+        :param nbytes: bytes to free
+        :return: the contents to evict next for *nbytes*, without evicting them
+        """
+        ...
+
+    def _evict(self, nbytes: int) -> None:
+        """
+        Evict contents to free *nbytes*.
+        """
+        self._remove(self._victims(nbytes))
+
+
+class PriorityPolicy(Policy, ABC):
+    """
+    Evicts the contents of the lowest priority first, ties broken by the least recent access, then by the fewest
+    requests of the last access (the requests of a tick are not ordered, a content requested more often within the tick
+    is more likely to be the more recently used).
+
+    The eviction order is an IndexedHeap of the cached contents, a batch costs O(log n) per hit, insert and eviction.
+    """
+
+    def __init__(self, capacity: int, ncontents: int = 0, admission: Admission = None):
+        super().__init__(capacity, ncontents, admission)
+        self._priority = self._array('_priority', np.int64)
+        self._heap = IndexedHeap(ncontents)
+
+    def _hit(self, ids: np.ndarray, freq: np.ndarray) -> None:
+        self._prioritize(ids, freq, inserted=False)
+        self.__push(ids, freq)
+
+    def _insert(self, ids: np.ndarray, freq: np.ndarray) -> None:
+        self._prioritize(ids, freq, inserted=True)
+        self.__push(ids, freq)
+
+    def __push(self, ids: np.ndarray, freq: np.ndarray) -> None:
+        # tie: the tick, then the requests of the last access
+        self._heap.push(ids, self._priority[ids], (self._tick << 32) + np.minimum(freq, 2 ** 32 - 1))
+
+    @abstractmethod
+    def _prioritize(self, ids: np.ndarray, freq: np.ndarray, inserted: bool) -> None:
+        """
+        Update the priority of the hit or inserted contents.
+        """
+        ...
+
+    def _victims(self, nbytes: int) -> np.ndarray:
+        victims = self._heap.take(nbytes, self._size)
+        self._heap.restore(victims)
+        return victims
+
+    def _evict(self, nbytes: int) -> None:
+        self._remove(self._heap.take(nbytes, self._size))
+
+
+class LRU(PriorityPolicy):
+    """
+    Least recently used.
+    """
+
+    def _prioritize(self, ids: np.ndarray, freq: np.ndarray, inserted: bool) -> None:
+        self._priority[ids] = self._tick
+
+
+class FIFO(PriorityPolicy):
+    """
+    First in, first out: hits do not change the order of eviction.
+    """
+
+    def _prioritize(self, ids: np.ndarray, freq: np.ndarray, inserted: bool) -> None:
+        if inserted:
+            self._priority[ids] = self._tick
+
+
+class LFU(PriorityPolicy):
+    """
+    Least frequently used, counting the requests since the content was inserted.
+    """
+
+    def _prioritize(self, ids: np.ndarray, freq: np.ndarray, inserted: bool) -> None:
+        self._priority[ids] = freq if inserted else self._priority[ids] + freq
+
+
+class PerfectLFU(PriorityPolicy):
+    """
+    Least frequently used, counting all requests of the contents, in the cache or not.
+    """
+
+    def access(self, content, freq, size) -> Tuple[np.ndarray, np.ndarray]:
+        content = np.asarray(content, dtype=np.int64)
+        if len(content):
+            self._grow(int(content.max()) + 1)
+        self._priority[content] += np.asarray(freq, dtype=np.int64)
+        return super().access(content, freq, size)
+
+    def _prioritize(self, ids: np.ndarray, freq: np.ndarray, inserted: bool) -> None:
+        # counted by access()
+        pass
@@ -0,0 +1,93 @@
+import numpy as np
+
+from cdnsim.policy.heap import IndexedHeap
+from cdnsim.policy.policy import Policy, Admission
+
+# queues of the contents
+_NONE, _SMALL, _MAIN, _GHOST = 0, 1, 2, 3
+
+
+class S3FIFO(Policy):
+    """
+    S3-FIFO: new contents enter a small FIFO queue; contents requested again while there are promoted to the main FIFO
+    queue, the others are evicted and remembered in a ghost queue. Contents of the ghost queue enter the main queue
+    directly. The main queue reinserts requested contents instead of evicting them (decrementing their counter).
+
+    The queues are IndexedHeaps ordered by the enqueue sequence.
+    """
+
+    def __init__(self, capacity: int, ncontents: int = 0, admission: Admission = None, small: float = 0.1):
+        """
+        :param small: share of the small queue of the capacity
+        """
+        super().__init__(capacity, ncontents, admission)
+        self._smallcapacity = int(small * capacity)
+        self._smallused = 0
+        self._ghostused = 0
+        self._sequence = 0
+        self._queue = self._array('_queue', np.int8, _NONE)
+        self._count = self._array('_count', np.int8)
+        self._queues = {queue: IndexedHeap(ncontents) for queue in (_SMALL, _MAIN, _GHOST)}
+
+    def _hit(self, ids: np.ndarray, freq: np.ndarray) -> None:
+        self._count[ids] = np.minimum(self._count[ids] + freq, 3)
+
+    def _insert(self, ids: np.ndarray, freq: np.ndarray) -> None:
+        # the requests of a tick are not ordered, contents of more requests are enqueued later
+        order = np.argsort(freq, kind='stable')
+        ids, freq = ids[order], freq[order]
+        ghost = self._queue[ids] == _GHOST
+        self._queues[_GHOST].remove(ids[ghost])
+        self._ghostused -= int(self._size[ids[ghost]].sum())
+        self._smallused += int(self._size[ids[~ghost]].sum())
+        # requests after the first one of the tick
+        self._count[ids] = np.minimum(freq - 1, 3)
+        self._enqueue(ids[ghost], _MAIN)
+        self._enqueue(ids[~ghost], _SMALL)
+
+    def _enqueue(self, ids: np.ndarray, queue: int) -> None:
+        self._queue[ids] = queue
+        self._queues[queue].push(ids, self._sequence + np.arange(len(ids)), 0)
+        self._sequence += len(ids)
+
+    def __evicting(self) -> int:
+        return _SMALL if self._smallused > self._smallcapacity or len(self._queues[_MAIN]) == 0 else _MAIN
+
+    def _victims(self, nbytes: int) -> np.ndarray:
+        # without promotions and reinsertions
+        queue = self._queues[self.__evicting()]
+        victims = queue.take(nbytes, self._size)
+        queue.restore(victims)
+        return victims
+
+    def _evict(self, nbytes: int) -> None:
+        while self._used > self._capacity:
+            nbytes = self._used - self._capacity
+            if self.__evicting() == _SMALL:
+                # requested again: promote to main, others: evict to ghost
+                victims = self._queues[_SMALL].take(nbytes, self._size)
+                promoted = self._count[victims] > 0
+                self._smallused -= int(self._size[victims].sum())
+                self._count[victims[promoted]] = 0
+                self._enqueue(victims[promoted], _MAIN)
+                self.__drop(victims[~promoted], ghost=True)
+            else:
+                # requested again: reinsert, others: evict
+                victims = self._queues[_MAIN].take(nbytes, self._size)
+                reinserted = self._count[victims] > 0
+                self._count[victims[reinserted]] -= 1
+                self._enqueue(victims[reinserted], _MAIN)
+                self.__drop(victims[~reinserted], ghost=False)
+
+    def __drop(self, ids: np.ndarray, ghost: bool) -> None:
+        self._remove(ids)
+        self._queue[ids] = _NONE
+        if not ghost:
+            return
+
+        self._enqueue(ids, _GHOST)
+        self._ghostused += int(self._size[ids].sum())
+        # the ghost queue remembers about as many bytes as the main queue holds
+        forgotten = self._queues[_GHOST].take(self._ghostused - (self._capacity - self._smallcapacity), self._size)
+        self._queue[forgotten] = _NONE
+        self._ghostused -= int(self._size[forgotten].sum())
@@ -0,0 +1,36 @@
+from unittest import TestCase
+
+import numpy as np
+
+from cdnsim.policy.heap import IndexedHeap
+
+
+class TestIndexedHeap(TestCase):
+    def test_heap(self):
+        rng = np.random.default_rng(0)
+        heap = IndexedHeap()
+        keys = rng.integers(100, size=1000)
+        heap.push(np.arange(1000), keys, np.arange(1000))
+        self.assertEqual(1000, len(heap))
+
+        # change keys, remove some
+        heap.push(np.arange(0, 1000, 2), keys[::2] + 50, np.arange(0, 1000, 2))
+        keys[::2] += 50
+        heap.remove(np.arange(0, 1000, 3))
+        self.assertNotIn(3, heap)
+        self.assertIn(4, heap)
+
+        expected = [i for i in np.lexsort((np.arange(1000), keys)) if i % 3]
+        self.assertListEqual(expected, [heap.pop() for _ in range(len(heap))])
+        with self.assertRaises(IndexError):
+            heap.pop()
+
+    def test_take(self):
+        heap = IndexedHeap()
+        size = np.array([5, 1, 2, 3])
+        heap.push(np.arange(4), [3, 2, 1, 0], [0, 0, 0, 0])
+        self.assertListEqual([3, 2], list(heap.take(4, size)))
+        self.assertListEqual([], list(heap.take(0, size)))
+        heap.restore(np.array([3, 2]))
+        self.assertListEqual([3, 2, 1, 0], list(heap.take(100, size)))
+        self.assertEqual(0, len(heap))
@@ -0,0 +1,118 @@
+from unittest import TestCase
+
+import numpy as np
+
+from cdnsim.policy import LRU, FIFO, LFU, PerfectLFU, S3FIFO, ARC, TinyLFU, PolicyCache, CountMinSketch
+from cdnsim.requests import Requests
+from nodes.log import DummylogMixIn
+from nodes.node import LNode, Node
+
+
+def zipf(ticks: int, ncontents: int = 1000, k: int = 500, a: float = 1.2, seed: int = 0):
+    """
+    Batches of Zipf distributed requests.
+    """
+    rng = np.random.default_rng(seed)
+    p = 1 / np.arange(1, ncontents + 1) ** a
+    sizes = rng.integers(1, 10, size=ncontents)
+    for _ in range(ticks):
+        content, freq = np.unique(rng.choice(ncontents, size=k, p=p / p.sum()), return_counts=True)
+        yield content, freq, sizes[content]
+
+
+class MySink(LNode, DummylogMixIn):
+    def _step(self, msgs: list) -> None:
+        pass
+
+
+class TestPolicy(TestCase):
+    def tearDown(self) -> None:
+        Node.terminate_all(1)
+
+    def test_lru(self):
+        lru = LRU(capacity=3)
+        hits, misses = lru.access([0, 1, 2], [1, 2, 3], [1, 1, 1])
+        self.assertListEqual([0, 0, 0], list(hits))
+        self.assertListEqual([1, 2, 3], list(misses))
+        self.assertListEqual([0, 1, 2], list(lru.resident))
+        self.assertListEqual([True, False, False], list(lru.contains([2, 3, 100])))
+
+        # 0 is the least recently used
+        hits, misses = lru.access([1, 2, 3], [1, 1, 1], [1, 1, 1])
+        self.assertListEqual([1, 1, 0], list(hits))
+        self.assertListEqual([1, 2, 3], list(lru.resident))
+
+        # 1 was used before 2 and 3, a larger content evicts more
+        lru.access([2, 3], [1, 2], [1, 1])
+        lru.access([4], [1], [2])
+        self.assertListEqual([3, 4], list(lru.resident))
+        self.assertEqual(3, lru.used)
+
+        # larger than the cache
+        hits, misses = lru.access([5], [1], [4])
+        self.assertListEqual([1], list(misses))
+        self.assertListEqual([3, 4], list(lru.resident))
+
+        with self.assertRaises(ValueError):
+            LRU(capacity=-1)
+
+    def test_fifo_lfu(self):
+        fifo = FIFO(capacity=2)
+        fifo.access([0], [1], [1])
+        fifo.access([1], [1], [1])
+        fifo.access([0], [5], [1])
+        fifo.access([2], [1], [1])
+        self.assertListEqual([1, 2], list(fifo.resident))
+
+        lfu = LFU(capacity=2)
+        lfu.access([0, 1], [1, 1], [1, 1])
+        lfu.access([0], [5], [1])
+        lfu.access([2], [1], [1])
+        self.assertListEqual([0, 2], list(lfu.resident))
+
+        # counts the requests of the contents out of the cache too
+        plfu = PerfectLFU(capacity=1)
+        plfu.access([0], [3], [1])
+        plfu.access([1], [2], [1])
+        plfu.access([1], [2], [1])
+        self.assertListEqual([1], list(plfu.resident))
+
+    def test_policies(self):
+        ratios = {}
+        for policy in [LRU(200), FIFO(200), LFU(200), PerfectLFU(200), S3FIFO(200), ARC(200),
+                       LRU(200, admission=TinyLFU(sample=10000, width=1024))]:
+            nhits = nrequests = 0
+            for content, freq, size in zipf(50):
+                hits, misses = policy.access(content, freq, size)
+                np.testing.assert_array_equal(freq, hits + misses)
+                self.assertTrue((hits >= 0).all() and (misses >= 0).all())
+                self.assertLessEqual(policy.used, policy.capacity)
+                self.assertEqual(policy.used, policy._size[policy.resident].sum())
+                nhits += hits.sum()
+                nrequests += freq.sum()
+            ratios[f"{policy.__class__.__name__}{len(ratios)}"] = nhits / nrequests
+        self.assertTrue(all(0.3 < ratio < 1 for ratio in ratios.values()), ratios)
+
+    def test_tinylfu(self):
+        sketch = CountMinSketch(width=1024)
+        sketch.add(np.array([1, 2, 2]), np.array([5, 1, 1]))
+        self.assertListEqual([5, 2, 0], list(sketch.estimate(np.array([1, 2, 3]))))
+        sketch.halve()
+        self.assertListEqual([2, 1], list(sketch.estimate(np.array([1, 2]))))
+
+        # a one-hit wonder does not evict a popular content
+        lru = LRU(capacity=1, admission=TinyLFU(width=1024))
+        lru.access([0], [10], [1])
+        lru.access([1], [1], [1])
+        self.assertListEqual([0], list(lru.resident))
+        lru.access([1], [20], [1])
+        self.assertListEqual([1], list(lru.resident))
+
+    def test_cache(self):
+        cache = PolicyCache(name='cache', policy=LRU(capacity=10))
+        cache.connect_to(MySink(name='sink'))
+        r = Requests(content=[1, 2, 3], freq=[4, 5, 6], size=[5, 5, 5], tick=1)
+        self.assertListEqual([4, 5, 6], list(cache._step([r])[0].freq))
+        (missed,) = cache._step([r])
+        self.assertListEqual([1], list(missed.content))
+        self.assertListEqual([4], list(missed.freq))
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+
+from cdnsim.policy.policy import Admission, Policy
+
+
+class CountMinSketch:
+    """
+    Approximate request counters of the contents in fixed memory: *depth* rows of *width* counters, each content is
+    counted in one counter of every row, its estimate is the minimum of them.
+    """
+    __multipliers = np.array([0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0xD6E8FEB86659FD93,
+                              0xFF51AFD7ED558CCD, 0xC4CEB9FE1A85EC53, 0x94D049BB133111EB, 0xBF58476D1CE4E5B9],
+                             dtype=np.uint64)
+
+    def __init__(self, width: int = 2 ** 20, depth: int = 4):
+        """
+        :param width: counters of a row, rounded up to a power of two
+        :param depth: number of rows, at most 8
+        """
+        if not 1 <= depth <= len(self.__multipliers):
+            raise ValueError(f"Depth must be in [1, {len(self.__multipliers)}], got: {depth}")
+        self.__bits = max(int(np.ceil(np.log2(max(width, 2)))), 1)
+        self.__table = np.zeros((depth, 2 ** self.__bits), dtype=np.int64)
+
+    def __indexes(self, content: np.ndarray) -> np.ndarray:
+        h = pd.util.hash_array(np.asarray(content, dtype=np.int64))
+        return (h[None, :] * self.__multipliers[:len(self.__table), None]) >> np.uint64(64 - self.__bits)
+
+    def add(self, content: np.ndarray, freq: np.ndarray) -> None:
+        for row, indexes in zip(self.__table, self.__indexes(content)):
+            np.add.at(row, indexes, freq)
+
+    def estimate(self, content: np.ndarray) -> np.ndarray:
+        indexes = self.__indexes(content)
+        return np.min([row[i] for row, i in zip(self.__table, indexes)], axis=0) if len(content) else \
+            np.zeros(0, dtype=np.int64)
+
+    def halve(self) -> None:
+        self.__table >>= 1
+
+
+class TinyLFU(Admission):
+    """
+    TinyLFU admission: a missed content is admitted only if it was requested more often than the contents it would
+    evict, estimated by a count-min sketch. Counters are halved after every *sample* requests, to forget the past.
+    """
+
+    def __init__(self, sample: int = 10 * 2 ** 20, width: int = 2 ** 20, depth: int = 4):
+        """
+        :param sample: number of requests between halving the counters
+        :param width: counters of a sketch row
+        :param depth: number of sketch rows
+        """
+        self.__sketch = CountMinSketch(width, depth)
+        self.__sample = sample
+        self.__count = 0
+
+    def record(self, content: np.ndarray, freq: np.ndarray) -> None:
+        self.__sketch.add(content, freq)
+        self.__count += int(freq.sum())
+        if self.__count >= self.__sample:
+            self.__sketch.halve()
+            self.__count //= 2
+
+    def admit(self, policy: Policy, content: np.ndarray, freq: np.ndarray, size: np.ndarray) -> np.ndarray:
+        victims = policy._victims(policy.used + int(size.sum()) - policy.capacity)
+        if len(victims) == 0:
+            return np.ones(len(content), dtype=bool)
+        return self.__sketch.estimate(content) > self.__sketch.estimate(victims).max()
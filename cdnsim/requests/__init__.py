@@ -1 +1,3 @@
 from .requests import BaseRequests, BaseSeries
+from .throughput import ThroughputRequests
+from .columnar import Requests
@@ -0,0 +1,70 @@
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from cdnsim.requests.columnar import Requests
+from cdnsim.requests.requests import BaseRequests
+from nodes.shm import Codec
+
+
+class RequestsCodec(Codec):
+    """
+    Shared memory codec of BaseRequests (and subclasses) with integer index levels and columns, for example
+    (tick, content) indexed freq and size.
+
+    Avoids pickling only: building the DataFrame copies the received columns and creates the index.
+    """
+
+    def __init__(self, cls: type = BaseRequests, index: List[str] = ('content',), columns: List[str] = ('freq',),
+                 rows: int = Codec.rows):
+        """
+        :param cls: BaseRequests subclass to decode to
+        :param index: index level names
+        :param columns: column names
+        :param rows: maximum number of rows passed through shared memory
+        """
+        self.__cls = cls
+        self.__index = list(index)
+        self.__columns = list(columns)
+        self.rows = rows
+
+    @property
+    def fields(self) -> dict[str, np.dtype]:
+        return {name: np.dtype(np.int64) for name in self.__index + self.__columns}
+
+    def encode(self, msg) -> dict[str, np.ndarray] | None:
+        if not isinstance(msg, self.__cls) or list(msg.index.names) != self.__index or \
+                not set(self.__columns).issubset(msg.columns):
+            return None
+
+        columns = {name: msg.index.get_level_values(name).to_numpy() for name in self.__index}
+        columns.update({name: msg[name].to_numpy() for name in self.__columns})
+        if not all(np.issubdtype(column.dtype, np.integer) for column in columns.values()):
+            return None
+        return columns
+
+    def decode(self, columns: dict[str, np.ndarray]):
+        return self.__cls(data={name: columns[name] for name in self.__columns},
+                          index=pd.MultiIndex.from_arrays([columns[name] for name in self.__index], names=self.__index))
+
+
+class ColumnarCodec(Codec):
+    """
+    Shared memory codec of the columnar Requests. Received batches are views of the shared memory, without copying.
+    """
+    fields = {name: np.dtype(np.int64) for name in Requests.__slots__}
+
+    def __init__(self, rows: int = Codec.rows):
+        """
+        :param rows: maximum number of rows passed through shared memory
+        """
+        self.rows = rows
+
+    def encode(self, msg) -> dict[str, np.ndarray] | None:
+        if not isinstance(msg, Requests):
+            return None
+        return {name: getattr(msg, name) for name in Requests.__slots__}
+
+    def decode(self, columns: dict[str, np.ndarray]) -> Requests:
+        return Requests._wrap(**columns)
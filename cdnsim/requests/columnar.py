@@ -0,0 +1,163 @@
+from typing import List, Self, Sequence
+
+import numpy as np
+import pandas as pd
+
+from cdnsim.requests import split
+from cdnsim.requests.throughput import ThroughputRequests
+
+
+class Requests:
+    """
+    Lightweight, NumPy backed batch of requests: the number of requests (freq) and the size of each (tick, content)
+    pair. Columns are int64 arrays, sorted by tick, then content, without duplicates.
+
+    Used as message between nodes instead of the pandas based BaseRequests, convert with to_pandas() and from_pandas()
+    for analysis.
+    """
+    __slots__ = ('tick', 'content', 'freq', 'size')
+
+    @classmethod
+    def _wrap(cls, tick: np.ndarray, content: np.ndarray, freq: np.ndarray, size: np.ndarray) -> Self:
+        """
+        Create a batch of already sorted and unique columns, without copying or validation.
+        """
+        requests = object.__new__(cls)
+        requests.tick = tick
+        requests.content = content
+        requests.freq = freq
+        requests.size = size
+        return requests
+
+    @classmethod
+    def merge_requests(cls, batches: List[Self]) -> Self:
+        """
+        Merge batches: sum the freq and take the minimum size of the same (tick, content) pairs.
+
+        :param batches: batches to merge
+        :return: merged batch
+        """
+        if len(batches) == 0:
+            raise ValueError("Cannot merge an empty list of Requests")
+
+        if len(batches) == 1:
+            return batches[0]
+
+        return cls._aggregate(np.concatenate([b.tick for b in batches]), np.concatenate([b.content for b in batches]),
+                              np.concatenate([b.freq for b in batches]), np.concatenate([b.size for b in batches]))
+
+    @classmethod
+    def _aggregate(cls, tick: np.ndarray, content: np.ndarray, freq: np.ndarray, size: np.ndarray) -> Self:
+        """
+        Sort the columns by (tick, content), then sum freq and take the minimum size of duplicates.
+        """
+        if len(content) == 0:
+            return cls._wrap(tick, content, freq, size)
+
+        order = np.lexsort((content, tick))
+        tick, content, freq, size = tick[order], content[order], freq[order], size[order]
+        first = np.flatnonzero(np.r_[True, (tick[1:] != tick[:-1]) | (content[1:] != content[:-1])])
+        if len(first) == len(content):
+            return cls._wrap(tick, content, freq, size)
+        return cls._wrap(tick[first], content[first], np.add.reduceat(freq, first), np.minimum.reduceat(size, first))
+
+    @classmethod
+    def from_pandas(cls, df: pd.DataFrame) -> Self:
+        """
+        :param df: requests DataFrame with 'content' (and optionally 'tick') index levels, 'freq' (and optionally
+                   'size') columns
+        :return: the batch
+        """
+        n = len(df)
+        tick = df.index.get_level_values('tick').to_numpy() if 'tick' in df.index.names else np.zeros(n)
+        size = df['size'].to_numpy() if 'size' in df.columns else np.zeros(n)
+        return cls(content=df.index.get_level_values('content').to_numpy(), freq=df['freq'].to_numpy(), size=size,
+                   tick=tick)
+
+    def __init__(self, content, freq, size=None, tick=None):
+        """
+        :param content: integer content ids
+        :param freq: number of requests
+        :param size: size of the contents, zero if not given
+        :param tick: tick of the requests, a single tick for all, or zero if not given
+        """
+        content = np.asarray(content, dtype=np.int64)
+        freq = np.asarray(freq, dtype=np.int64)
+        size = np.zeros(len(content), dtype=np.int64) if size is None else np.asarray(size, dtype=np.int64)
+        tick = np.broadcast_to(np.asarray(0 if tick is None else tick, dtype=np.int64), content.shape)
+        if not content.ndim == freq.ndim == size.ndim == 1 or not len(content) == len(freq) == len(size):
+            raise ValueError(f"Column length mismatch: {len(content)} contents, {len(freq)} freq, {len(size)} size")
+
+        r = self._aggregate(tick.copy(), content, freq, size)
+        self.tick, self.content, self.freq, self.size = r.tick, r.content, r.freq, r.size
+
+    def __len__(self) -> int:
+        return len(self.content)
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} of {len(self)} contents, {self.freq.sum()} requests>"
+
+    def split_rr(self, parts: int) -> List[Self]:
+        """
+        Split as round-robin
+        """
+        if not isinstance(parts, int) or parts < 1:
+            raise ValueError(f"Cannot divide {self.__class__.__name__} into {parts} parts")
+
+        return [self._wrap(self.tick, self.content, self.freq // parts, self.size)] * parts
+
+    def split_random(self, parts: int | Sequence[float], rng: np.random.Generator = None) -> List[Self]:
+        """
+        Split at random (multinomial), each request goes to a part with the probability of its weight. No requests are
+        lost, parts are independent batches without zero freq rows.
+
+        :param parts: number of equal parts, or the weights of the parts
+        :param rng: random generator, a new one if not given
+        """
+        return [self.__select(freq > 0, freq) for freq in split.multinomial(self.freq, parts, rng)]
+
+    def split_hash(self, parts: int | Sequence[float], seed: int = 0) -> List[Self]:
+        """
+        Split by the hash of the contents, all requests of a content go to the same part.
+
+        :param parts: number of equal parts, or the weights of the parts
+        :param seed: hash key, different seeds give independent splits
+        """
+        return self.split_by(split.hashed(self.content, parts, seed), split.nparts(parts))
+
+    def split_by(self, assigned: np.ndarray, parts: int) -> List[Self]:
+        """
+        Split by a given assignment of the contents.
+
+        :param assigned: part of each content, in [0, parts)
+        :param parts: number of parts
+        """
+        return [self.__select(rows, self.freq) for rows in split.groups(assigned, parts)]
+
+    def __select(self, rows: np.ndarray, freq: np.ndarray) -> Self:
+        return self._wrap(self.tick[rows], self.content[rows], freq[rows], self.size[rows])
+
+    @property
+    def rpt(self) -> pd.Series:
+        """
+        Requests per tick.
+        """
+        ticks, first = np.unique(self.tick, return_index=True)
+        return pd.Series(np.add.reduceat(self.freq, first) if len(first) else [], index=pd.Index(ticks, name='tick'),
+                         dtype=np.int64)
+
+    @property
+    def bpt(self) -> pd.Series:
+        """
+        Bytes per tick.
+        """
+        ticks, first = np.unique(self.tick, return_index=True)
+        return pd.Series(np.add.reduceat(self.freq * self.size, first) if len(first) else [],
+                         index=pd.Index(ticks, name='tick'), dtype=np.int64)
+
+    def to_pandas(self) -> ThroughputRequests:
+        """
+        :return: (tick, content) indexed DataFrame with freq and size columns
+        """
+        return ThroughputRequests(data={'freq': self.freq, 'size': self.size},
+                                  index=pd.MultiIndex.from_arrays([self.tick, self.content], names=['tick', 'content']))
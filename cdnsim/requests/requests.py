@@ -1,7 +1,10 @@
-from typing import List, Self
+from typing import List, Self, Sequence
 
+import numpy as np
 import pandas as pd
 
+from cdnsim.requests import split
+
 
 #
 # @pd.api.extensions.register_dataframe_accessor("requests")
@@ -68,13 +71,29 @@ class BaseRequests(pd.DataFrame):
 
     @classmethod
     def merge_requests(cls, dfs: List[Self]) -> Self:
+        """
+        Merge requests in a single pass: concatenate all, then sum the columns of equal index entries. Runs in linear
+        time (plus sorting the distinct index entries) regardless of the number of DataFrames.
+        """
         if len(dfs) == 0:
             raise ValueError("Cannot merge an empty DataFrame")
 
         if len(dfs) == 1:
             return dfs[0]
 
-        return dfs[0].add(cls.merge_requests(dfs[1:]), fill_value=0)
+        frame = pd.concat(dfs)
+        levels = [frame.index.get_level_values(i).to_numpy() for i in range(frame.index.nlevels)]
+        # sort keys, numeric levels are sorted by value, others by their (sorted) factorized codes
+        keys = [level if np.issubdtype(level.dtype, np.number) else pd.factorize(level, sort=True)[0]
+                for level in levels]
+        order = np.lexsort(keys[::-1])
+        keys = [key[order] for key in keys]
+        first = np.flatnonzero(np.r_[True, np.any([key[1:] != key[:-1] for key in keys], axis=0)]) \
+            if len(order) else order
+
+        index = pd.MultiIndex.from_arrays([level[order][first] for level in levels], names=frame.index.names)
+        return cls(data={column: np.add.reduceat(frame[column].to_numpy()[order], first) if len(first) else []
+                         for column in frame.columns}, index=index)
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -92,6 +111,36 @@ class BaseRequests(pd.DataFrame):
 
         return [self.floordiv(parts).astype(int)] * parts
 
+    def split_random(self, parts: int | Sequence[float], rng: np.random.Generator = None) -> List[Self]:
+        """
+        Split at random (multinomial), each request goes to a part with the probability of its weight. No requests are
+        lost, parts are independent DataFrames without zero freq rows.
+
+        :param parts: number of equal parts, or the weights of the parts
+        :param rng: random generator, a new one if not given
+        """
+        freqs = split.multinomial(self['freq'].to_numpy(), parts, rng)
+        return [self[freq > 0].assign(freq=freq[freq > 0]) for freq in freqs]
+
+    def split_hash(self, parts: int | Sequence[float], seed: int = 0) -> List[Self]:
+        """
+        Split by the hash of the contents, all requests of a content go to the same part.
+
+        :param parts: number of equal parts, or the weights of the parts
+        :param seed: hash key, different seeds give independent splits
+        """
+        return self.split_by(split.hashed(self.index.get_level_values('content').to_numpy(), parts, seed),
+                             split.nparts(parts))
+
+    def split_by(self, assigned: np.ndarray, parts: int) -> List[Self]:
+        """
+        Split by a given assignment of the rows.
+
+        :param assigned: part of each row, in [0, parts)
+        :param parts: number of parts
+        """
+        return [self.iloc[rows] for rows in split.groups(assigned, parts)]
+
 #    @property
 #    def center(self):
 #        # return the geographic center point of this DataFrame
@@ -0,0 +1,82 @@
+from typing import List, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+def _weights(parts: int | Sequence[float]) -> np.ndarray:
+    """
+    :param parts: number of equal parts, or the weights of the parts
+    :return: normalized weights
+    """
+    if isinstance(parts, int):
+        if parts < 1:
+            raise ValueError(f"Cannot split into {parts} parts")
+        return np.full(parts, 1 / parts)
+
+    weights = np.asarray(parts, dtype=float)
+    if weights.ndim != 1 or len(weights) == 0 or (weights < 0).any() or weights.sum() <= 0:
+        raise ValueError(f"Cannot split by weights {parts}")
+    return weights / weights.sum()
+
+
+def nparts(parts: int | Sequence[float]) -> int:
+    """
+    :param parts: number of equal parts, or the weights of the parts
+    :return: number of parts
+    """
+    return parts if isinstance(parts, int) else len(parts)
+
+
+def multinomial(freq: np.ndarray, parts: int | Sequence[float], rng: np.random.Generator = None) -> np.ndarray:
+    """
+    Split each count into parts at random: every request goes to part i with the probability of its weight.
+
+    Drawn as a chain of conditional binomials, one vectorized draw per part, so the parts always sum up to *freq*.
+
+    :param freq: counts to split
+    :param parts: number of equal parts, or the weights of the parts
+    :param rng: random generator, a new one if not given
+    :return: (parts, len(freq)) counts
+    """
+    weights = _weights(parts)
+    rng = np.random.default_rng() if rng is None else rng
+
+    split = np.empty((len(weights), len(freq)), dtype=np.int64)
+    remaining = np.asarray(freq, dtype=np.int64).copy()
+    # probability of part i, given the request was not assigned to the parts before
+    tail = np.cumsum(weights[::-1])[::-1]
+    for i, (weight, rest) in enumerate(zip(weights[:-1], tail[:-1])):
+        split[i] = rng.binomial(remaining, min(weight / rest, 1.0)) if rest > 0 else 0
+        remaining -= split[i]
+    split[-1] = remaining
+    return split
+
+
+def hashed(content: np.ndarray, parts: int | Sequence[float], seed: int = 0) -> np.ndarray:
+    """
+    Assign each content to a single part by its hash: the same content always goes to the same part, as contents
+    are routed by load balancers.
+
+    :param content: contents to assign
+    :param parts: number of equal parts, or the weights of the parts
+    :param seed: hash key, different seeds give independent assignments
+    :return: part of each content
+    """
+    weights = _weights(parts)
+    # uniform [0, 1) position of the contents, then the part covering it
+    h = pd.util.hash_array(np.asarray(content))
+    if seed:
+        h = pd.util.hash_array(h ^ np.uint64(seed % 2 ** 64))
+    position = h / 2.0 ** 64
+    return np.minimum(np.searchsorted(np.cumsum(weights), position, side='right'), len(weights) - 1)
+
+
+def groups(assigned: np.ndarray, parts: int) -> List[np.ndarray]:
+    """
+    :param assigned: part of each row
+    :param parts: number of parts
+    :return: (ordered) row indexes of each part, found by a single stable sort instead of a mask per part
+    """
+    order = np.argsort(assigned, kind='stable')
+    return np.split(order, np.cumsum(np.bincount(assigned, minlength=parts))[:-1])
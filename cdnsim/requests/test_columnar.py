@@ -0,0 +1,123 @@
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from cdnsim.requests import Requests, BaseRequests, ThroughputRequests
+from cdnsim.requests.codec import ColumnarCodec
+
+
+class TestRequests(TestCase):
+    def test_init(self):
+        # sorted, duplicates aggregated
+        r = Requests(content=[3, 1, 2, 1], freq=[6, 10, 2, 5], size=[30, 10, 20, 12], tick=4)
+        self.assertListEqual([1, 2, 3], list(r.content))
+        self.assertListEqual([15, 2, 6], list(r.freq))
+        self.assertListEqual([10, 20, 30], list(r.size))
+        self.assertListEqual([4, 4, 4], list(r.tick))
+        self.assertEqual(3, len(r))
+
+        r = Requests(content=[1, 2], freq=[1, 2])
+        self.assertListEqual([0, 0], list(r.size))
+        self.assertListEqual([0, 0], list(r.tick))
+
+        with self.assertRaises(ValueError):
+            Requests(content=[1, 2], freq=[1])
+        with self.assertRaises(AttributeError):
+            r.dummy = 1
+
+    def test_split_rr(self):
+        r = Requests(content=[1, 2, 3], freq=[10, 2, 6])
+        d = r.split_rr(1)
+        self.assertEqual(1, len(d))
+        self.assertListEqual([10, 2, 6], list(d[0].freq))
+
+        d = r.split_rr(3)
+        self.assertEqual(3, len(d))
+        self.assertTrue(all(isinstance(i, Requests) for i in d))
+        self.assertListEqual([3, 0, 2], list(d[2].freq))
+        self.assertListEqual([1, 2, 3], list(d[2].content))
+
+        with self.assertRaises(ValueError):
+            r.split_rr(0)
+
+    def test_merge_requests(self):
+        r1 = Requests(content=[1, 2, 3], freq=[100, 200, 300], size=[10, 20, 30], tick=1)
+        r2 = Requests(content=[3, 4, 5], freq=[1, 2, 3], size=[25, 40, 50], tick=1)
+        r3 = Requests(content=[3], freq=[7], size=[30], tick=2)
+
+        with self.assertRaises(ValueError):
+            Requests.merge_requests([])
+
+        self.assertIs(r1, Requests.merge_requests([r1]))
+
+        s = Requests.merge_requests([r1, r2, r3, Requests(content=[], freq=[])])
+        self.assertListEqual([1, 1, 1, 1, 1, 2], list(s.tick))
+        self.assertListEqual([1, 2, 3, 4, 5, 3], list(s.content))
+        self.assertListEqual([100, 200, 301, 2, 3, 7], list(s.freq))
+        self.assertListEqual([10, 20, 25, 40, 50, 30], list(s.size))
+
+        self.assertListEqual([606, 7], list(s.rpt.values))
+        self.assertListEqual([1, 2], list(s.rpt.index))
+        self.assertListEqual([1000 + 4000 + 7525 + 80 + 150, 210], list(s.bpt.values))
+
+    def test_pandas(self):
+        r = Requests(content=[1, 2, 3], freq=[10, 2, 6], size=[1, 2, 3], tick=5)
+        df = r.to_pandas()
+        self.assertIsInstance(df, ThroughputRequests)
+        self.assertListEqual(['tick', 'content'], df.index.names)
+        self.assertListEqual([10, 2, 6], list(df.freq))
+
+        b = Requests.from_pandas(df)
+        for name in Requests.__slots__:
+            self.assertListEqual(list(getattr(r, name)), list(getattr(b, name)))
+
+        b = Requests.from_pandas(BaseRequests(data={'freq': [10, 2]},
+                                              index=pd.MultiIndex.from_arrays([[2, 1]], names=['content'])))
+        self.assertListEqual([1, 2], list(b.content))
+        self.assertListEqual([2, 10], list(b.freq))
+
+    def test_codec(self):
+        codec = ColumnarCodec()
+        r = Requests(content=[1, 2, 3], freq=[10, 2, 6], size=[1, 2, 3], tick=5)
+        columns = codec.encode(r)
+        d = codec.decode(columns)
+        self.assertIs(columns['freq'], d.freq)
+        self.assertListEqual([10, 2, 6], list(d.freq))
+        self.assertIsNone(codec.encode('hello'))
+        self.assertListEqual(['tick', 'content', 'freq', 'size'], list(codec.fields))
+
+    def test_split_random(self):
+        r = Requests(content=np.arange(1000), freq=np.arange(1000) % 7, size=np.ones(1000), tick=3)
+        rng = np.random.default_rng(0)
+        for parts in [1, 3, [0.7, 0.2, 0.1, 0]]:
+            d = r.split_random(parts, rng)
+            self.assertEqual(parts if isinstance(parts, int) else 4, len(d))
+            merged = Requests.merge_requests(d) if len(d) > 1 else d[0]
+            np.testing.assert_array_equal(r.content[r.freq > 0], merged.content)
+            np.testing.assert_array_equal(r.freq[r.freq > 0], merged.freq)
+            self.assertEqual(r.freq.sum(), sum(p.freq.sum() for p in d))
+            self.assertTrue(all((p.freq > 0).all() and (p.tick == 3).all() for p in d))
+        self.assertEqual(0, len(d[-1]))
+        self.assertGreater(d[0].freq.sum(), d[1].freq.sum())
+
+        with self.assertRaises(ValueError):
+            r.split_random(0)
+        with self.assertRaises(ValueError):
+            r.split_random([-1, 2])
+
+    def test_split_hash(self):
+        r = Requests(content=np.arange(1000), freq=np.ones(1000))
+        d = r.split_hash(4)
+        self.assertEqual(4, len(d))
+        self.assertEqual(1000, sum(len(p) for p in d))
+        self.assertTrue(all(150 < len(p) < 350 for p in d), [len(p) for p in d])
+
+        # the same content always goes to the same part, independently of the batch
+        e = Requests(content=np.arange(0, 1000, 3), freq=np.ones(334)).split_hash(4)
+        for p, q in zip(d, e):
+            self.assertTrue(np.isin(q.content, p.content).all())
+        self.assertFalse(all(np.array_equal(p.content, q.content) for p, q in zip(d, r.split_hash(4, seed=1))))
+
+        d = r.split_hash([3, 1])
+        self.assertGreater(len(d[0]), 2 * len(d[1]))
@@ -1,8 +1,10 @@
 from unittest import TestCase
 
+import numpy as np
 import pandas as pd
 
 from cdnsim.requests import BaseRequests, BaseSeries
+from cdnsim.requests.codec import RequestsCodec
 
 
 class TestRequests(TestCase):
@@ -130,6 +132,26 @@ class TestRequests(TestCase):
         # self.assertListEqual([1, 2, 3], list(d[1].index.levels[0]))
         # self.assertListEqual([1, 2, 3], list(d[2].index.levels[0]))
 
+    def test_merge_requests(self):
+        # fan-in above the recursion limit
+        dfs = [BaseRequests(data={'freq': [1, 2]}, index=pd.MultiIndex.from_arrays([[i % 7, 100]], names=['content']))
+               for i in range(2000)]
+        s = BaseRequests.merge_requests(dfs)
+        self.assertListEqual(list(range(7)) + [100], list(s.index.get_level_values('content')))
+        self.assertEqual(2000, s.freq.iloc[:7].sum())
+        self.assertEqual(4000, s.freq.iloc[7])
+
+        # multiple index levels, non-numeric content
+        r1 = BaseRequests(data={'freq': [1, 2], 'size': [5, 6]},
+                          index=pd.MultiIndex.from_arrays([[1, 0], ['c2', 'c1']], names=['tick', 'content']))
+        r2 = BaseRequests(data={'freq': [10, 20], 'size': [5, 7]},
+                          index=pd.MultiIndex.from_arrays([[1, 1], ['c2', 'c1']], names=['tick', 'content']))
+        s = BaseRequests.merge_requests([r1, r2])
+        self.assertIsInstance(s, BaseRequests)
+        self.assertListEqual([(0, 'c1'), (1, 'c1'), (1, 'c2')], list(s.index))
+        self.assertListEqual([2, 20, 11], list(s.freq))
+        self.assertListEqual(['tick', 'content'], s.index.names)
+
     def test_custom(self):
         class MyBaseSeries(BaseSeries):
             @property
@@ -156,3 +178,45 @@ class TestRequests(TestCase):
         # default methods
         self.assertIsInstance(r1.sort_values('freq', ascending=False), MyBaseRequests)
         self.assertIsInstance(r1[['freq', 'dummyc']], MyBaseRequests)
+
+    def test_codec(self):
+        codec = RequestsCodec()
+        r = BaseRequests(data={'freq': [10, 2, 6]}, index=pd.MultiIndex.from_arrays([[1, 2, 3]], names=['content']))
+        columns = codec.encode(r)
+        self.assertListEqual(['content', 'freq'], list(codec.fields.keys()))
+        self.assertListEqual([1, 2, 3], list(columns['content']))
+        self.assertListEqual([10, 2, 6], list(columns['freq']))
+
+        d = codec.decode(columns)
+        self.assertIsInstance(d, BaseRequests)
+        self.assertListEqual([10, 2, 6], list(d.freq))
+        self.assertListEqual(['content'], d.index.names)
+
+        # non-integer content or other index is not encoded
+        self.assertIsNone(codec.encode(
+            BaseRequests(data={'freq': [1]}, index=pd.MultiIndex.from_arrays([['c1']], names=['content']))))
+        self.assertIsNone(codec.encode(
+            BaseRequests(data={'freq': [1]}, index=pd.MultiIndex.from_arrays([[0], [1]], names=['tick', 'content']))))
+        self.assertIsNone(codec.encode('hello'))
+
+    def test_split_random(self):
+        r = BaseRequests(data={'freq': [10, 2, 6, 0], 'size': [1, 2, 3, 4]},
+                         index=pd.MultiIndex.from_arrays([['a', 'b', 'c', 'd']], names=['content']))
+        d = r.split_random(3, np.random.default_rng(0))
+        self.assertEqual(3, len(d))
+        self.assertTrue(all(isinstance(p, BaseRequests) for p in d))
+        self.assertTrue(all((p.freq > 0).all() for p in d))
+        pd.testing.assert_series_equal(r.freq[r.freq > 0], BaseRequests.merge_requests(d).freq, check_dtype=False)
+        for p in d:
+            pd.testing.assert_series_equal(r['size'][p.index], p['size'])
+
+        d[0].loc['a', 'freq'] = -1
+        self.assertNotIn(-1, list(d[1].freq) + list(r.freq))
+
+    def test_split_hash(self):
+        r = BaseRequests(data={'freq': np.ones(300, dtype=int)},
+                         index=pd.MultiIndex.from_arrays([[f"c{i}" for i in range(300)]], names=['content']))
+        d = r.split_hash([1, 1, 2])
+        self.assertEqual(300, sum(len(p) for p in d))
+        self.assertGreater(len(d[2]), len(d[0]))
+        self.assertTrue(r.iloc[::2].split_hash([1, 1, 2])[0].index.isin(d[0].index).all())
@@ -0,0 +1,34 @@
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from cdnsim.requests import ThroughputRequests
+
+
+class TestThroughputRequests(TestCase):
+    def test_merge_requests(self):
+        rng = np.random.default_rng(0)
+        dfs = []
+        for _ in range(50):
+            tick = int(rng.integers(5))
+            content = np.unique(rng.integers(100, size=30))
+            dfs.append(ThroughputRequests(data={'freq': rng.integers(1, 10, size=len(content)),
+                                                'size': rng.integers(1, 10, size=len(content))},
+                                          index=pd.MultiIndex.from_arrays([np.full(len(content), tick), content],
+                                                                          names=['tick', 'content'])))
+
+        s = ThroughputRequests.merge_requests(dfs)
+        expected = pd.concat(map(pd.DataFrame, dfs)).groupby(['tick', 'content']).agg({'freq': 'sum', 'size': 'min'})
+        self.assertIsInstance(s, ThroughputRequests)
+        pd.testing.assert_frame_equal(expected, pd.DataFrame(s), check_dtype=False)
+        self.assertIs(dfs[0], ThroughputRequests.merge_requests(dfs[:1]))
+        with self.assertRaises(ValueError):
+            ThroughputRequests.merge_requests([])
+
+    def test_init(self):
+        with self.assertRaises(SyntaxError):
+            ThroughputRequests(data={'freq': [1], 'size': [1]}, index=pd.Index(['c1'], name='content'))
+        with self.assertRaises(SyntaxError):
+            ThroughputRequests(data={'freq': [1]}, index=pd.MultiIndex.from_arrays([[0], ['c1']],
+                                                                                   names=['tick', 'content']))
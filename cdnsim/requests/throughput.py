@@ -0,0 +1,56 @@
+from typing import List, Self
+
+import numpy as np
+import pandas as pd
+
+from cdnsim.requests.requests import BaseRequests
+
+
+class ThroughputRequests(BaseRequests):
+    """
+    Requests indexed by tick and content, with the number of requests (freq) and the content size.
+    """
+
+    @classmethod
+    def merge_requests(cls, dfs: List[Self]) -> Self:
+        """
+        Merge requests: sum the freq and take the minimum size of the same (tick, content) pairs.
+
+        Messages cover a single tick and are sorted by content, so instead of a hashing groupby, the columns are
+        concatenated, (stable) sorted by tick and content, and reduced at the boundaries of equal pairs.
+        """
+        if len(dfs) == 0:
+            raise ValueError("Cannot merge an empty DataFrame")
+
+        if len(dfs) == 1:
+            return dfs[0]
+
+        tick = np.concatenate([df.index.get_level_values('tick').to_numpy() for df in dfs])
+        content = np.concatenate([df.index.get_level_values('content').to_numpy() for df in dfs])
+        freq = np.concatenate([df['freq'].to_numpy() for df in dfs])
+        size = np.concatenate([df['size'].to_numpy() for df in dfs])
+
+        # sort keys, non-numeric contents are sorted by their (sorted) factorized codes
+        key = content if np.issubdtype(content.dtype, np.number) else pd.factorize(content, sort=True)[0]
+        order = np.lexsort((key, tick))
+        tick, key = tick[order], key[order]
+        first = np.flatnonzero(np.r_[True, (tick[1:] != tick[:-1]) | (key[1:] != key[:-1])]) if len(order) else order
+
+        return cls(data={'freq': np.add.reduceat(freq[order], first) if len(first) else freq,
+                         'size': np.minimum.reduceat(size[order], first) if len(first) else size},
+                   index=pd.MultiIndex.from_arrays([tick[first], content[order][first]], names=['tick', 'content']))
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if 'tick' not in self.index.names:
+            raise SyntaxError(f"'tick' must be part of the index names, got: {self.index.names}")
+        if 'size' not in self.columns:
+            raise SyntaxError(f"'size' must be part of the columns, got: {self.columns}")
+
+    @property
+    def rpt(self) -> pd.Series:
+        return self.freq.groupby('tick').sum()
+
+    @property
+    def bpt(self) -> pd.Series:
+        return self.prod(axis=1).groupby('tick').sum()
@@ -0,0 +1,71 @@
+from typing import List, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+class HashRing:
+    """
+    Consistent hash ring: each node owns virtual node points on the ring, a content belongs to the node of the next
+    point after the hash of the content. Adding or removing a node moves only the contents of that node.
+    """
+
+    def __init__(self, nodes: Sequence[str], weights: Sequence[float] = None, vnodes: int = 100):
+        """
+        :param nodes: node names
+        :param weights: relative capacity of the nodes, the number of virtual nodes is proportional to it, equal if not
+                        given
+        :param vnodes: average number of virtual nodes of a node
+        """
+        if len(nodes) == 0:
+            raise ValueError("Cannot create a hash ring without nodes")
+        weights = np.ones(len(nodes)) if weights is None else np.asarray(weights, dtype=float)
+        if len(weights) != len(nodes) or (weights < 0).any() or weights.sum() <= 0:
+            raise ValueError(f"Wrong weights {weights} of {len(nodes)} nodes")
+
+        counts = np.rint(vnodes * len(nodes) * weights / weights.sum()).astype(np.int64)
+        owners = np.repeat(np.arange(len(nodes)), counts)
+        points = pd.util.hash_array(np.array([f"{nodes[i]}#{j}" for i, count in enumerate(counts)
+                                              for j in range(count)], dtype=object))
+        order = np.argsort(points)
+        self.__points = points[order]
+        self.__owners = owners[order]
+        self.__nodes = list(nodes)
+
+    @property
+    def nodes(self) -> List[str]:
+        return self.__nodes
+
+    def lookup(self, content: np.ndarray) -> np.ndarray:
+        """
+        :param content: content ids
+        :return: node index of each content, a single binary search over the ring for all
+        """
+        i = np.searchsorted(self.__points, pd.util.hash_array(np.asarray(content)), side='left')
+        return self.__owners[i % len(self.__points)]
+
+
+class RouterMixIn:
+    """
+    Routes every content to a single downstream by a consistent hash ring of the downstreams, instead of sending a
+    slice of every content to all of them. Mix into a Client or a Cache (before it), their _split() is replaced.
+    """
+    # average number of virtual nodes per downstream
+    vnodes = 100
+
+    def __init__(self, weights: dict[str, float] = None, **kwargs):
+        """
+        :param weights: relative capacity of the downstreams by name, 1 if not given
+        """
+        self.__weights = weights or {}
+        self.__ring = None
+        super().__init__(**kwargs)
+
+    def _split(self, requests) -> list:
+        downstreams = self.downstreams
+        if self.__ring is None or self.__ring.nodes != downstreams:
+            self.__ring = HashRing(downstreams, [self.__weights.get(name, 1) for name in downstreams], self.vnodes)
+
+        content = requests.index.get_level_values('content').to_numpy() if isinstance(requests, pd.DataFrame) else \
+            requests.content
+        return requests.split_by(self.__ring.lookup(content), len(downstreams))
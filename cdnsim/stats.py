@@ -1,4 +1,115 @@
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+
 class StatsMixIn:
+    """
+    Per tick counters of a node, in a NumPy array grown in chunks: nodes call _record() once per step with the counts
+    of the tick, collect() gathers the counters of all nodes into a single DataFrame at the end of the simulation.
+
+    Metrics:
+
+    - requests, bytes: requests received (sent by clients) and their bytes
+    - hits, misses: requests served from the cache, and forwarded to the downstreams (fetched from the origin)
+    - hitbytes, missbytes: bytes of the hits and misses, the latter are the bytes from the origin (or the next tier)
+
+    Subclasses may add metrics, by extending *metrics*.
+
+    If *binlog* is set, the counters are also appended to it, every *chunk* ticks and when the node exits.
+    """
+    metrics = ('requests', 'bytes', 'hits', 'misses', 'hitbytes', 'missbytes')
+
+    # number of ticks the counters grow by, and are written to the binlog by
+    chunk = 1024
+
+    # cdnsim.binlog.BinaryLog of the counters, None for keeping them in memory only
+    binlog = None
+
     def __init__(self, **kwargs):
-        pass
+        # allocated at the first tick, keeps building large topologies cheap
+        self.__counters = np.zeros((0, len(self.metrics)), dtype=np.int64)
+        self.__ticks = 0
+        self.__logged = 0
+        super().__init__(**kwargs)
+
+    def _record(self, **counts: int) -> None:
+        """
+        Record the counts of the next tick, metrics not given are zero.
+
+        :param counts: count of each metric
+        """
+        if self.__ticks == len(self.__counters):
+            self.__counters = np.concatenate([self.__counters, np.zeros((self.chunk, len(self.metrics)),
+                                                                        dtype=np.int64)])
+        row = self.__counters[self.__ticks]
+        for name, count in counts.items():
+            row[self.metrics.index(name)] = count
+        self.__ticks += 1
+        if self.binlog is not None and self.__ticks - self.__logged >= self.chunk:
+            self._flush()
+
+    def _flush(self) -> None:
+        """
+        Append the counters not written yet to the binlog.
+        """
+        if self.binlog is None or self.__ticks == self.__logged:
+            return
+        counters = self.__counters[self.__logged:self.__ticks]
+        self.binlog.append(self.name, {'tick': np.arange(self.__logged, self.__ticks),
+                                       **{name: counters[:, i] for i, name in enumerate(self.metrics)}})
+        self.__logged = self.__ticks
+
+    def _finalize(self) -> None:
+        super()._finalize()
+        self._flush()
+
+    def _record_requests(self, *batches, **counts: int) -> None:
+        """
+        Record the requests and bytes of the batches of the tick (Requests or Events), and further counts.
+
+        :param batches: received or sent requests
+        :param counts: count of further metrics
+        """
+        requests, nbytes = 0, 0
+        for batch in batches:
+            freq = getattr(batch, 'freq', None)
+            requests += len(batch) if freq is None else int(freq.sum())
+            nbytes += int(batch.size.sum()) if freq is None else int((freq * batch.size).sum())
+        self._record(requests=requests, bytes=nbytes, **counts)
+
+    @property
+    def stats(self) -> pd.DataFrame:
+        """
+        Counters of the recorded ticks, indexed by tick.
+        """
+        return pd.DataFrame(self.__counters[:self.__ticks], columns=list(self.metrics),
+                            index=pd.RangeIndex(self.__ticks, name='tick'))
+
+    @property
+    def totals(self) -> dict[str, int]:
+        """
+        Counters summed over the recorded ticks.
+        """
+        return dict(zip(self.metrics, self.__counters[:self.__ticks].sum(axis=0).tolist()))
+
+
+def collect(nodes: Iterable = None) -> pd.DataFrame:
+    """
+    Gather the counters of the nodes into a tidy DataFrame: a row per node and tick, a column per metric (zero for
+    metrics the node does not have). Counters of nodes run by the 'process' backend stay in the worker processes.
 
+    :param nodes: nodes to collect, the StatsMixIn nodes of the current Simulation if not given (before terminating it)
+    :return: node, tick and metric columns
+    """
+    if nodes is None:
+        from nodes.node import Node
+        nodes = Node.list_all()
+    frames = [node.stats.reset_index().assign(node=node.name) for node in nodes if isinstance(node, StatsMixIn)]
+    if not frames:
+        return pd.DataFrame(columns=['node', 'tick', *StatsMixIn.metrics])
+    df = pd.concat(frames, ignore_index=True)
+    metrics = [column for column in df.columns if column not in ('node', 'tick')]
+    df[metrics] = df[metrics].fillna(0).astype(np.int64)
+    return df[['node', 'tick', *metrics]]
@@ -0,0 +1,73 @@
+import hashlib
+import itertools
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Mapping, Sequence
+
+import pandas as pd
+
+
+def grid(**values: Sequence) -> list[dict]:
+    """
+    :param values: values of each parameter
+    :return: all combinations of the values, as keyword arguments of a run
+    """
+    return [dict(zip(values, combination)) for combination in itertools.product(*values.values())]
+
+
+def _key(params: dict) -> str:
+    return hashlib.sha1(json.dumps(params, sort_keys=True, default=repr).encode()).hexdigest()[:20]
+
+
+def _run(run: Callable, params: dict, path: Path | None) -> pd.DataFrame:
+    # executed in a fresh worker process, the result is cached there, so completed runs survive a failing sweep
+    result = run(**params)
+    result = result if isinstance(result, pd.DataFrame) else pd.DataFrame([result])
+    if path is not None:
+        result.to_pickle(path.with_suffix('.tmp'))
+        os.replace(path.with_suffix('.tmp'), path)
+    return result
+
+
+def sweep(run: Callable[..., pd.DataFrame | Mapping], params: Sequence[dict], cache: str | Path = None,
+          workers: int = None) -> pd.DataFrame:
+    """
+    Run a simulation for each parameter combination, each in its own worker process: a process runs a single
+    simulation, then exits, so the nodes of a simulation never meet the ones of another. Use a single threaded backend
+    (the default 'thread' or 'direct') in *run*, the runs themselves occupy the CPUs.
+
+    :param run: builds and runs a simulation of the keyword arguments, returns its results as a DataFrame or a mapping
+                of scalars (one row), must be picklable (defined at module level)
+    :param params: keyword arguments of the runs, see grid()
+    :param cache: directory of the results of completed runs, combinations found there are not run again (it belongs to
+                  a single *run* function, results are stored by the arguments only)
+    :param workers: number of parallel runs, the number of CPUs if not given
+    :return: results of all runs, with the arguments as leading columns
+    """
+    if cache is not None:
+        cache = Path(cache)
+        cache.mkdir(parents=True, exist_ok=True)
+    paths = [None if cache is None else cache / f"{_key(p)}.pkl" for p in params]
+    results = {i: pd.read_pickle(path) for i, path in enumerate(paths) if path is not None and path.exists()}
+
+    pending = [i for i in range(len(params)) if i not in results]
+    if pending:
+        # a fresh process per run (which rules out forking)
+        with ProcessPoolExecutor(max_workers=min(workers or os.cpu_count(), len(pending)),
+                                 mp_context=multiprocessing.get_context('spawn'), max_tasks_per_child=1) as executor:
+            futures = {i: executor.submit(_run, run, params[i], paths[i]) for i in pending}
+            try:
+                for i, future in futures.items():
+                    results[i] = future.result()
+            except BaseException:
+                executor.shutdown(cancel_futures=True)
+                raise
+
+    frames = []
+    for i, p in enumerate(params):
+        columns = [*p, *results[i].columns.difference(list(p), sort=False)]
+        frames.append(results[i].assign(**p)[columns])
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
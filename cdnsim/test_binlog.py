@@ -0,0 +1,69 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+import numpy as np
+
+from cdnsim import BinaryLog, Origin, StatsMixIn, collect, read_log
+from cdnsim.arrival import Trace
+from cdnsim.binlog import load
+from cdnsim.policy import LRU, PolicyCache
+from cdnsim.workload import Zipf, ZipfClient
+from nodes.node import Node
+
+
+class TestBinaryLog(TestCase):
+    def setUp(self) -> None:
+        self.tmp = TemporaryDirectory()
+        self.path = Path(self.tmp.name) / 'log'
+
+    def tearDown(self) -> None:
+        Node.terminate_all(1)
+        Node.backend = 'thread'
+        StatsMixIn.binlog = None
+        self.tmp.cleanup()
+
+    def test_append(self):
+        log = BinaryLog(self.path)
+        log.append('a', {'tick': [0, 1], 'requests': [5, 6]})
+        log.append('b', {'tick': [0], 'hits': [1]})
+        log.append('a', {'tick': [2], 'requests': np.array([7], dtype=np.int32)})
+        with self.assertRaises(ValueError):
+            log.append('a', {'tick': [3]})
+
+        columns = load(self.path / 'a')
+        self.assertIsInstance(columns['tick'], np.memmap)
+        self.assertListEqual([5, 6, 7], columns['requests'].tolist())
+        # an interrupted append is cut off
+        with open(self.path / 'a' / 'tick.bin', 'ab') as f:
+            np.array([3], dtype='<i8').tofile(f)
+        self.assertEqual(3, len(load(self.path / 'a')['tick']))
+
+        df = read_log(self.path)
+        self.assertListEqual(['node', 'tick', 'requests', 'hits'], list(df.columns))
+        self.assertListEqual([['a', 0, 5, 0], ['a', 1, 6, 0], ['a', 2, 7, 0], ['b', 0, 0, 1]], df.values.tolist())
+
+        with self.assertRaises(FileExistsError):
+            BinaryLog(self.path)
+        BinaryLog(self.path, overwrite=True)
+        self.assertEqual(0, len(read_log(self.path)))
+
+    def test_nodes(self):
+        Node.backend = 'direct'
+        StatsMixIn.binlog = BinaryLog(self.path)
+        StatsMixIn.chunk = 2
+        try:
+            client = ZipfClient(name='client', zipf=Zipf(a=1.1, n=100, rng=np.random.default_rng(0)),
+                                arrival=Trace(counts=[100, 200, 300, 400, 500]), size=np.arange(100))
+            cache = PolicyCache(name='cache', policy=LRU(capacity=500))
+            origin = Origin(name='origin')
+            client.connect_to(cache)
+            cache.connect_to(origin)
+            Node.start_all()
+            Node.join_all()
+        finally:
+            StatsMixIn.chunk = 1024
+        df = read_log(self.path).sort_values(['node', 'tick'], ignore_index=True)
+        expected = collect().sort_values(['node', 'tick'], ignore_index=True)
+        self.assertEqual(15, len(df))
+        self.assertTrue(df.equals(expected))
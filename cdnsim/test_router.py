@@ -0,0 +1,65 @@
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from cdnsim import HashRing, RouterMixIn, Cache
+from cdnsim.requests import Requests, BaseRequests
+from nodes.node import LNode, Node
+from nodes.log import DummylogMixIn
+
+
+class MySink(LNode, DummylogMixIn):
+    def _step(self, msgs: list) -> None:
+        pass
+
+
+class MyRoutedCache(RouterMixIn, Cache):
+    def _step(self, msgs: list) -> list:
+        return self._split(Requests.merge_requests(msgs))
+
+
+class TestRouter(TestCase):
+    def tearDown(self) -> None:
+        Node.terminate_all(1)
+
+    def test_hashring(self):
+        content = np.arange(100000)
+        ring = HashRing(['a', 'b', 'c', 'd'])
+        assigned = ring.lookup(content)
+        self.assertTrue(all(20000 < n < 30000 for n in np.bincount(assigned)), np.bincount(assigned))
+
+        # only the contents of the removed node move
+        moved = HashRing(['a', 'b', 'd']).lookup(content)
+        names = np.array(['a', 'b', 'c', 'd'])
+        kept = assigned != 2
+        np.testing.assert_array_equal(names[assigned[kept]], np.array(['a', 'b', 'd'])[moved[kept]])
+
+        # weights
+        counts = np.bincount(HashRing(['a', 'b'], weights=[3, 1]).lookup(content))
+        self.assertGreater(counts[0], 2 * counts[1])
+
+        with self.assertRaises(ValueError):
+            HashRing([])
+        with self.assertRaises(ValueError):
+            HashRing(['a'], weights=[1, 2])
+
+    def test_router(self):
+        cache = MyRoutedCache(name='cache', weights={'sink1': 2})
+        sinks = [MySink(name=f"sink{i}") for i in range(3)]
+        for sink in sinks:
+            cache.connect_to(sink)
+
+        r = Requests(content=np.arange(3000), freq=np.ones(3000), size=np.ones(3000))
+        parts = cache._step([r])
+        self.assertEqual(3, len(parts))
+        self.assertEqual(3000, sum(len(p) for p in parts))
+        self.assertGreater(len(parts[1]), len(parts[0]))
+        for p in parts:
+            self.assertTrue((np.diff(p.content) > 0).all())
+
+        # the same contents go to the same downstreams, pandas based requests are routed the same way
+        df = BaseRequests(data={'freq': np.ones(1000, dtype=int)},
+                          index=pd.MultiIndex.from_arrays([np.arange(0, 3000, 3)], names=['content']))
+        for p, q in zip(parts, cache._split(df)):
+            self.assertTrue(np.isin(q.index.get_level_values('content'), p.content).all())
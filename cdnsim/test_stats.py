@@ -0,0 +1,66 @@
+from unittest import TestCase
+
+import numpy as np
+
+from cdnsim import Cache, Origin, StatsMixIn, collect
+from cdnsim.arrival import Trace
+from cdnsim.policy import LRU, PolicyCache
+from cdnsim.requests import Requests
+from cdnsim.workload import Zipf, ZipfClient
+from nodes.log import DummylogMixIn
+from nodes.node import Node
+
+
+class MyCache(Cache, DummylogMixIn):
+    def _step(self, msgs: list) -> list:
+        return msgs
+
+
+class TestStats(TestCase):
+    def tearDown(self) -> None:
+        Node.terminate_all(1)
+        Node.backend = 'thread'
+
+    def test_record(self):
+        cache = MyCache(name='cache')
+        self.assertEqual(0, len(cache.stats))
+        for i in range(StatsMixIn.chunk + 10):
+            cache._record(requests=i, hits=1)
+        cache._record_requests(Requests(content=[1, 2], freq=[3, 4], size=[10, 100]), misses=2)
+        stats = cache.stats
+        self.assertEqual(StatsMixIn.chunk + 11, len(stats))
+        self.assertListEqual(list(StatsMixIn.metrics), list(stats.columns))
+        self.assertEqual(StatsMixIn.chunk + 9, stats.requests.iloc[-2])
+        self.assertListEqual([7, 430, 0, 2, 0, 0], stats.iloc[-1].tolist())
+        self.assertEqual(StatsMixIn.chunk + 10, cache.totals['hits'])
+
+        with self.assertRaises(ValueError):
+            cache._record(unknown=1)
+
+    def test_collect(self):
+        Node.backend = 'direct'
+        client = ZipfClient(name='client', zipf=Zipf(a=1.1, n=100, rng=np.random.default_rng(0)),
+                            arrival=Trace(counts=[100, 200, 300]), size=np.arange(100))
+        cache = PolicyCache(name='cache', policy=LRU(capacity=500))
+        origin = Origin(name='origin')
+        client.connect_to(cache)
+        cache.connect_to(origin)
+        Node.start_all()
+        Node.join_all()
+
+        df = collect()
+        self.assertListEqual(['node', 'tick', *StatsMixIn.metrics], list(df.columns))
+        self.assertListEqual(['client'] * 3 + ['cache'] * 3 + ['origin'] * 3, df.node.tolist())
+        self.assertListEqual([0, 1, 2] * 3, df.tick.tolist())
+        by = df.set_index(['node', 'tick'])
+        self.assertListEqual([100, 200, 300], by.loc['client', 'requests'].tolist())
+        np.testing.assert_array_equal(by.loc['client', 'requests'], by.loc['cache', 'requests'])
+        np.testing.assert_array_equal(by.loc['cache', 'hits'] + by.loc['cache', 'misses'], by.loc['cache', 'requests'])
+        np.testing.assert_array_equal(by.loc['cache', 'hitbytes'] + by.loc['cache', 'missbytes'],
+                                      by.loc['cache', 'bytes'])
+        # the bytes from the origin
+        np.testing.assert_array_equal(by.loc['cache', 'misses'], by.loc['origin', 'requests'])
+        np.testing.assert_array_equal(by.loc['cache', 'missbytes'], by.loc['origin', 'bytes'])
+        self.assertGreater(by.loc['cache', 'hits'].sum(), 0)
+
+        self.assertEqual(0, len(collect([])))
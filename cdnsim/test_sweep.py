@@ -0,0 +1,53 @@
+import os
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from cdnsim import collect
+from cdnsim.sweep import grid, sweep
+from cdnsim.topology import Topology
+from nodes.node import Node
+
+
+def simulate(capacity: int, a: float) -> dict:
+    Node.backend = 'direct'
+    Topology({'seed': 0, 'tiers': [
+        {'name': 'client', 'type': 'ZipfClient',
+         'params': {'zipf': {'type': 'Zipf', 'a': a, 'n': 100}, 'size': [1] * 100,
+                    'arrival': {'type': 'Constant', 'rate': 100, 'ticks': 5}}},
+        {'name': 'cache', 'type': 'PolicyCache', 'params': {'policy': {'type': 'LRU', 'capacity': capacity}}},
+        {'name': 'origin', 'type': 'Origin'}]})
+    Node.start_all()
+    Node.join_all()
+    totals = collect().groupby('node').sum()
+    # a fresh process per run: no other nodes were registered
+    return {'nodes': len(Node.list_all()), 'pid': os.getpid(), 'hitratio': totals.hits['cache'] / 500}
+
+
+def fail(**kwargs) -> dict:
+    raise RuntimeError("Not cached")
+
+
+class TestSweep(TestCase):
+    def test_grid(self):
+        self.assertListEqual([{'a': 1, 'b': 'x'}, {'a': 1, 'b': 'y'}, {'a': 2, 'b': 'x'}, {'a': 2, 'b': 'y'}],
+                             grid(a=[1, 2], b=['x', 'y']))
+        self.assertListEqual([{}], grid())
+
+    def test_sweep(self):
+        params = grid(capacity=[10, 50], a=[0.8, 1.2])
+        with TemporaryDirectory() as tmp:
+            df = sweep(simulate, params, cache=tmp, workers=2)
+            self.assertListEqual(['capacity', 'a', 'nodes', 'pid', 'hitratio'], list(df.columns))
+            self.assertListEqual(params, df[['capacity', 'a']].to_dict('records'))
+            self.assertListEqual([3] * 4, df.nodes.tolist())
+            self.assertEqual(4, df.pid.nunique())
+            by = df.set_index(['capacity', 'a']).hitratio
+            self.assertGreater(by[50, 0.8], by[10, 0.8])
+            self.assertGreater(by[10, 1.2], by[10, 0.8])
+            self.assertEqual(4, len(list(Path(tmp).glob('*.pkl'))))
+
+            # cached combinations are not run again
+            self.assertTrue(df.equals(sweep(fail, params, cache=tmp)))
+            with self.assertRaises(RuntimeError):
+                sweep(fail, grid(capacity=[10, 20], a=[0.8]), cache=tmp)
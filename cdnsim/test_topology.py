@@ -0,0 +1,101 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+import numpy as np
+
+from cdnsim import Origin, collect
+from cdnsim.policy import PolicyCache
+from cdnsim.router import RouterMixIn
+from cdnsim.topology import Topology, resolve
+from nodes.node import Node
+
+SPEC = """
+seed: 1
+tiers:
+  - name: client
+    type: ZipfClient
+    pops: 4
+    route: hash
+    params:
+      zipf: {type: Zipf, a: 1.1, n: 100}
+      arrival: {type: Poisson, lam: 50, ticks: 5}
+      size: {type: numpy.full, shape: 100, fill_value: 10}
+  - name: cache_l1
+    type: PolicyCache
+    pops: 4
+    servers: 3
+    params:
+      policy: {type: LRU, capacity: 200}
+  - name: cache_l2
+    type: PolicyCache
+    pops: 2
+    servers: 2
+    connect: all
+    params:
+      policy: {type: LRU, capacity: 500}
+  - name: origin
+    type: Origin
+"""
+
+
+class TestTopology(TestCase):
+    def tearDown(self) -> None:
+        Node.terminate_all(1)
+        Node.backend = 'thread'
+
+    def test_build(self):
+        topology = Topology.from_yaml(SPEC)
+        self.assertListEqual(['client', 'cache_l1', 'cache_l2', 'origin'], list(topology.tiers))
+        self.assertEqual(4 + 12 + 4 + 1, len(topology.nodes))
+        clients, l1, l2 = topology.tiers['client'], topology.tiers['cache_l1'], topology.tiers['cache_l2']
+        origin = topology.tiers['origin'][0][0]
+        self.assertEqual('client_pop1', clients[1][0].name)
+        self.assertEqual('cache_l1_pop2_no1', l1[2][1].name)
+        self.assertEqual('origin', origin.name)
+        self.assertIsInstance(clients[0][0], RouterMixIn)
+        self.assertNotIsInstance(l1[0][0], RouterMixIn)
+        self.assertIsInstance(origin, Origin)
+
+        # a pop connects to the servers of its pop, pops are grouped onto fewer pops
+        self.assertListEqual([node.name for node in l1[1]], clients[1][0].downstreams)
+        self.assertListEqual([node.name for node in l2[0]], l1[1][0].downstreams)
+        self.assertListEqual([node.name for node in l2[1]], l1[2][0].downstreams)
+        self.assertListEqual(['origin'], l2[1][1].downstreams)
+        # each node has its own objects
+        self.assertIsNot(l1[0][0].policy, l1[0][1].policy)
+
+        Node.backend = 'direct'
+        Node.start_all()
+        Node.join_all()
+        totals = collect().groupby('node').sum()
+        self.assertEqual(totals.loc[[f"client_pop{pop}" for pop in range(4)], 'requests'].sum(),
+                         totals.loc[[node.name for servers in l1 for node in servers], 'requests'].sum())
+        self.assertEqual(totals.loc[[node.name for servers in l2 for node in servers], 'misses'].sum(),
+                         totals.loc['origin', 'requests'])
+        self.assertEqual(10 * totals.loc['origin', 'requests'], totals.loc['origin', 'bytes'])
+
+    def test_seed(self):
+        with TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'spec.yaml'
+            path.write_text(SPEC)
+            first, second = Topology.from_yaml(path), Topology.from_yaml(str(path))
+        draw = [next(iter(topology.tiers['client'][0][0]._arrival)) for topology in (first, second)]
+        self.assertEqual(draw[0], draw[1])
+
+    def test_spec(self):
+        spec = {'tiers': [{'name': 'cache', 'type': PolicyCache, 'pops': 2,
+                           'params': {'policy': {'type': 'LRU', 'capacity': 1}}},
+                          {'name': 'origin', 'type': 'cdnsim.origin.Origin', 'pops': 3}]}
+        with self.assertRaises(ValueError):
+            Topology(spec)
+        spec['tiers'][0]['connect'] = 'all'
+        self.assertListEqual(['origin_pop0', 'origin_pop1', 'origin_pop2'],
+                             Topology(spec).tiers['cache'][1][0].downstreams)
+
+        self.assertIs(np.full, resolve('numpy.full'))
+        for tiers in ([], [{'name': 'a', 'type': 'Unknown'}], [{'name': 'a', 'type': Origin, 'servers': 0}],
+                      [{'name': 'a', 'type': Origin}, {'name': 'a', 'type': Origin}],
+                      [{'name': 'a', 'type': Origin, 'route': 'random'}]):
+            with self.assertRaises(ValueError):
+                Topology({'tiers': tiers})
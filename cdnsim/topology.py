@@ -0,0 +1,162 @@
+import importlib
+import inspect
+from functools import cache
+from pathlib import Path
+from typing import Any, List
+
+import numpy as np
+
+from nodes.node import Node
+
+# modules searched for the type names of a spec, before importing dotted names
+MODULES = ('cdnsim', 'cdnsim.policy', 'cdnsim.workload', 'cdnsim.arrival', 'cdnsim.event')
+
+
+def resolve(name: str | type) -> Any:
+    """
+    :param name: a class (or callable), its name in one of MODULES, or a dotted name 'module.attribute'
+    :return: the class (or callable)
+    """
+    if not isinstance(name, str):
+        return name
+    for module in MODULES:
+        found = getattr(importlib.import_module(module), name, None)
+        if found is not None:
+            return found
+    module, _, attribute = name.rpartition('.')
+    if module:
+        try:
+            return getattr(importlib.import_module(module), attribute)
+        except (ImportError, AttributeError):
+            pass
+    raise ValueError(f"Unknown type: {name}")
+
+
+@cache
+def _seeded(factory) -> bool:
+    # whether the factory takes a random generator, looked up once per type
+    return 'rng' in inspect.signature(factory).parameters
+
+
+class Topology:
+    """
+    CDN of tiers built from a declarative spec, a dict or YAML document:
+
+    .. code-block:: yaml
+
+        seed: 0                  # optional, seeds the rng parameter of the built objects
+        tiers:                   # in the direction of the requests, from the clients to the origin
+          - name: client
+            type: ZipfClient     # node class
+            pops: 24             # default 1
+            servers: 1           # per pop, default 1
+            route: hash          # optional, route the contents to the downstreams by consistent hashing
+            connect: pop         # 'pop' (default): to the next tier's servers of the pop, 'all': to all of them
+            params:              # constructor parameters, a mapping with a 'type' is built for each node
+              zipf: {type: Zipf, a: 1.1, n: 10000}
+              arrival: {type: Poisson, lam: 300, ticks: 3600}
+          - name: cache_l1
+            type: PolicyCache
+            pops: 24
+            servers: 30
+            params:
+              policy: {type: LRU, capacity: 1000000}
+          - name: origin
+            type: Origin
+
+    Types are classes (in dict specs), names of cdnsim classes or dotted names of any callable. Nodes are named
+    *name*_pop<pop>_no<server>, leaving out the pop and the server of tiers having one. With 'pop' connections, the
+    pops of a tier are mapped onto the pops of the next tier in contiguous groups, so a tier of a single pop gets
+    connected to all servers of the next one.
+    """
+
+    def __init__(self, spec: dict):
+        """
+        Builds the nodes and their connections.
+
+        :param spec: the topology, see the class docstring
+        """
+        tiers = spec.get('tiers')
+        if not tiers:
+            raise ValueError("Topology needs at least one tier")
+        self.__seeds = np.random.SeedSequence(spec.get('seed'))
+        self.__tiers: dict[str, List[List[Node]]] = {}
+        for tier in tiers:
+            if tier.get('name') in self.__tiers:
+                raise ValueError(f"Duplicate tier: {tier.get('name')}")
+            self.__tiers[tier['name']] = self.__build(tier)
+        for tier, downstream in zip(tiers, tiers[1:]):
+            self.__connect(tier, downstream)
+
+    @classmethod
+    def from_yaml(cls, source: str | Path) -> 'Topology':
+        """
+        :param source: YAML file, or a YAML document
+        :return: the topology of the spec, read by PyYAML (optional dependency)
+        """
+        try:
+            import yaml
+        except ImportError as e:
+            raise ImportError("Reading YAML specs requires PyYAML") from e
+        if isinstance(source, Path) or '\n' not in source and Path(source).exists():
+            source = Path(source).read_text()
+        return cls(yaml.safe_load(source))
+
+    @property
+    def tiers(self) -> dict[str, List[List[Node]]]:
+        """
+        Nodes of the tiers by name, a list of servers per pop.
+        """
+        return self.__tiers
+
+    @property
+    def nodes(self) -> List[Node]:
+        """
+        All nodes, in the order of the tiers.
+        """
+        return [node for pops in self.__tiers.values() for servers in pops for node in servers]
+
+    def __build(self, tier: dict) -> List[List[Node]]:
+        pops, servers = tier.get('pops', 1), tier.get('servers', 1)
+        if pops < 1 or servers < 1:
+            raise ValueError(f"Tier {tier['name']} needs at least one pop and server, got {pops} and {servers}")
+        cls = resolve(tier['type'])
+        if tier.get('route') == 'hash':
+            from cdnsim.router import RouterMixIn
+            cls = type(f"Routed{cls.__name__}", (RouterMixIn, cls), {})
+        elif tier.get('route') is not None:
+            raise ValueError(f"Unknown routing of tier {tier['name']}: {tier['route']}")
+
+        params = tier.get('params', {})
+        return [[cls(name=tier['name'] + (f"_pop{pop}" if pops > 1 else '') + (f"_no{i}" if servers > 1 else ''),
+                     **self.__params(cls, params)) for i in range(servers)] for pop in range(pops)]
+
+    def __params(self, factory, params: dict) -> dict:
+        # objects are built for each node, they are stateful
+        built = {key: self.__value(value) for key, value in params.items()}
+        if 'rng' not in built and _seeded(factory):
+            built['rng'] = np.random.default_rng(self.__seeds.spawn(1)[0])
+        return built
+
+    def __value(self, value):
+        if isinstance(value, dict) and 'type' in value:
+            factory = resolve(value['type'])
+            return factory(**self.__params(factory, {key: v for key, v in value.items() if key != 'type'}))
+        if isinstance(value, list):
+            return [self.__value(v) for v in value]
+        return value
+
+    def __connect(self, tier: dict, downstream: dict) -> None:
+        upstreams, downstreams = self.__tiers[tier['name']], self.__tiers[downstream['name']]
+        connect = tier.get('connect', 'pop')
+        if connect == 'all':
+            targets = [[node for servers in downstreams for node in servers]] * len(upstreams)
+        elif connect == 'pop':
+            if len(downstreams) > len(upstreams):
+                raise ValueError(f"Tier {downstream['name']} has more pops than {tier['name']}, connect all instead")
+            targets = [downstreams[pop * len(downstreams) // len(upstreams)] for pop in range(len(upstreams))]
+        else:
+            raise ValueError(f"Unknown connection of tier {tier['name']}: {connect}")
+        for servers, remotes in zip(upstreams, targets):
+            for node in servers:
+                node.connect_all(remotes)
@@ -0,0 +1,4 @@
+from .zipf import Zipf
+from .client import ZipfClient
+from .trace import TraceClient, read_chunks
+from .compact import TraceFile, convert
@@ -0,0 +1,57 @@
+from collections import deque
+
+import numpy as np
+
+from cdnsim.arrival import Arrival, ChunkedArrival
+from cdnsim.client import Client
+from cdnsim.requests import Requests
+from cdnsim.workload.zipf import Zipf
+
+
+class ZipfClient(Client):
+    """
+    Requests contents of a Zipf popularity, the number of requests of each tick is given by an arrival process.
+    """
+
+    def __init__(self, zipf: Zipf, arrival: Arrival, size: np.ndarray = None, batch: int = 1, **kwargs):
+        """
+        :param zipf: content popularity
+        :param arrival: number of requests per tick
+        :param size: size of each content, zero if not given
+        :param batch: number of ticks drawn at once
+        """
+        self._zipf = zipf
+        self._arrival = iter(arrival)
+        self._exhausted = False
+        self._csize = np.zeros(zipf.n, dtype=np.int64) if size is None else np.asarray(size, dtype=np.int64)
+        self._batch = batch
+        self._pending = deque()
+        super().__init__(**kwargs)
+
+    def _step(self, msgs: list) -> list:
+        if not self._pending:
+            self._draw()
+        requests = self._pending.popleft()
+        self._record_requests(requests)
+        return self._split(requests)
+
+    def _draw(self) -> None:
+        if isinstance(self._arrival, ChunkedArrival):
+            ks = self._arrival.batch(self._batch) if not self._exhausted else []
+            self._exhausted = len(ks) == 0
+            ticks = range(self._arrival.tick - len(ks) + 1, self._arrival.tick + 1) if len(ks) else []
+        else:
+            ks, ticks = [], []
+            while len(ks) < self._batch and not self._exhausted:
+                try:
+                    ks.append(next(self._arrival))
+                    ticks.append(self._arrival.tick)
+                except StopIteration:
+                    self._exhausted = True
+        if len(ks) == 0:
+            raise StopIteration
+
+        index, content, freq = self._zipf.counts_batch(ks)
+        bounds = np.searchsorted(index, np.arange(1, len(ks)))
+        for tick, c, f in zip(ticks, np.split(content, bounds), np.split(freq, bounds)):
+            self._pending.append(Requests._wrap(np.full(len(c), tick, dtype=np.int64), c, f, self._csize[c]))
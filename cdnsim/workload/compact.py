@@ -0,0 +1,155 @@
+import json
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+
+from cdnsim.requests import Requests
+from cdnsim.workload.trace import read_chunks, bin_ticks
+
+# format version of the metadata
+VERSION = 1
+
+
+class TraceFile:
+    """
+    Compact binary trace: a directory of raw little endian columns, memory mapped when opened.
+
+    - meta.json: version, tick interval and start timestamp, number of ticks and rows, column types
+    - content.bin: dense content ids (dictionary encoded), of each (tick, content) row, sorted by tick and content
+    - freq.bin: number of requests of each row
+    - offsets.bin: first row of each tick, and the number of rows (ticks are not stored per row, a tick window is found
+      in O(1))
+    - size.bin: size of each content, by dense content id
+    - dictionary.npy: original content id of each dense content id
+
+    Create one with convert().
+    """
+
+    def __init__(self, path: str | Path):
+        """
+        :param path: trace directory
+        """
+        path = Path(path)
+        self.__meta = json.loads((path / 'meta.json').read_text())
+        if self.__meta['version'] != VERSION:
+            raise ValueError(f"Unsupported trace version {self.__meta['version']}, expected {VERSION}")
+        dtypes = self.__meta['dtypes']
+        self.__content = self.__map(path / 'content.bin', dtypes['content'])
+        self.__freq = self.__map(path / 'freq.bin', dtypes['freq'])
+        self.__offsets = self.__map(path / 'offsets.bin', 'int64')
+        self.__size = self.__map(path / 'size.bin', 'int64')
+        self.__dictionary = np.load(path / 'dictionary.npy', mmap_mode='r', allow_pickle=False)
+
+    @staticmethod
+    def __map(path: Path, dtype: str) -> np.ndarray:
+        # empty files cannot be memory mapped
+        if path.stat().st_size == 0:
+            return np.zeros(0, dtype=dtype)
+        return np.memmap(path, dtype=np.dtype(dtype).newbyteorder('<'), mode='r')
+
+    @property
+    def interval(self) -> float:
+        return self.__meta['interval']
+
+    @property
+    def start(self) -> float:
+        return self.__meta['start']
+
+    @property
+    def ticks(self) -> int:
+        return len(self.__offsets) - 1
+
+    @property
+    def dictionary(self) -> np.ndarray:
+        """
+        Original content id of each dense content id.
+        """
+        return self.__dictionary
+
+    @property
+    def size(self) -> np.ndarray:
+        """
+        Size of each dense content id.
+        """
+        return self.__size
+
+    def __len__(self) -> int:
+        return len(self.__content)
+
+    def window(self, first: int, last: int) -> Requests:
+        """
+        :param first: first tick
+        :param last: last tick (exclusive)
+        :return: requests of the ticks [first, last), with dense content ids
+        """
+        first, last = max(first, 0), min(last, self.ticks)
+        if first >= last:
+            return Requests._wrap(*(np.zeros(0, dtype=np.int64) for _ in Requests.__slots__))
+        begin, end = int(self.__offsets[first]), int(self.__offsets[last])
+        tick = np.repeat(np.arange(first, last, dtype=np.int64), np.diff(self.__offsets[first:last + 1]))
+        content = self.__content[begin:end].astype(np.int64)
+        return Requests._wrap(tick, content, self.__freq[begin:end].astype(np.int64), self.__size[content])
+
+    def batches(self, first: int = 0, ticks: int = 1) -> Iterator[Requests]:
+        """
+        :param first: first tick
+        :param ticks: number of ticks per batch
+        :return: iterator of the requests of consecutive windows
+        """
+        for tick in range(first, self.ticks, ticks):
+            yield self.window(tick, tick + ticks)
+
+
+def convert(source: str | Path, target: str | Path, interval: float, start: float = None,
+            chunksize: int = 1 << 20) -> TraceFile:
+    """
+    Convert a trace (see read_chunks() for the formats) into a compact TraceFile, in a single pass of bounded memory
+    (besides the content dictionary). Content ids of any type (e.g. URLs) are dictionary encoded to dense integers, in
+    the order of appearance.
+
+    :param source: trace file
+    :param target: trace directory to create
+    :param interval: length of a tick, in timestamp units
+    :param start: timestamp of the start of tick 0, the first timestamp if not given
+    :param chunksize: number of rows read at once
+    :return: the converted trace
+    """
+    target = Path(target)
+    target.mkdir(parents=True, exist_ok=True)
+    dictionary: dict = {}
+    # size of the new contents of each chunk, in the order of their dense ids
+    sizes = []
+
+    def encode() -> Iterator:
+        nonlocal start
+        for timestamp, content, size in read_chunks(source, chunksize):
+            if start is None and len(timestamp):
+                start = float(timestamp[0])
+            known = len(dictionary)
+            codes, uniques = pd.factorize(content)
+            ids = np.fromiter((dictionary.setdefault(key, len(dictionary)) for key in uniques.tolist()),
+                              dtype=np.int64, count=len(uniques))
+            # new ids are assigned in the order of the uniques, which is the order of their first rows
+            first = np.unique(codes, return_index=True)[1]
+            sizes.append(np.asarray(size, dtype=np.int64)[first[ids >= known]])
+            yield timestamp, ids[codes], size
+
+    offsets = [0]
+    with open(target / 'content.bin', 'wb') as cf, open(target / 'freq.bin', 'wb') as ff:
+        for requests in bin_ticks(encode(), interval, start):
+            requests.content.astype('<i4').tofile(cf)
+            requests.freq.astype('<i4').tofile(ff)
+            offsets.append(offsets[-1] + len(requests))
+    if len(dictionary) >= 2 ** 31:
+        raise ValueError(f"Too many contents: {len(dictionary)}")
+
+    np.asarray(offsets, dtype='<i8').tofile(target / 'offsets.bin')
+    np.concatenate([np.zeros(0, dtype=np.int64), *sizes]).astype('<i8').tofile(target / 'size.bin')
+    keys = list(dictionary.keys())
+    np.save(target / 'dictionary.npy', np.array(keys) if keys else np.zeros(0, dtype=np.int64), allow_pickle=False)
+    (target / 'meta.json').write_text(json.dumps({
+        'version': VERSION, 'interval': interval, 'start': start, 'ticks': len(offsets) - 1,
+        'rows': offsets[-1], 'dtypes': {'content': 'int32', 'freq': 'int32'}}))
+    return TraceFile(target)
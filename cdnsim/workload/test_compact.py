@@ -0,0 +1,49 @@
+from pathlib import Path
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from cdnsim.workload import TraceFile, convert, read_chunks
+from cdnsim.workload.trace import bin_ticks
+
+
+class TestCompact(TestCase):
+    def setUp(self) -> None:
+        Path('_out').mkdir(exist_ok=True)
+        rng = np.random.default_rng(0)
+        # 10 seconds, with a gap between 4 and 6, URLs as content ids
+        timestamp = np.sort(np.r_[rng.uniform(100, 104, size=300), rng.uniform(106, 110, size=300)])
+        content = rng.integers(20, size=600)
+        self.trace = pd.DataFrame({'timestamp': timestamp, 'content': [f"/video/{c}" for c in content],
+                                   'size': content * 10})
+        self.trace.to_csv('_out/compact.csv', index=False)
+
+    def test_convert(self):
+        trace = convert('_out/compact.csv', '_out/compact', interval=1, chunksize=64)
+        self.assertEqual(10, trace.ticks)
+        self.assertAlmostEqual(self.trace.timestamp[0], trace.start)
+        # dictionary in the order of appearance, sizes by dense id
+        self.assertListEqual(list(pd.unique(self.trace.content)), trace.dictionary.tolist())
+        self.assertListEqual([int(c.split('/')[-1]) * 10 for c in trace.dictionary], trace.size.tolist())
+
+        # same batches as binning the original trace
+        encoded = self.trace.assign(content=pd.Index(trace.dictionary).get_indexer(self.trace.content))
+        encoded.to_csv('_out/encoded.csv', index=False)
+        expected = list(bin_ticks(read_chunks('_out/encoded.csv'), interval=1))
+        reopened = TraceFile('_out/compact')
+        self.assertEqual(len(expected), reopened.ticks)
+        for batch, other in zip(reopened.batches(), expected):
+            for name in ('tick', 'content', 'freq', 'size'):
+                np.testing.assert_array_equal(getattr(other, name), getattr(batch, name))
+        self.assertEqual(600, sum(int(batch.freq.sum()) for batch in reopened.batches()))
+
+    def test_window(self):
+        trace = convert('_out/compact.csv', '_out/compact', interval=1)
+        window = trace.window(3, 7)
+        # the gap is empty
+        self.assertListEqual([3, 6], np.unique(window.tick).tolist())
+        self.assertEqual(((self.trace.timestamp >= 103) & (self.trace.timestamp < 107)).sum(), window.freq.sum())
+        self.assertEqual(0, len(trace.window(4, 6)))
+        self.assertEqual(0, len(trace.window(20, 30)))
+        self.assertListEqual([3, 1, 3, 1], [len(np.unique(b.tick)) for b in trace.batches(ticks=3)])
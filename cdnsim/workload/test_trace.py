@@ -0,0 +1,68 @@
+from pathlib import Path
+from unittest import TestCase
+
+import numpy as np
+import pandas as pd
+
+from cdnsim.requests import Requests
+from cdnsim.workload import TraceClient, read_chunks
+from nodes.log import DummylogMixIn
+from nodes.node import LNode, Node
+
+
+class MySink(LNode, DummylogMixIn):
+    def _step(self, msgs: list) -> None:
+        pass
+
+
+class TestTrace(TestCase):
+    def setUp(self) -> None:
+        Path('_out').mkdir(exist_ok=True)
+        rng = np.random.default_rng(0)
+        # 10 seconds, with a gap between 4 and 6
+        timestamp = np.sort(np.r_[rng.uniform(100, 104, size=300), rng.uniform(106, 110, size=300)])
+        self.trace = pd.DataFrame({'timestamp': timestamp, 'content': rng.integers(20, size=600)})
+        self.trace['size'] = self.trace.content * 10
+
+    def tearDown(self) -> None:
+        Node.terminate_all(1)
+
+    def replay(self, path: str, **kwargs) -> list:
+        client = TraceClient(name=f"client{len(Node.list_all())}", path=path, interval=1, **kwargs)
+        client.connect_to(MySink(name=f"sink{len(Node.list_all())}"))
+        batches = []
+        try:
+            while True:
+                batches.extend(client._step([]))
+        except StopIteration:
+            return batches
+
+    def test_formats(self):
+        self.trace.to_csv('_out/trace.csv', index=False)
+        np.save('_out/trace.npy', self.trace.to_records(index=False))
+
+        expected = self.trace.assign(tick=((self.trace.timestamp - 100) // 1).astype(int), freq=1) \
+            .groupby(['tick', 'content']).agg({'freq': 'sum', 'size': 'min'})
+        for path in ['_out/trace.csv', '_out/trace.npy']:
+            for chunksize in [7, 1000]:
+                batches = self.replay(path, chunksize=chunksize)
+                self.assertEqual(10, len(batches))
+                self.assertListEqual([0, 0], [len(batches[4]), len(batches[5])])
+                for tick, batch in enumerate(batches):
+                    self.assertTrue((batch.tick == tick).all())
+                merged = Requests.merge_requests(batches).to_pandas()
+                pd.testing.assert_frame_equal(expected, pd.DataFrame(merged), check_dtype=False)
+
+        # start later, skipping requests
+        batches = self.replay('_out/trace.csv', start=105, chunksize=50)
+        self.assertEqual(5, len(batches))
+        self.assertEqual(300, sum(batch.freq.sum() for batch in batches))
+
+    def test_errors(self):
+        self.trace.iloc[::-1].to_csv('_out/reversed.csv', index=False)
+        with self.assertRaises(ValueError):
+            self.replay('_out/reversed.csv', start=100, chunksize=10)
+        with self.assertRaises(ValueError):
+            next(read_chunks('_out/trace.txt'))
+        with self.assertRaises(ValueError):
+            TraceClient(name='client', path='_out/trace.csv', interval=0)
@@ -0,0 +1,56 @@
+from unittest import TestCase
+
+import numpy as np
+
+from cdnsim.arrival import Arrival, Trace
+from cdnsim.workload import Zipf, ZipfClient
+from nodes.log import DummylogMixIn
+from nodes.node import LNode, Node
+
+
+class MyArrival(Arrival):
+    def __next__(self) -> int:
+        super().__next__()
+        return 100 * (self.tick + 1)
+
+
+class MySink(LNode, DummylogMixIn):
+    def _step(self, msgs: list) -> None:
+        pass
+
+
+class TestZipf(TestCase):
+    def tearDown(self) -> None:
+        Node.terminate_all(1)
+
+    def test_zipf(self):
+        zipf = Zipf(a=1.2, n=100, rng=np.random.default_rng(0))
+        self.assertAlmostEqual(1, zipf.pmf.sum())
+        self.assertAlmostEqual(2 ** 1.2, zipf.pmf[0] / zipf.pmf[1])
+
+        content, freq = zipf.counts(100000)
+        self.assertEqual(100000, freq.sum())
+        self.assertTrue((np.diff(content) > 0).all() and content.min() >= 0 and content.max() < 100)
+        np.testing.assert_allclose(zipf.pmf[content], freq / 100000, atol=0.01)
+
+        # sparse and dense counting
+        for ks in [[3, 0, 5], [10000, 20000]]:
+            index, content, freq = zipf.counts_batch(ks)
+            self.assertListEqual(list(ks), [freq[index == i].sum() for i in range(len(ks))])
+            self.assertTrue((np.diff(index * 100 + content) > 0).all())
+
+        with self.assertRaises(ValueError):
+            Zipf(a=0, n=10)
+
+    def test_client(self):
+        for batch, arrival in [(1, MyArrival(ticks=3)), (2, MyArrival(ticks=3)), (10, MyArrival(ticks=3)),
+                               (2, Trace(counts=[100, 200, 300]))]:
+            client = ZipfClient(name=f"client{batch}{len(Node.list_all())}", zipf=Zipf(a=1.1, n=50), arrival=arrival,
+                                size=np.arange(50), batch=batch)
+            client.connect_to(MySink(name=f"sink{client.name}"))
+            batches = [client._step([])[0] for _ in range(3)]
+            self.assertListEqual([100, 200, 300], [r.freq.sum() for r in batches])
+            self.assertListEqual([[0], [1], [2]], [list(np.unique(r.tick)) for r in batches])
+            np.testing.assert_array_equal(batches[0].content, batches[0].size)
+            with self.assertRaises(StopIteration):
+                client._step([])
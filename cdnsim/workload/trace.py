@@ -0,0 +1,130 @@
+from pathlib import Path
+from typing import Iterator, Tuple
+
+import numpy as np
+import pandas as pd
+
+from cdnsim.client import Client
+from cdnsim.requests import Requests
+
+# column names of the traces
+COLUMNS = ('timestamp', 'content', 'size')
+
+
+def read_chunks(path: str | Path, chunksize: int = 1 << 20) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Read a trace of (timestamp, content, size) rows in chunks, without loading it into memory. Supported formats by
+    file suffix:
+
+    - .csv: header with the timestamp, content and size columns, read by pandas in chunks
+    - .parquet: the same columns, read by pyarrow (optional dependency) in record batches
+    - .npy: structured array of the same fields, memory mapped
+
+    :param path: trace file
+    :param chunksize: number of rows of a chunk
+    :return: iterator of the timestamp, content and size columns of the chunks
+    """
+    path = Path(path)
+    if path.suffix == '.csv':
+        for chunk in pd.read_csv(path, usecols=list(COLUMNS), chunksize=chunksize):
+            yield tuple(chunk[name].to_numpy() for name in COLUMNS)
+    elif path.suffix == '.parquet':
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Reading parquet traces requires pyarrow") from e
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize, columns=list(COLUMNS)):
+            yield tuple(batch.column(name).to_numpy() for name in COLUMNS)
+    elif path.suffix == '.npy':
+        rows = np.load(path, mmap_mode='r')
+        for i in range(0, len(rows), chunksize):
+            chunk = rows[i:i + chunksize]
+            yield tuple(np.asarray(chunk[name]) for name in COLUMNS)
+    else:
+        raise ValueError(f"Unknown trace format: {path.suffix}")
+
+
+def bin_ticks(chunks: Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray]], interval: float,
+              start: float = None) -> Iterator[Requests]:
+    """
+    Bin chunks of requests sorted by timestamp into ticks. The last tick of a chunk is carried over to the next chunk,
+    memory use is bounded by the chunk size and the requests of a tick.
+
+    :param chunks: timestamp, (integer) content and size columns, see read_chunks()
+    :param interval: length of a tick, in timestamp units
+    :param start: timestamp of the start of tick 0, the first timestamp if not given, earlier requests are skipped
+    :return: iterator of the Requests batch of each tick, empty for ticks without requests
+    """
+    if interval <= 0:
+        raise ValueError(f"Tick interval must be positive, got: {interval}")
+    return _bin_ticks(chunks, interval, start)
+
+
+def _bin_ticks(chunks: Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray]], interval: float,
+               start: float | None) -> Iterator[Requests]:
+    first = 0
+    carry = tuple(np.zeros(0, dtype=np.int64) for _ in COLUMNS)
+    for timestamp, content, size in chunks:
+        if start is None and len(timestamp):
+            start = timestamp[0]
+        tick = ((np.asarray(timestamp) - start) // interval).astype(np.int64)
+        after = tick >= 0
+        tick, content, size = (np.concatenate([carried, np.asarray(column, dtype=np.int64)[after]])
+                               for carried, column in zip(carry, (tick, content, size)))
+        if len(tick) == 0:
+            continue
+        if (np.diff(tick) < 0).any() or tick[0] < first:
+            raise ValueError("The trace must be sorted by timestamp")
+
+        # the last tick may continue in the next chunk
+        complete = np.searchsorted(tick, tick[-1])
+        carry = (tick[complete:], content[complete:], size[complete:])
+        if complete > 0:
+            yield from _batches(first, tick[:complete], content[:complete], size[:complete])
+            first = int(tick[complete - 1]) + 1
+
+    if len(carry[0]):
+        yield from _batches(first, *carry)
+
+
+def _batches(first: int, tick: np.ndarray, content: np.ndarray, size: np.ndarray) -> Iterator[Requests]:
+    """
+    :return: the Requests batches of the ticks [first, tick[-1]], aggregated
+    """
+    requests = Requests(content=content, freq=np.ones(len(content), dtype=np.int64), size=size, tick=tick)
+    ticks = np.arange(first, tick[-1] + 1)
+    bounds = np.searchsorted(requests.tick, ticks[1:])
+    for t, c, f, s in zip(ticks, *(np.split(column, bounds) for column in
+                                   (requests.content, requests.freq, requests.size))):
+        yield Requests._wrap(np.full(len(c), t, dtype=np.int64), c, f, s)
+
+
+class TraceClient(Client):
+    """
+    Replays a trace of requests sorted by timestamp: binned into ticks of *interval* length, one Requests batch per tick
+    (empty for ticks without requests). The trace is read in chunks, memory use is bounded by the chunk size and the
+    requests of a tick.
+    """
+
+    def __init__(self, path: str | Path, interval: float, start: float = None, chunksize: int = 1 << 20, **kwargs):
+        """
+        :param path: trace file, see read_chunks() for the formats, or TraceFile directory (already binned, *interval*
+            and *start* must match its own)
+        :param interval: length of a tick, in timestamp units
+        :param start: timestamp of the start of tick 0, the first timestamp if not given
+        :param chunksize: number of rows read at once
+        """
+        if Path(path).is_dir():
+            from cdnsim.workload.compact import TraceFile
+            trace = TraceFile(path)
+            if trace.interval != interval or start not in (None, trace.start):
+                raise ValueError(f"Trace {path} is binned by {trace.interval} from {trace.start}")
+            self._batches = trace.batches()
+        else:
+            self._batches = bin_ticks(read_chunks(path, chunksize), interval, start)
+        super().__init__(**kwargs)
+
+    def _step(self, msgs: list) -> list:
+        requests = next(self._batches)
+        self._record_requests(requests)
+        return self._split(requests)
@@ -0,0 +1,71 @@
+from typing import Sequence, Tuple
+
+import numpy as np
+
+
+class Zipf:
+    """
+    Zipf popularity of *n* contents: content i (0..n-1) is requested with probability proportional to (i + 1) ** -a.
+
+    The CDF is computed once, a tick's requests are drawn by a binary search of uniform random numbers in it, then
+    counted per content.
+    """
+
+    def __init__(self, a: float, n: int, rng: np.random.Generator = None):
+        """
+        :param a: exponent, greater than 0
+        :param n: number of contents
+        :param rng: random generator, a new one if not given
+        """
+        if a <= 0 or n < 1:
+            raise ValueError(f"Zipf needs a > 0 and n >= 1, got a={a}, n={n}")
+        self.__a = a
+        self.__n = n
+        self.__cdf = np.cumsum(np.arange(1, n + 1, dtype=float) ** -a)
+        self.__cdf /= self.__cdf[-1]
+        self.__rng = np.random.default_rng() if rng is None else rng
+
+    @property
+    def a(self) -> float:
+        return self.__a
+
+    @property
+    def n(self) -> int:
+        return self.__n
+
+    @property
+    def pmf(self) -> np.ndarray:
+        return np.diff(self.__cdf, prepend=0)
+
+    def draw(self, k: int) -> np.ndarray:
+        """
+        :param k: number of requests
+        :return: the content of each request
+        """
+        return np.minimum(np.searchsorted(self.__cdf, self.__rng.random(k), side='right'), self.__n - 1)
+
+    def counts(self, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        :param k: number of requests
+        :return: sorted contents and their number of requests
+        """
+        _, content, freq = self.counts_batch([k])
+        return content, freq
+
+    def counts_batch(self, ks: Sequence[int]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Draw the requests of several ticks at once.
+
+        :param ks: number of requests of each tick
+        :return: tick index (into *ks*), content and number of requests, sorted by tick index and content
+        """
+        ks = np.asarray(ks, dtype=np.int64)
+        key = np.repeat(np.arange(len(ks), dtype=np.int64), ks) * self.__n + self.draw(int(ks.sum()))
+        if len(key) > (self.__n * len(ks)) // 16:
+            # dense: counting is linear
+            freq = np.bincount(key, minlength=self.__n * len(ks))
+            key = np.flatnonzero(freq)
+            freq = freq[key]
+        else:
+            key, freq = np.unique(key, return_counts=True)
+        return key // self.__n, key % self.__n, freq
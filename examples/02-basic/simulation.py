@@ -82,15 +82,13 @@ class Uniform(Client):
 
     def __init__(self, cbase: int, arrival: Arrival, **kwargs):
         self._cbase = cbase
-        self._arrival = arrival
+        self._arrival = iter(arrival)
         super().__init__(**kwargs)
 
-    def _work(self, *args) -> None:
-        for k in self._arrival:
-            r = np.unique(randint.rvs(1, self._cbase + 1, size=k), return_counts=True)
-            self._send(
-                BaseRequests(data={'freq': r[1]}, index=pd.MultiIndex.from_arrays([r[0]], names=['content'])).split_rr(
-                    len(self.downstreams)))
+    def _step(self, msgs: list) -> list:
+        r = np.unique(randint.rvs(1, self._cbase + 1, size=next(self._arrival)), return_counts=True)
+        return BaseRequests(data={'freq': r[1]}, index=pd.MultiIndex.from_arrays([r[0]], names=['content'])).split_rr(
+            len(self.downstreams))
 
 
 # noncache implementation
@@ -102,12 +100,10 @@ class NonCache(Cache):
     For demonstration purposes, a non caching cache implementation.
     """
 
-    def _work(self) -> None:
-        # receive messages from all remotes until termination (empty list) received
-        while (msgs := self._receive()) is not None:
-            requests = BaseRequests.merge_requests(msgs)
-            # in-->out (no caching)
-            self._send(requests.split_rr(len(self.downstreams)))
+    def _step(self, msgs: list) -> list:
+        # merge the messages of all remotes, forward them in-->out (no caching)
+        requests = BaseRequests.merge_requests(msgs)
+        return requests.split_rr(len(self.downstreams))
 
 
 # origin implementation
@@ -121,14 +117,12 @@ class Origin(LoggerMixIn, LNode):
     Simple origin implementation. Logs the number of requests received.
     """
 
-    def _work(self) -> None:
-        # receive messages from all remotes until termination (empty list) received
-        while (msgs := self._receive()) is not None:
-            # merge incoming requests
-            requests = BaseRequests.merge_requests(msgs)
+    def _step(self, msgs: list) -> None:
+        # merge incoming requests
+        requests = BaseRequests.merge_requests(msgs)
 
-            # log number of requests received
-            self._log(f"received {requests.freq.sum()} requests")
+        # log number of requests received
+        self._log(f"received {requests.freq.sum()} requests")
 
 
 if __name__ == "__main__":
@@ -11,23 +11,8 @@ from nodes.log import LogMixIn, LoggerMixIn
 
 LoggerMixIn.setlevel(LogMixIn.INFO)
 
-# the poisson arrival process implementation
-from cdnsim.arrival import Arrival
-from numpy.random import default_rng
-
-
-class Poisson(Arrival):
-    def __init__(self, lam: float, **kwargs):
-        super().__init__(**kwargs)
-        if lam <= 1:
-            raise ValueError(f"lambda for poisson should be greater or equal to 1, got: {lam}")
-        self.__lam = lam
-        self.__rng = default_rng()
-
-    def __next__(self) -> int:
-        super().__next__()
-        return int(self.__rng.poisson(self.__lam, 1)[0])
-
+# the poisson arrival process
+from cdnsim.arrival import Poisson
 
 # extend the BaseRequests to track tick and content sizes
 from zipf import ZipfClient
@@ -35,62 +20,48 @@ from zipf import ZipfClient
 # noncache implementation
 from noncache import NonCache
 
-# origin implementation
-from cdnsim import Origin
-from throughput import ThroughputRequests
+# origin implementation, recording the requests it serves
+from cdnsim import Origin, collect
 
+# the tiers are built from a declarative spec (a dict here, or YAML), the caches of a tier serve disjoint sets of
+# contents: contents are routed to the downstreams by consistent hashing
+from cdnsim.topology import Topology
 
-class MyOrigin(Origin):
 
-    def _work(self) -> None:
-        while (msgs := self._receive()) is not None:
-            self._log(f"received {ThroughputRequests.merge_requests(msgs).freq.sum()} requests")
+def spec(npops: int = 10, ndeliverers: int = 10, nfetchers: int = 2, nacquirers: int = 10) -> dict:
+    return {'tiers': [
+        # a single client per pop
+        {'name': 'client', 'type': ZipfClient, 'pops': npops, 'route': 'hash',
+         'params': {'cbase': 1000, 'n': 20000, 'p': 0.3, 'a': 1.1,
+                    'arrival': {'type': Poisson, 'lam': 300, 'ticks': 3600}}},
+        # deliverers and fetchers of each pop
+        {'name': 'cache_l1', 'type': NonCache, 'pops': npops, 'servers': ndeliverers, 'route': 'hash'},
+        {'name': 'cache_l2', 'type': NonCache, 'pops': npops, 'servers': nfetchers, 'route': 'hash'},
+        # content acquirers
+        {'name': 'cache_l3', 'type': NonCache, 'servers': nacquirers, 'route': 'hash'},
+        {'name': 'origin', 'type': Origin},
+    ]}
 
 
 if __name__ == "__main__":
+    import sys
 
-    npops = 10
-    ndeliverers = 10
-    nfetchers = 2
-    nacquirers = 10
-
-    # 1 origin
-    origin = MyOrigin()
-
-    # 30 content acquirers
-    l3caches = []
-    for i in range(nacquirers):
-        c = NonCache(name=f"cache_l3_no{i}")
-        c.connect_to(origin)
-        l3caches.append(c)
-
-    # 24 pops, 4 fetchers and 24 deliverers and a single client per pop
-    pops = []
-    for pop in range(npops):
-        l2caches = []
-        for i in range(nfetchers):
-            c = NonCache(name=f"cache_l2_pop{pop}_no{i}")
-            for l3 in l3caches:
-                c.connect_to(l3)
-            l2caches.append(c)
+    from nodes import Node
 
-        l1caches = []
-        for i in range(ndeliverers):
-            c = NonCache(name=f"cache_l1_pop{pop}_no{i}")
-            for l2 in l2caches:
-                c.connect_to(l2)
-            l1caches.append(c)
+    # opt-in: the nodes are step based, with --process they run on a worker process per CPU, each worker scheduling its
+    # nodes in a single thread
+    if '--process' in sys.argv:
+        Node.backend = 'process'
 
-        client = ZipfClient(name=f"client_pop{pop}", cbase=1000, n=20000, p=0.3, a=1.1,
-                            arrival=Poisson(lam=300, ticks=3600))
-        for l1 in l1caches:
-            client.connect_to(l1)
-        pops.append([*l2caches, *l1caches, client])
+    topology = Topology(spec())
 
     # run simulation
     try:
         ZipfClient.start_all()
         ZipfClient.join_all()
+        # the counters of the nodes stay in the worker processes of the 'process' backend
+        if Node.backend != 'process':
+            print(collect().groupby('tick').sum(numeric_only=True).describe())
     except KeyboardInterrupt:
         pass
     finally:
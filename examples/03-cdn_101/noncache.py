@@ -1,19 +1,17 @@
 from cdnsim.cache import Cache
-from nodes.log import LogLevel
-from throughput import ThroughputRequests
+from cdnsim.requests import Requests
+from cdnsim.requests.codec import ColumnarCodec
 
 
 class NonCache(Cache):
     """
     For demonstration purposes, a non caching cache implementation.
     """
+    codec = ColumnarCodec()
 
-    def _work(self) -> None:
-        # receive messages from all remotes until termination (empty list) received
-        try:
-            while (msgs := self._receive()) is not None:
-                requests = ThroughputRequests.merge_requests(msgs)
-                self._log(f"Received {requests.freq.sum()} requests", LogLevel.DEBUG)
-                self._send(requests.split_rr(len(self.downstreams)))
-        except Exception as e:
-            self._exception()
+    def _step(self, msgs: list) -> list:
+        # merge the messages of all remotes, forward them in-->out (no caching)
+        requests = Requests.merge_requests(msgs)
+        self._record_requests(requests, misses=int(requests.freq.sum()),
+                              missbytes=int((requests.freq * requests.size).sum()))
+        return self._split(requests)
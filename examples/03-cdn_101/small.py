@@ -11,23 +11,8 @@ from nodes.log import LogMixIn, LoggerMixIn
 
 LoggerMixIn.setlevel(LogMixIn.INFO)
 
-# the poisson arrival process implementation
-from cdnsim.arrival import Arrival
-from numpy.random import default_rng
-
-
-class Poisson(Arrival):
-    def __init__(self, lam: float, **kwargs):
-        super().__init__(**kwargs)
-        if lam <= 1:
-            raise ValueError(f"lambda for poisson should be greater or equal to 1, got: {lam}")
-        self.__lam = lam
-        self.__rng = default_rng()
-
-    def __next__(self) -> int:
-        super().__next__()
-        return int(self.__rng.poisson(self.__lam, 1)[0])
-
+# the poisson arrival process
+from cdnsim.arrival import Poisson
 
 # the zipf client implementation
 from zipf import ZipfClient
@@ -35,16 +20,8 @@ from zipf import ZipfClient
 # PLFU cache implementation
 from plfucache import PLFUCache
 
-# origin implementation
-from cdnsim import Origin
-from throughput import ThroughputRequests
-
-
-class MyOrigin(Origin):
-
-    def _work(self) -> None:
-        while (msgs := self._receive()) is not None:
-            self._log(f"received {ThroughputRequests.merge_requests(msgs).freq.sum()} requests")
+# origin implementation, recording the requests it serves
+from cdnsim import Origin, collect
 
 
 if __name__ == "__main__":
@@ -59,7 +36,7 @@ if __name__ == "__main__":
     cache3 = PLFUCache(name='cache3', size=400)
 
     # create origin
-    origin = MyOrigin(name='origin')
+    origin = Origin(name='origin')
 
     # establish connections
     client1.connect_to(cache1)
@@ -74,6 +51,8 @@ if __name__ == "__main__":
     try:
         client1.start_all()
         client1.join_all()
+        # per tick counters of all nodes
+        print(collect().groupby('node').sum().drop(columns='tick'))
     except KeyboardInterrupt:
         pass
     finally:
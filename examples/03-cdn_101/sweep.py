@@ -0,0 +1,38 @@
+# Capacity planning: the hit ratio of a two tier LRU cache setup, over a grid of cache sizes, Zipf exponents and
+# arrival rates. Every combination runs in its own worker process, completed ones are kept in _out/sweep and not run
+# again.
+#
+# [client] --> [cache_l1 x 4] --> [cache_l2] --> [origin]
+
+from cdnsim import collect
+from cdnsim.sweep import grid, sweep
+from cdnsim.topology import Topology
+from nodes import Simulation
+
+
+def simulate(capacity: int, a: float, lam: float) -> dict:
+    # the nodes belong to this simulation only, all of them run in the thread of the worker process
+    with Simulation(backend='direct') as simulation:
+        Topology({'seed': 0, 'tiers': [
+            {'name': 'client', 'type': 'ZipfClient', 'route': 'hash',
+             'params': {'zipf': {'type': 'Zipf', 'a': a, 'n': 10000},
+                        'arrival': {'type': 'Poisson', 'lam': lam, 'ticks': 600},
+                        'size': {'type': 'numpy.full', 'shape': 10000, 'fill_value': 100}}},
+            {'name': 'cache_l1', 'type': 'PolicyCache', 'servers': 4,
+             'params': {'policy': {'type': 'LRU', 'capacity': capacity}}},
+            {'name': 'cache_l2', 'type': 'PolicyCache',
+             'params': {'policy': {'type': 'LRU', 'capacity': 4 * capacity}}},
+            {'name': 'origin', 'type': 'Origin'},
+        ]})
+        simulation.start()
+        simulation.join()
+        totals = collect().groupby('node').sum()
+
+    requests = totals.loc['client', 'requests']
+    return {'requests': requests, 'offload': 1 - totals.loc['origin', 'requests'] / requests,
+            'l1hitratio': totals.hits.filter(like='cache_l1').sum() / requests}
+
+
+if __name__ == "__main__":
+    df = sweep(simulate, grid(capacity=[10000, 50000, 200000], a=[0.8, 1.0, 1.2], lam=[100, 1000]), cache='_out/sweep')
+    print(df.pivot_table(index=['capacity', 'a'], columns='lam', values='offload').round(3))
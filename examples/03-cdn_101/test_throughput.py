@@ -17,6 +17,9 @@ class TestThroughputRequests(TestCase):
                                     names=['tick', 'content']))
 
         s = ThroughputRequests.merge_requests([r1, r2])
-        self.skipTest("Implement me")
-        # self.assertEqual(66, s[(1,'c3'):'freq'])
-        # print(s)
+        self.assertIsInstance(s, ThroughputRequests)
+        self.assertEqual(66, s.loc[(1, 'c3'), 'freq'])
+        self.assertEqual(30, s.loc[(1, 'c3'), 'size'])
+        self.assertListEqual([(0, 'c1'), (0, 'c2'), (0, 'c3'), (1, 'c1'), (1, 'c2'), (1, 'c3'), (1, 'c4'), (1, 'c5'),
+                              (2, 'c3'), (2, 'c4'), (2, 'c5')], list(s.index))
+        self.assertListEqual([6, 4 + 5 + 66 + 70 + 80, 300], list(s.rpt.values))
@@ -3,3 +3,4 @@
 by the **cdnsim** framework to implement CDN related functions.
 """
 from .node import Node, LNode, TNode, INode
+from .simulation import Simulation
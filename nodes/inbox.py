@@ -0,0 +1,189 @@
+from collections import deque
+from queue import ShutDown
+from threading import Condition, Lock
+from time import perf_counter
+
+
+class Slot:
+    """
+    Message queue of one upstream within an Inbox. Provides the put(), get() and shutdown() interface of queue.Queue as
+    used by the nodes; put() blocks while the slot is full.
+
+    Keeps the time the sender was blocked on put() and the receiver waited for the slot. An adaptive slot resizes itself
+    after every *window* messages: it doubles if both sides stalled on each other (the sender on the full slot, the
+    receiver on the empty one, so a deeper pipeline would have kept both busy), and shrinks by one if the receiver never
+    waited (the slot holds more messages than needed).
+    """
+    # messages between resizes of adaptive slots, and their size limit
+    window = 64
+    limit = 1024
+
+    def __init__(self, inbox: 'Inbox', maxsize: int = 0, adaptive: bool = False):
+        """
+        :param inbox: inbox of the receiving node
+        :param maxsize: number of on the fly messages, 0 for unlimited
+        :param adaptive: resize the slot, starting at *maxsize* (ignored for unlimited slots)
+        """
+        self.__inbox = inbox
+        self.__maxsize = maxsize
+        self.__adaptive = adaptive and maxsize > 0
+        self.items = deque()
+        self.closed = False
+        self.notfull = Condition(inbox.lock)
+        self.__messages = 0
+        self.__blocked = 0.
+        self.__waited = 0.
+        # blocked and waited times at the beginning of the window
+        self.__since = (0., 0.)
+
+    @property
+    def full(self) -> bool:
+        return 0 < self.__maxsize <= len(self.items)
+
+    @property
+    def stats(self) -> dict:
+        """
+        Current capacity (0 for unlimited), number of messages put, seconds the sender was blocked on put() and seconds
+        the receiver waited for the slot.
+        """
+        with self.__inbox.lock:
+            return {'capacity': self.__maxsize, 'messages': self.__messages, 'blocked': self.__blocked,
+                    'waited': self.__waited}
+
+    def put(self, item) -> None:
+        with self.__inbox.lock:
+            if self.full and not self.closed:
+                start = perf_counter()
+                while self.full and not self.closed:
+                    self.notfull.wait()
+                self.__blocked += perf_counter() - start
+            if self.closed:
+                raise ShutDown
+            self.items.append(item)
+            self.__messages += 1
+            if len(self.items) == 1:
+                self.__inbox._filled()
+            if self.__adaptive and self.__messages % self.window == 0:
+                self.__adapt()
+
+    def _waited(self, seconds: float) -> None:
+        # called by the inbox, with the lock held
+        self.__waited += seconds
+
+    def __adapt(self) -> None:
+        blocked, waited = self.__blocked - self.__since[0], self.__waited - self.__since[1]
+        self.__since = (self.__blocked, self.__waited)
+        if blocked > 0 and waited > 0:
+            self.__maxsize = min(2 * self.__maxsize, max(self.limit, self.__maxsize))
+            self.notfull.notify_all()
+        elif waited == 0:
+            self.__maxsize = max(self.__maxsize - 1, 1)
+
+    def get(self):
+        return self.__inbox.gather([self])[0]
+
+    def shutdown(self, immediate: bool = False) -> None:
+        """
+        Messages already in the slot are still delivered (unless *immediate*), then get() raises ShutDown.
+        """
+        with self.__inbox.lock:
+            self.closed = True
+            self.notfull.notify_all()
+            self.__inbox._closed(self, immediate)
+
+
+class Inbox:
+    """
+    Message slots of the upstreams of a node, sharing a single lock and condition: a sender wakes the receiver only
+    when the messages it waits for are all there (a counting barrier of the non-empty slots), so gathering a message
+    from every upstream costs a single wakeup instead of one per upstream.
+    """
+
+    def __init__(self):
+        self.lock = Lock()
+        self.__ready = Condition(self.lock)
+        # number of non-empty slots, and the number the receiver waits for
+        self.__nonempty = 0
+        self.__needed = None
+
+    def slot(self, maxsize: int = 0, adaptive: bool = False) -> Slot:
+        """
+        :param maxsize: number of on the fly messages of the slot, 0 for unlimited
+        :param adaptive: resize the slot, see Slot
+        :return: a new slot
+        """
+        return Slot(self, maxsize, adaptive)
+
+    def _filled(self) -> None:
+        # called by the slots, with the lock held
+        self.__nonempty += 1
+        if self.__needed is not None and self.__nonempty >= self.__needed:
+            self.__ready.notify()
+
+    def _closed(self, slot: Slot, immediate: bool) -> None:
+        # called by the slots, with the lock held
+        if immediate and slot.items:
+            slot.items.clear()
+            self.__nonempty -= 1
+        if self.__needed is not None:
+            self.__ready.notify()
+
+    def __pop(self, slots: list[Slot]) -> list:
+        msgs = []
+        for slot in slots:
+            wasfull = slot.full
+            msgs.append(slot.items.popleft())
+            if not slot.items:
+                self.__nonempty -= 1
+            if wasfull:
+                slot.notfull.notify()
+        return msgs
+
+    def __wait(self, empty: list[Slot], timeout: float | None) -> bool:
+        """
+        Wait for the senders, the waiting time is accounted to the empty slots.
+        """
+        start = perf_counter()
+        try:
+            return self.__ready.wait(timeout)
+        finally:
+            self.__needed = None
+            waited = perf_counter() - start
+            for slot in empty: slot._waited(waited)
+
+    def gather(self, slots: list[Slot]) -> list:
+        """
+        Wait until every slot has a message, then take one from each. Raises ShutDown, if a slot is shut down and empty.
+
+        :param slots: slots of this inbox to receive from
+        :return: the next message of each slot
+        """
+        with self.lock:
+            while True:
+                if any(slot.closed and not slot.items for slot in slots):
+                    raise ShutDown
+                if all(slot.items for slot in slots):
+                    return self.__pop(slots)
+                # other slots may hold messages, wait for as many non-empty slots as could complete the gathering
+                self.__needed = self.__nonempty + sum(not slot.items for slot in slots)
+                self.__wait([slot for slot in slots if not slot.items], None)
+
+    def gather_any(self, slots: list[Slot], timeout: float = None) -> dict[int, object]:
+        """
+        Wait until any of the slots has a message, then take one from each slot that has. Raises ShutDown, if all slots
+        are shut down and empty.
+
+        :param slots: slots of this inbox to receive from
+        :param timeout: maximum time to wait, None for waiting indefinitely
+        :return: the next message of the slots having one, by position in *slots* (empty on timeout)
+        """
+        with self.lock:
+            while True:
+                ready = [i for i, slot in enumerate(slots) if slot.items]
+                if ready:
+                    return dict(zip(ready, self.__pop([slots[i] for i in ready])))
+                if all(slot.closed for slot in slots):
+                    raise ShutDown
+                self.__needed = self.__nonempty + 1
+                if not self.__wait(slots, timeout):
+                    return {}
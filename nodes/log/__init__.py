@@ -1,3 +1,4 @@
 from .log import LogMixIn, LogLevel
 from .dummy import DummylogMixIn
 from .logger import LoggerMixIn
+from .asynclogger import AsyncLoggerMixIn
@@ -0,0 +1,82 @@
+import atexit
+import logging
+import os
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
+from threading import Lock
+
+from nodes.log.logger import LoggerMixIn
+
+
+class _RootHandler(logging.Handler):
+    """
+    Passes the records to the handlers of the root logger, as configured at the time of writing.
+    """
+
+    def emit(self, record: logging.LogRecord) -> None:
+        logging.getLogger().handle(record)
+
+
+class AsyncLoggerMixIn(LoggerMixIn):
+    """
+    LoggerMixIn writing in the background: every node logs through its own QueueHandler into a shared SimpleQueue, so
+    the nodes share no handler lock, and a single listener thread passes the records to the handlers of the root
+    logger. Records are written with a delay, flush() waits for them.
+
+    Mix in before the node class, e.g. class MyCache(AsyncLoggerMixIn, Cache), to replace its LoggerMixIn.
+    """
+    __queue = SimpleQueue()
+    __listener: QueueListener | None = None
+    __lock = Lock()
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        logger = logging.getLogger(self.name)
+        logger.handlers = [QueueHandler(AsyncLoggerMixIn.__queue)]
+        logger.propagate = False
+        AsyncLoggerMixIn.__start()
+
+    @classmethod
+    def __start(cls) -> None:
+        with cls.__lock:
+            if AsyncLoggerMixIn.__listener is None:
+                AsyncLoggerMixIn.__listener = QueueListener(AsyncLoggerMixIn.__queue, _RootHandler())
+                AsyncLoggerMixIn.__listener.start()
+
+    @classmethod
+    def stop(cls) -> None:
+        """
+        Write the records logged so far, then stop the listener thread. It is started again by the next node.
+        """
+        with cls.__lock:
+            if AsyncLoggerMixIn.__listener is not None:
+                AsyncLoggerMixIn.__listener.stop()
+                AsyncLoggerMixIn.__listener = None
+
+    @classmethod
+    def _pause(cls) -> None:
+        # no listener thread while forking: it would not run in the child, and forking threads may deadlock
+        cls.__lock.acquire()
+        if AsyncLoggerMixIn.__listener is not None:
+            AsyncLoggerMixIn.__listener.stop()
+
+    @classmethod
+    def _resume(cls) -> None:
+        if AsyncLoggerMixIn.__listener is not None:
+            AsyncLoggerMixIn.__listener.start()
+        cls.__lock.release()
+
+    @classmethod
+    def flush(cls) -> None:
+        """
+        Wait until the records logged so far are written.
+        """
+        with cls.__lock:
+            if AsyncLoggerMixIn.__listener is not None:
+                AsyncLoggerMixIn.__listener.stop()
+                AsyncLoggerMixIn.__listener.start()
+
+
+os.register_at_fork(before=AsyncLoggerMixIn._pause, after_in_parent=AsyncLoggerMixIn._resume,
+                    after_in_child=AsyncLoggerMixIn._resume)
+atexit.register(AsyncLoggerMixIn.stop)
@@ -16,3 +16,6 @@ class DummylogMixIn(LogMixIn):
 
     def _exception(self, buff: str = "Unexpected exception") -> None:
         logging.exception(buff)
+
+    def _isenabled(self, severity: LogLevel) -> bool:
+        return False
@@ -27,3 +27,11 @@ class LogMixIn(metaclass=ABCMeta):
     @abstractmethod
     def _exception(self, buff: str = "Unexpected exception") -> None:
         ...
+
+    def _isenabled(self, severity: LogLevel) -> bool:
+        """
+        Check the level before formatting expensive messages, e.g. if self._isenabled(self.DEBUG): self._log(f"...")
+
+        :return: True, if messages of the severity are logged
+        """
+        return True
@@ -24,3 +24,6 @@ class LoggerMixIn(LogMixIn):
 
     def _exception(self, buff: str = "Unexpected exception") -> None:
         self.__logger.exception(buff)
+
+    def _isenabled(self, severity: LogLevel) -> bool:
+        return self.__logger.isEnabledFor(self.__sev2level[severity])
@@ -1,96 +1,166 @@
 from abc import ABC, abstractmethod, ABCMeta
 from queue import Queue, ShutDown
 from threading import Thread
-from typing import List, Self
+from typing import List, Self, Sequence
 
+from nodes.inbox import Inbox, Slot
 from nodes.log import LogMixIn
+from nodes.profile import Profile
+from nodes.simulation import Simulation
 
 
 class Node(Thread, LogMixIn, metaclass=ABCMeta):
     """
     Abstract Base Class for Node definition, threading, and simulation control.
     """
-    # keep track of nodes (threads)
-    __nodes: List[Self] = []
-
     # default message queue size
     queuesize = 5
 
+    # execution backend: 'thread' runs each node in its own thread, 'process' distributes the nodes onto worker processes,
+    # 'direct' steps all (step based) nodes in topological order within the thread calling join_all(), without locks
+    backend = 'thread'
+
+    # number of workers: worker processes of the 'process' backend (None for the number of CPUs), scheduler threads of
+    # the 'thread' backend (None for a thread per node). Step based nodes of a worker share a single scheduler thread.
+    workers: int | None = None
+
+    # record the time nodes spend receiving, stepping and sending, see nodes.profile (not collected from the worker
+    # processes of the 'process' backend)
+    profiling = False
+
     @classmethod
     def start_all(cls) -> None:
         """
-        Start the simulation.
+        Start the simulation: the nodes of the current Simulation, see Simulation.current().
 
         :return: None
         """
-        for node in cls.__nodes: node.start()
+        Simulation.current().start()
 
     @classmethod
-    def terminate_all(cls, timeout: float | None) -> None:
+    def terminate_all(cls, timeout: float | None = None) -> None:
         """
         Terminate the simulation and wait for Node completion.
 
         :param timeout: timeout of individual nodes, une None for waiting indefinitely
         :return: None
         """
-        while Node.__nodes:
-            node = Node.__nodes.pop()
-            if node.is_alive():
-                node.terminate()
-                node.join(timeout)
-                if node.is_alive():
-                    print(f"Termination of {node.name} failed within {timeout} seconds")  # TODO: add general logging
+        Simulation.current().terminate(timeout)
 
     @classmethod
     def join_all(cls) -> None:
         """
-        Join the simulation, wait until completes. This call will block.
+        Join the simulation, wait until completes. This call will block. The 'direct' backend runs the simulation in the
+        calling thread.
 
         :return: None
         """
-        # join ignores KeyboardInterrupt, so this strange construct is needed to let the exception through
-        while any([node.is_alive() for node in cls.__nodes]):
-            for node in cls.__nodes:
-                if node.is_alive():
-                    node.join(0.1)
+        Simulation.current().join()
 
     @classmethod
     def list_all(cls) -> list[Self]:
-        return cls.__nodes
+        return Simulation.current().nodes
 
     def __init__(self, name: str = '', **kwargs):
+        if type(self)._work is Node._work and not self.stepped:
+            raise TypeError(f"Can't instantiate {self.__class__.__name__} without implementing _work() or _step()")
         kwargs.pop('target', None)
         super().__init__(name=name if name != '' else f"{self.__class__.__name__}-{id(self)}", target=self._work,
                          **kwargs)
 
+        self.__profile = Profile()
+
         # register node
-        Node.__nodes.append(self)
+        self.__simulation = Simulation.current()
+        self.__simulation.add(self)
 
     @abstractmethod
     def terminate(self) -> None:
         ...
 
+    @property
+    def profile(self) -> Profile:
+        """
+        Timing of the node, recorded while profiling is enabled.
+        """
+        return self.__profile
+
     def run(self) -> None:
         try:
-            super().run()
+            if Node.profiling:
+                with self.__profile.running():
+                    super().run()
+            else:
+                super().run()
         except ShutDown:
             pass
+        except Exception:
+            self._exception()
+        try:
+            self._finalize()
+        finally:
+            self.__simulation._exited(self)
+
+    def _finalize(self) -> None:
+        """
+        Called once, after the node completed or terminated.
+
+        :return: None
+        """
         self._log("Exit")
 
-    @abstractmethod
+    @property
+    def stepped(self) -> bool:
+        """
+        True, if the node is implemented by _step() and can be run by a scheduler.
+        """
+        return type(self)._step is not Node._step
+
     def _work(self, *args) -> None:
         """
         Overwrite this to implement your own node. You may use Process' *args* parameter in the constructor to provide custom
-        variables.
+        variables. Alternatively, implement _step(), this default calls it round by round until the node completes.
+        Exceptions are logged, then the node completes.
 
         :return: None
         """
-        ...
+        try:
+            while True:
+                self._round()
+        except StopIteration:
+            pass
+
+    def _step(self, msgs: list) -> list | None:
+        """
+        Overwrite this to implement your own node as a sequence of rounds. Step based nodes can be multiplexed onto
+        worker threads by the scheduler.
+
+        :param msgs: one message from each upstream (empty list for nodes without inputs)
+        :return: one message for each downstream (may be None for nodes without downstreams), raise StopIteration to
+                 complete
+        """
+        raise NotImplementedError(f"{self.__class__.__name__} must implement _work() or _step()")
+
+    def _round(self) -> None:
+        """
+        Execute one round of a step based node: receive from all upstreams, step, then send to all downstreams. Raises
+        StopIteration or ShutDown, if the node completed.
+
+        :return: None
+        """
+        msgs = self._receive() if isinstance(self, LNode) else []
+        if Node.profiling:
+            with self.__profile.timing('step'):
+                msgs = self._step(msgs)
+        else:
+            msgs = self._step(msgs)
+        if isinstance(self, TNode) and (msgs is not None or self.downstreams):
+            self._send(msgs)
 
 
 class LNode(Node, ABC):
     """
-    Provides internode messaging by implementing a message input via multiprocessing.Queue.
+    Provides internode messaging by implementing a message input via an Inbox of a slot per upstream.
 
     Letter L: assuming a top-down message flow, messages can enter via the vertical line of 'L', but output is blocked
     by the horizontal line.
@@ -98,19 +168,30 @@ class LNode(Node, ABC):
 
     def __init__(self, qsize=Node.queuesize, **kwargs):
         """
-        :param qsize: number of on the fly messages
+        :param qsize: number of on the fly messages, default of the connections
         """
         self.__queues = {}  # queues for message inputs
+        self.__edges = {}  # size and adaptivity of the queues
+        self.__inbox = Inbox()  # shared by the default queues
         self.__qsize = qsize
         super().__init__(**kwargs)
 
-    def registerqueue(self, name: str) -> Queue:
+    def registerqueue(self, name: str, queuetype: type = None, qsize: int = None, adaptive: bool = None) -> Queue:
         """
-        Used by t-nodes connecting to this node. Creates the input queue.
+        Used by t-nodes connecting to this node. Creates (or replaces) the input queue.
 
         :param name: upstream node name
+        :param queuetype: queue implementation, must provide the put(), get() and shutdown() methods of queue.Queue, a
+                          slot of the node's Inbox if not given
+        :param qsize: number of on the fly messages, the node's default if not given (or the size of the replaced queue)
+        :param adaptive: resize the queue by the observed rates of the sender and the receiver, Inbox slots only (or the
+                         adaptivity of the replaced queue)
         """
-        queue = Queue(self.__qsize)
+        default = self.__edges.get(name, (self.__qsize, False))
+        qsize = default[0] if qsize is None else qsize
+        adaptive = default[1] if adaptive is None else adaptive
+        self.__edges[name] = (qsize, adaptive)
+        queue = self.__inbox.slot(qsize, adaptive) if queuetype is None else queuetype(qsize)
         self.__queues[name] = queue
         return queue
 
@@ -124,14 +205,59 @@ class LNode(Node, ABC):
         """
         return list(self.__queues.keys())
 
+    @property
+    def edgestats(self) -> dict[str, dict]:
+        """
+        Statistics of the input queues by upstream name, see Slot.stats (Inbox slots only).
+        """
+        return {name: queue.stats for name, queue in self.__queues.items() if isinstance(queue, Slot)}
+
+    def _finalize(self) -> None:
+        super()._finalize()
+        if not self._isenabled(self.DEBUG):
+            return
+        for name, stats in self.edgestats.items():
+            self._log(f"Input {name}: {stats['messages']} messages, capacity {stats['capacity']}, sender blocked "
+                      f"{stats['blocked']:.3f}s, waited {stats['waited']:.3f}s", self.DEBUG)
+
     def _receive(self) -> list:
         """
         Receives messages from all inputs. It will wait till one message is received from all input queues.
 
         :return: the next messages from the message queues
         """
-        # collect messages from all upstreams
-        return [queue.get() for queue in self.__queues.values()]
+        if Node.profiling:
+            with self.profile.timing('receive'):
+                return self.__gather()
+        return self.__gather()
+
+    def __gather(self) -> list:
+        # inbox slots are gathered at once, with a single wakeup, other queues one by one
+        queues = list(self.__queues.values())
+        slots = [queue for queue in queues if isinstance(queue, Slot)]
+        if len(slots) == len(queues):
+            return self.__inbox.gather(slots)
+        gathered = iter(self.__inbox.gather(slots) if slots else ())
+        return [next(gathered) if isinstance(queue, Slot) else queue.get() for queue in queues]
+
+    def _receive_any(self, timeout: float = None) -> dict:
+        """
+        Receives messages from the inputs having any, for nodes not proceeding in lockstep. It will wait till a message
+        is received from any input queue. Raises ShutDown, if all input queues are shut down and empty.
+
+        Only the default (inbox) queues are supported, not the ones of connections between worker processes.
+
+        :param timeout: maximum time to wait, None for waiting indefinitely
+        :return: the next message of each upstream having one, by upstream name (empty on timeout)
+        """
+        if not all(isinstance(queue, Slot) for queue in self.__queues.values()):
+            raise NotImplementedError(f"{self.name} has inputs of other queue types, cannot receive from any")
+        names = list(self.__queues.keys())
+        if Node.profiling:
+            with self.profile.timing('receive'):
+                return {names[i]: msg for i, msg in
+                        self.__inbox.gather_any(list(self.__queues.values()), timeout).items()}
+        return {names[i]: msg for i, msg in self.__inbox.gather_any(list(self.__queues.values()), timeout).items()}
 
 
 class TNode(Node, ABC):
@@ -141,29 +267,63 @@ class TNode(Node, ABC):
     Letter T: assuming a top-down message flow, messages can exit via the vertical line of 'T', but input is blocked by
     the horizontal line.
     """
+    # nodes.shm.Codec of the sent messages, lets the 'process' backend pass them through shared memory
+    codec = None
 
     def __init__(self, **kwargs):
         self.__rqueues: dict[str, Queue] = {}
         super().__init__(**kwargs)
 
-    def connect_to(self, remote: LNode) -> None:
+    def connect_to(self, remote: LNode, qsize: int = None, adaptive: bool = False) -> None:
         """
         Connect this TNode to another LNode. Connection only works from sender to receiver direction.
 
         :param remote: remote LNode.
+        :param qsize: number of on the fly messages of the connection, the remote's default if not given
+        :param adaptive: resize the queue of the connection by the observed rates of the two nodes, starting at *qsize*
         :return: None
         """
         if not isinstance(remote, LNode):
             raise ValueError(f"Cannot connect to {remote.__class__.__name__}, not an LNode!")
         if remote.name in self.__rqueues.keys():
             raise KeyError(f"Already connected to {remote.name}")
-        self.__rqueues[remote.name] = remote.registerqueue(self.name)
+        self.__rqueues[remote.name] = remote.registerqueue(self.name, qsize=qsize, adaptive=adaptive)
+
+    def connect_all(self, remotes: Sequence[LNode], qsize: int = None, adaptive: bool = False) -> None:
+        """
+        Connect this TNode to several LNodes at once, in the order given. Checks all of them before connecting any.
+
+        :param remotes: remote LNodes
+        :param qsize: number of on the fly messages of the connections, the remotes' defaults if not given
+        :param adaptive: resize the queues of the connections, see connect_to()
+        :return: None
+        """
+        for remote in remotes:
+            if not isinstance(remote, LNode):
+                raise ValueError(f"Cannot connect to {remote.__class__.__name__}, not an LNode!")
+        names = [remote.name for remote in remotes]
+        if len(set(names)) != len(names) or not self.__rqueues.keys().isdisjoint(names):
+            raise KeyError(f"Already connected to some of {names}")
+        for name, remote in zip(names, remotes):
+            self.__rqueues[name] = remote.registerqueue(self.name, qsize=qsize, adaptive=adaptive)
+
+    def _rewire(self, remote: LNode, queuetype: type) -> None:
+        """
+        Replace the queue of an established connection, used by the execution backends before start.
+
+        :param remote: connected remote LNode
+        :param queuetype: new queue implementation
+        :return: None
+        """
+        if remote.name not in self.__rqueues.keys():
+            raise KeyError(f"Not connected to {remote.name}")
+        self.__rqueues[remote.name] = remote.registerqueue(self.name, queuetype)
 
     def terminate(self) -> None:
         for rqueue in self.__rqueues.values(): rqueue.shutdown()
 
-    def run(self) -> None:
-        super().run()
+    def _finalize(self) -> None:
+        super()._finalize()
 
         # completed or terminated, shut down the remote queue to unblock put() and get() methods.
         for rqueue in self.__rqueues.values():
@@ -180,6 +340,10 @@ class TNode(Node, ABC):
         if len(msgs) != len(self.__rqueues):
             raise ValueError(f"Message number mismatch: {len(msgs)} messages but {len(self.__rqueues)} downstreams.")
 
+        if Node.profiling:
+            with self.profile.timing('send'):
+                for queue, msg in zip(self.__rqueues.values(), msgs): queue.put(msg)
+            return
         for queue, msg in zip(self.__rqueues.values(), msgs):
             queue.put(msg)
 
@@ -0,0 +1,114 @@
+import multiprocessing
+import random
+from functools import partial
+from queue import ShutDown, Full
+from threading import Thread
+from typing import List
+
+# worker processes inherit the (unpicklable) Thread based nodes, so forking is the only usable start method
+_context = multiprocessing.get_context('fork')
+
+
+class _Shutdown:
+    """
+    End of stream marker, put into the queue by shutdown().
+    """
+    ...
+
+
+class ProcessQueue:
+    """
+    Message queue between worker processes. Provides the put(), get() and shutdown() interface of queue.Queue as used by
+    the nodes, messages are pickled.
+    """
+
+    def __init__(self, maxsize: int = 0):
+        """
+        :param maxsize: number of on the fly messages, 0 for unlimited
+        """
+        self.__queue = _context.Queue(maxsize)
+        self.__closed = _context.Event()
+        self.__drained = False
+
+    def put(self, item) -> None:
+        if self.__closed.is_set():
+            raise ShutDown
+        self.__queue.put(item)
+
+    def get(self):
+        if self.__drained:
+            raise ShutDown
+        item = self.__queue.get()
+        if isinstance(item, _Shutdown):
+            self.__drained = True
+            raise ShutDown
+        return item
+
+    def shutdown(self, immediate: bool = False) -> None:
+        """
+        Messages already in the queue are still delivered, then get() raises ShutDown. Never blocks: on a full queue,
+        the end of stream marker is put by a background thread, as soon as there is space.
+
+        :param immediate: ignored, present for queue.Queue compatibility
+        """
+        if not self.__closed.is_set():
+            self.__closed.set()
+            try:
+                self.__queue.put_nowait(_Shutdown())
+            except Full:
+                Thread(target=self.__queue.put, args=(_Shutdown(),), daemon=True).start()
+
+
+class Worker(_context.Process):
+    """
+    Worker process running a group of nodes. Step based nodes share a scheduler thread, the others run in their own
+    threads within the process.
+    """
+
+    def __init__(self, nodes: list, **kwargs):
+        super().__init__(**kwargs)
+        self.__nodes = nodes
+
+    @property
+    def nodes(self) -> list:
+        return self.__nodes
+
+    def run(self) -> None:
+        import numpy as np
+        from nodes.scheduler import Scheduler
+
+        # forked workers inherit the global random states of the parent, reseed to get independent random streams
+        random.seed()
+        np.random.seed()
+
+        # Thread objects created before fork cannot be started in the child, run the nodes in fresh threads instead
+        threads = [Thread(target=node.run, name=node.name) for node in self.__nodes if not node.stepped]
+        stepped = [node for node in self.__nodes if node.stepped]
+        if stepped:
+            threads.append(Thread(target=Scheduler(stepped).run, name=f"scheduler-{self.name}"))
+        for thread in threads: thread.start()
+        for thread in threads: thread.join()
+
+
+def spawn(groups: List[list]) -> List[Worker]:
+    """
+    Create a worker process for each node group. Connections between nodes of different groups are moved to
+    ShmQueues if the sender has a codec, to ProcessQueues otherwise. Connections within a group keep their thread queues.
+
+    :param groups: node groups (see nodes.scheduler.partition), one for each worker
+    :return: the (not yet started) workers
+    """
+    from nodes.node import TNode
+    from nodes.shm import ShmQueue
+
+    owner = {node.name: i for i, nodes in enumerate(groups) for node in nodes}
+    bynames = {node.name: node for nodes in groups for node in nodes}
+    for i, nodes in enumerate(groups):
+        for node in nodes:
+            if isinstance(node, TNode):
+                queuetype = ProcessQueue if node.codec is None else partial(ShmQueue, codec=node.codec)
+                for name in node.downstreams:
+                    if owner[name] != i:
+                        node._rewire(bynames[name], queuetype)
+
+    return [Worker(nodes, name=f"worker-{i}") for i, nodes in enumerate(groups)]
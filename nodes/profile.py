@@ -0,0 +1,140 @@
+from contextlib import contextmanager
+from math import frexp
+from time import perf_counter, thread_time
+from typing import Iterator, List
+
+# parts of the time of a node: waiting for and receiving messages, stepping, sending (and waiting for the downstreams)
+PARTS = ('receive', 'step', 'send')
+
+
+class Profile:
+    """
+    Timing of a node, recorded while Node.profiling is enabled: wall time of receiving, stepping and sending, CPU time
+    of stepping, the total wall and CPU time of thread based nodes, and a histogram of the step times.
+
+    Step times are binned by powers of two microseconds, bin i holds the steps taking [2**(i-1), 2**i) microseconds.
+    """
+
+    def __init__(self):
+        self.wall = dict.fromkeys(PARTS, 0.)
+        self.cpu = 0.
+        self.rounds = 0
+        # run time of thread based nodes (zero for nodes run by a scheduler)
+        self.total = 0.
+        self.totalcpu = 0.
+        self.histogram: List[int] = []
+
+    @contextmanager
+    def timing(self, part: str) -> Iterator[None]:
+        """
+        Time a part, steps are counted as rounds and added to the histogram.
+        """
+        start, cpu = perf_counter(), thread_time()
+        try:
+            yield
+        finally:
+            wall = perf_counter() - start
+            self.wall[part] += wall
+            if part == 'step':
+                self.cpu += thread_time() - cpu
+                self.rounds += 1
+                i = frexp(wall * 1e6)[1] if wall >= 1e-6 else 0
+                if i >= len(self.histogram):
+                    self.histogram.extend([0] * (i + 1 - len(self.histogram)))
+                self.histogram[i] += 1
+
+    @contextmanager
+    def running(self) -> Iterator[None]:
+        start, cpu = perf_counter(), thread_time()
+        try:
+            yield
+        finally:
+            self.total += perf_counter() - start
+            self.totalcpu += thread_time() - cpu
+
+    @property
+    def work(self) -> float:
+        """
+        Busy wall time: the steps, or the run time outside of receiving and sending of thread based nodes.
+        """
+        if self.total == 0:
+            return self.wall['step']
+        return max(self.total - self.wall['receive'] - self.wall['send'], 0.)
+
+    def percentile(self, q: float) -> float:
+        """
+        :param q: percentile in [0, 100]
+        :return: upper bound of the step time of the percentile, in seconds
+        """
+        if self.rounds == 0:
+            return float('nan')
+        count = 0
+        for i, n in enumerate(self.histogram):
+            count += n
+            if count >= q / 100 * self.rounds:
+                return 2. ** i * 1e-6
+        return 2. ** len(self.histogram) * 1e-6
+
+
+def summary(nodes: list) -> str:
+    """
+    Table of the profiles of the nodes, the busiest first.
+
+    :param nodes: profiled nodes
+    :return: a row per node: rounds, busy and CPU time, time blocked on receive and send, median and 99th percentile
+             of the step times (seconds)
+    """
+    header = f"{'node':<24} {'rounds':>8} {'work':>9} {'cpu':>9} {'receive':>9} {'send':>9} {'p50':>9} {'p99':>9}"
+    rows = [header]
+    for node in sorted(nodes, key=lambda node: -node.profile.work):
+        p = node.profile
+        cpu = p.totalcpu or p.cpu
+        rows.append(f"{node.name:<24} {p.rounds:>8} {p.work:>9.4f} {cpu:>9.4f} {p.wall['receive']:>9.4f} "
+                    f"{p.wall['send']:>9.4f} {p.percentile(50):>9.2g} {p.percentile(99):>9.2g}")
+    return '\n'.join(rows)
+
+
+def folded(nodes: list) -> str:
+    """
+    Profiles in the folded stacks format of flame graph tools (e.g. flamegraph.pl, speedscope): a line of "node;part
+    microseconds" for each part of each node.
+
+    :param nodes: profiled nodes
+    :return: folded stacks
+    """
+    lines = []
+    for node in nodes:
+        p = node.profile
+        for part, wall in [('work', p.work), ('receive', p.wall['receive']), ('send', p.wall['send'])]:
+            if wall > 0:
+                lines.append(f"{node.name};{part} {round(wall * 1e6)}")
+    return '\n'.join(lines)
+
+
+def critical_path(nodes: list) -> List[str]:
+    """
+    The chain of connected nodes with the most busy time, from a source to a sink: the nodes limiting the throughput
+    of the simulation.
+
+    :param nodes: profiled nodes
+    :return: names of the nodes of the path
+    """
+    from nodes.scheduler import topological, _adjacency
+
+    ordered = topological(nodes)
+    adjacency = _adjacency(ordered)
+    # busy time of the longest path ending at each node, and its predecessor
+    longest = [node.profile.work for node in ordered]
+    before = [None] * len(ordered)
+    for i, downstreams in enumerate(adjacency):
+        for j in downstreams:
+            if longest[i] + ordered[j].profile.work > longest[j]:
+                longest[j] = longest[i] + ordered[j].profile.work
+                before[j] = i
+
+    path = []
+    i = max(range(len(ordered)), key=longest.__getitem__, default=None)
+    while i is not None:
+        path.append(ordered[i].name)
+        i = before[i]
+    return path[::-1]
@@ -0,0 +1,223 @@
+from collections import Counter, deque
+from math import ceil
+from queue import ShutDown
+from threading import Thread
+from typing import Callable, List
+
+from nodes.node import Node, LNode, TNode
+
+
+def _adjacency(nodes: List[Node]) -> List[List[int]]:
+    """
+    Directed adjacency lists (by position in *nodes*) of the connect_to graph. Connections to nodes not listed are
+    ignored.
+    """
+    index = {node.name: i for i, node in enumerate(nodes)}
+    return [[index[name] for name in node.downstreams if name in index] if isinstance(node, TNode) else []
+            for node in nodes]
+
+
+def topological(nodes: List[Node]) -> List[Node]:
+    """
+    Order the nodes so that every node comes after all of its upstreams. Ties are broken by the original order.
+
+    :param nodes: nodes to order
+    :return: the ordered nodes
+    """
+    adjacency = _adjacency(nodes)
+    indegree = [0] * len(nodes)
+    for downstreams in adjacency:
+        for j in downstreams: indegree[j] += 1
+
+    ready = [i for i, d in enumerate(indegree) if d == 0]
+    order = []
+    while ready:
+        i = ready.pop(0)
+        order.append(i)
+        for j in adjacency[i]:
+            indegree[j] -= 1
+            if indegree[j] == 0:
+                ready.append(j)
+
+    if len(order) != len(nodes):
+        raise ValueError("Cannot order nodes, the connections form a cycle")
+    return [nodes[i] for i in order]
+
+
+def partition(nodes: List[Node], k: int, imbalance: float = 0.1, passes: int = 10) -> List[List[Node]]:
+    """
+    Partition the connect_to graph into *k* groups of nearly equal size, cutting as few connections as possible.
+
+    Nodes are first laid out in depth-first order from the sources (so chains of connected nodes stay together) and cut
+    into contiguous groups, then boundary nodes are greedily moved to the neighbouring group holding most of their
+    connections, as long as group sizes stay within the allowed imbalance.
+
+    :param nodes: nodes to partition
+    :param k: number of groups
+    :param imbalance: allowed relative excess of group sizes over the average
+    :param passes: maximum number of refinement passes
+    :return: list of non-empty node groups, each in the original node order
+    """
+    if not isinstance(k, int) or k < 1:
+        raise ValueError(f"Cannot partition nodes into {k} groups")
+    if not nodes:
+        return []
+
+    n = len(nodes)
+    k = min(k, n)
+    adjacency = _adjacency(nodes)
+    neighbours = [set(downstreams) for downstreams in adjacency]
+    for i, downstreams in enumerate(adjacency):
+        for j in downstreams: neighbours[j].add(i)
+
+    # depth-first layout, starting from the sources
+    indegree = Counter(j for downstreams in adjacency for j in downstreams)
+    roots = [i for i in range(n) if indegree[i] == 0] + list(range(n))
+    order, seen = [], [False] * n
+    for root in roots:
+        stack = [root]
+        while stack:
+            i = stack.pop()
+            if seen[i]:
+                continue
+            seen[i] = True
+            order.append(i)
+            stack.extend(reversed(adjacency[i]))
+
+    size = ceil(n / k)
+    part = [0] * n
+    for position, i in enumerate(order):
+        part[i] = position // size
+    sizes = Counter(part)
+
+    # refine, move nodes with positive gain (reduction of cut connections)
+    capacity = max(size, ceil(n / k * (1 + imbalance)))
+    for _ in range(passes):
+        moved = False
+        for i in order:
+            counts = Counter(part[j] for j in neighbours[i])
+            gain, target = max(((c - counts[part[i]], p) for p, c in counts.items()
+                                if p != part[i] and sizes[p] < capacity), default=(0, None))
+            if gain > 0 and sizes[part[i]] > 1:
+                sizes[part[i]] -= 1
+                sizes[target] += 1
+                part[i] = target
+                moved = True
+        if not moved:
+            break
+
+    groups = [[] for _ in range(k)]
+    for i, node in enumerate(nodes):
+        groups[part[i]].append(node)
+    return [group for group in groups if group]
+
+
+class Scheduler:
+    """
+    Runs a group of step based nodes within one thread. In every round, each node does a single step, in the given
+    order. Connections within the group never block, connections to other groups block as usual.
+    """
+
+    def __init__(self, nodes: List[Node]):
+        """
+        :param nodes: step based nodes to run, must follow the topological order of the whole graph (not only of the
+                      group), otherwise schedulers may deadlock each other
+        """
+        for node in nodes:
+            if not node.stepped:
+                raise ValueError(f"Cannot schedule {node.name}, not a step based node")
+        self.__nodes = nodes
+
+    @property
+    def nodes(self) -> List[Node]:
+        return self.__nodes
+
+    def run(self) -> None:
+        active = list(self.__nodes)
+        while active:
+            for node in list(active):
+                try:
+                    node._round()
+                    continue
+                except (StopIteration, ShutDown):
+                    pass
+                except Exception:
+                    node._exception()
+                node._finalize()
+                active.remove(node)
+
+    def terminate(self) -> None:
+        for node in self.__nodes: node.terminate()
+
+
+class SchedulerThread(Thread):
+    """
+    Thread running a Scheduler, used as worker by the 'thread' backend.
+    """
+
+    def __init__(self, nodes: List[Node], exited: Callable[[Thread], None] = None, **kwargs):
+        """
+        :param nodes: step based nodes to run, see Scheduler
+        :param exited: called with the thread, when it completes
+        """
+        self.__scheduler = Scheduler(nodes)
+        self.__exited = exited
+        super().__init__(name=f"scheduler-{nodes[0].name}", target=self.__scheduler.run, **kwargs)
+
+    def run(self) -> None:
+        try:
+            super().run()
+        finally:
+            if self.__exited is not None: self.__exited(self)
+
+    def terminate(self) -> None:
+        self.__scheduler.terminate()
+
+
+class DirectQueue:
+    """
+    Unbounded queue without locks, for the connections of the 'direct' backend. Nodes step in topological order within
+    a single thread, so a message is always put before it is got: get() never waits.
+    """
+
+    def __init__(self, maxsize: int = 0):
+        """
+        :param maxsize: ignored, present for queue.Queue compatibility
+        """
+        self.__items = deque()
+        self.__closed = False
+
+    def put(self, item) -> None:
+        if self.__closed:
+            raise ShutDown
+        self.__items.append(item)
+
+    def get(self):
+        if self.__items:
+            return self.__items.popleft()
+        if self.__closed:
+            raise ShutDown
+        raise RuntimeError("Nothing to receive, the sender did not step before the receiver")
+
+    def shutdown(self, immediate: bool = False) -> None:
+        self.__closed = True
+        if immediate:
+            self.__items.clear()
+
+
+def direct(nodes: List[Node]) -> Scheduler:
+    """
+    Prepare the nodes to run deterministically in the calling thread, by a single Scheduler in topological order. All
+    connections are moved to DirectQueues.
+
+    :param nodes: step based nodes of the whole graph
+    :return: the scheduler running them
+    """
+    nodes = topological(nodes)
+    bynames = {node.name: node for node in nodes}
+    for node in nodes:
+        if isinstance(node, TNode):
+            for name in node.downstreams:
+                if isinstance(bynames.get(name), LNode):
+                    node._rewire(bynames[name], DirectQueue)
+    return Scheduler(nodes)
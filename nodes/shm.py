@@ -0,0 +1,154 @@
+import os
+import weakref
+from abc import ABC, abstractmethod
+from multiprocessing.shared_memory import SharedMemory
+from queue import ShutDown
+
+import numpy as np
+
+from nodes.process import _context
+
+# slot state of pickled messages
+_OVERFLOW = -1
+
+
+class Codec(ABC):
+    """
+    Converts messages to and from a fixed set of equal length NumPy columns, so they can be passed through shared
+    memory instead of being pickled.
+    """
+    # maximum number of rows of a message stored in shared memory, larger messages are pickled
+    rows: int = 4096
+
+    @property
+    @abstractmethod
+    def fields(self) -> dict[str, np.dtype]:
+        """
+        Column names and types.
+        """
+        ...
+
+    @abstractmethod
+    def encode(self, msg) -> dict[str, np.ndarray] | None:
+        """
+        :param msg: message to encode
+        :return: columns of the message, or None, if the message cannot be encoded (it will be pickled)
+        """
+        ...
+
+    @abstractmethod
+    def decode(self, columns: dict[str, np.ndarray]):
+        """
+        :param columns: columns of the message, views of the shared memory valid until the next get(), copy them to
+                        keep the message for longer
+        :return: the message
+        """
+        ...
+
+
+def _release(blocks: list[SharedMemory], pid: int) -> None:
+    if os.getpid() != pid:
+        return
+    for block in blocks:
+        try:
+            block.close()
+        except BufferError:
+            # views are still in use, the mapping is released with the process
+            pass
+        block.unlink()
+
+
+class ShmQueue:
+    """
+    Message queue between worker processes, backed by preallocated shared memory ring buffers. Provides the put(),
+    get() and shutdown() interface of queue.Queue as used by the nodes.
+
+    The sender writes the encoded columns into the next free slot, and get() passes views of the slot to the codec's
+    decode(). The ring has one slot more than the queue size, so the slot of the last received message is not
+    overwritten before the next get(). Whether the receiver gets views or copies depends on the codec. Messages the
+    codec cannot encode, or longer than the slot, are pickled through a side queue, keeping the message order.
+
+    Supports a single sender and a single receiver process.
+    """
+
+    def __init__(self, maxsize: int, codec: Codec):
+        """
+        :param maxsize: number of on the fly messages, 0 defaults to 16
+        :param codec: message codec
+        """
+        maxsize = maxsize if maxsize > 0 else 16
+        self.__codec = codec
+        self.__nslots = maxsize + 1
+
+        self.__blocks = [SharedMemory(create=True, size=self.__nslots * 8)]
+        self.__nrows = np.ndarray((self.__nslots,), dtype=np.int64, buffer=self.__blocks[0].buf)
+        self.__slots = {}
+        for name, dtype in codec.fields.items():
+            dtype = np.dtype(dtype)
+            block = SharedMemory(create=True, size=self.__nslots * codec.rows * dtype.itemsize)
+            self.__blocks.append(block)
+            self.__slots[name] = np.ndarray((self.__nslots, codec.rows), dtype=dtype, buffer=block.buf)
+        weakref.finalize(self, _release, self.__blocks, os.getpid())
+
+        self.__free = _context.Semaphore(maxsize)
+        self.__used = _context.Semaphore(0)
+        self.__written = _context.Value('q', 0, lock=False)
+        self.__overflow = _context.Queue()
+        self.__closed = _context.Event()
+
+        # process local ring positions, there is one sender and one receiver
+        self.__head = 0
+        self.__tail = 0
+        self.__read = 0
+        self.__drained = False
+
+    def put(self, item) -> None:
+        if self.__closed.is_set():
+            raise ShutDown
+
+        columns = self.__codec.encode(item)
+        nrows = len(next(iter(columns.values()))) if columns else 0
+        if columns is None or nrows > self.__codec.rows:
+            self.__overflow.put(item)
+            columns, nrows = None, _OVERFLOW
+
+        self.__free.acquire()
+        slot = self.__head
+        self.__head = (slot + 1) % self.__nslots
+        if columns is not None:
+            for name, column in columns.items():
+                self.__slots[name][slot, :nrows] = column
+        self.__nrows[slot] = nrows
+        self.__written.value += 1
+        self.__used.release()
+
+    def get(self):
+        if self.__drained:
+            raise ShutDown
+
+        self.__used.acquire()
+        if self.__read == self.__written.value:
+            # woken up by shutdown(), all messages are delivered
+            self.__drained = True
+            raise ShutDown
+
+        slot = self.__tail
+        self.__tail = (slot + 1) % self.__nslots
+        self.__read += 1
+        nrows = int(self.__nrows[slot])
+        self.__free.release()
+
+        if nrows == _OVERFLOW:
+            return self.__overflow.get()
+        return self.__codec.decode({name: slots[slot, :nrows] for name, slots in self.__slots.items()})
+
+    def shutdown(self, immediate: bool = False) -> None:
+        """
+        Messages already in the queue are still delivered, then get() raises ShutDown. Never blocks, may be called by
+        either side.
+
+        :param immediate: ignored, present for queue.Queue compatibility
+        """
+        if not self.__closed.is_set():
+            self.__closed.set()
+            self.__used.release()
@@ -0,0 +1,164 @@
+import logging
+import os
+import threading
+from multiprocessing.connection import wait
+
+
+class Simulation:
+    """
+    Owns a set of nodes, starts, joins and terminates them. Nodes created within ``with Simulation() as simulation:``
+    (by the same thread) belong to that simulation, nodes created outside of any belong to the default one, run by
+    Node.start_all(), Node.join_all() and Node.terminate_all().
+
+    Simulations are independent of each other: several of them may run concurrently within one process, each with its
+    own backend. Joining waits for a completion signal of the runners (node threads, scheduler threads or worker
+    processes), instead of polling them.
+    """
+    # simulations entered by each thread, innermost last
+    __local = threading.local()
+
+    # simulation of the nodes created outside of any context
+    __default = None
+
+    def __init__(self, backend: str = None, workers: int | None = None):
+        """
+        :param backend: execution backend (see Node.backend), Node.backend at start if not given
+        :param workers: number of workers (see Node.workers), Node.workers at start if not given
+        """
+        self.__nodes = []
+        self.__backend = backend
+        self.__workers = workers
+        # threads and worker processes running the nodes, the ones not completed yet, the 'direct' backend's scheduler
+        self.__runners = []
+        self.__pending = set()
+        self.__scheduler = None
+        self.__lock = threading.Lock()
+        self.__completed = threading.Event()
+        self.__completed.set()
+
+    @classmethod
+    def current(cls) -> 'Simulation':
+        """
+        :return: the innermost simulation entered by the calling thread, the default simulation if none
+        """
+        stack = getattr(cls.__local, 'stack', None)
+        if stack:
+            return stack[-1]
+        if Simulation.__default is None:
+            Simulation.__default = Simulation()
+        return Simulation.__default
+
+    def __enter__(self) -> 'Simulation':
+        if not hasattr(Simulation.__local, 'stack'):
+            Simulation.__local.stack = []
+        Simulation.__local.stack.append(self)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        Simulation.__local.stack.remove(self)
+        self.terminate()
+
+    @property
+    def nodes(self) -> list:
+        return self.__nodes
+
+    def add(self, node) -> None:
+        """
+        Called by the nodes on creation.
+
+        :param node: node of this simulation
+        """
+        self.__nodes.append(node)
+
+    def start(self) -> None:
+        """
+        Start the nodes.
+
+        :return: None
+        """
+        from nodes.node import Node
+        from nodes.scheduler import partition, topological, direct, SchedulerThread
+
+        backend = self.__backend or Node.backend
+        workers = self.__workers if self.__workers is not None else Node.workers
+        if backend == 'process':
+            from nodes.process import spawn
+            runners = spawn(partition(topological(self.__nodes), workers or os.cpu_count()))
+        elif backend == 'thread' and workers is not None:
+            runners = []
+            for nodes in partition(topological(self.__nodes), workers):
+                stepped = [node for node in nodes if node.stepped]
+                if stepped:
+                    runners.append(SchedulerThread(stepped, exited=self._exited))
+                runners.extend(node for node in nodes if not node.stepped)
+        elif backend == 'thread':
+            runners = list(self.__nodes)
+        elif backend == 'direct':
+            self.__scheduler = direct(self.__nodes)
+            runners = []
+        else:
+            raise ValueError(f"Unknown backend: {backend}")
+
+        # all runners are pending before any of them may complete
+        self.__runners = runners
+        self.__pending = set(runners)
+        self.__completed.clear()
+        if not runners:
+            self.__completed.set()
+        for runner in runners: runner.start()
+
+    def _exited(self, runner) -> None:
+        """
+        Called by the node and scheduler threads, when they complete.
+
+        :param runner: the completed thread
+        """
+        with self.__lock:
+            if runner not in self.__pending:
+                return
+            self.__pending.discard(runner)
+            if not self.__pending:
+                self.__completed.set()
+
+    def join(self) -> None:
+        """
+        Wait until the simulation completes. The 'direct' backend runs the simulation in the calling thread.
+
+        :return: None
+        """
+        if self.__scheduler is not None:
+            scheduler, self.__scheduler = self.__scheduler, None
+            scheduler.run()
+
+        processes = [runner for runner in self.__runners if not isinstance(runner, threading.Thread)]
+        if processes:
+            # worker processes signal completion by their sentinels
+            while processes:
+                ready = wait([process.sentinel for process in processes])
+                processes = [process for process in processes if process.sentinel not in ready]
+            for process in self.__runners: process.join()
+        else:
+            self.__completed.wait()
+
+    def terminate(self, timeout: float | None = None) -> None:
+        """
+        Terminate the simulation and wait for the nodes to complete. The nodes are released, a new simulation can be
+        built in this one.
+
+        :param timeout: timeout of individual nodes, None for waiting indefinitely
+        :return: None
+        """
+        if self.__scheduler is not None:
+            self.__scheduler.terminate()
+            self.__scheduler = None
+        for runners in [self.__runners, self.__nodes]:
+            while runners:
+                runner = runners.pop()
+                if runner.is_alive():
+                    runner.terminate()
+                    runner.join(timeout)
+                    if runner.is_alive():
+                        logging.getLogger(runner.name).error(f"Termination failed within {timeout} seconds")
+        self.__pending = set()
+        self.__completed.set()
+
@@ -0,0 +1,151 @@
+from queue import ShutDown, Queue
+from threading import Thread
+from time import sleep
+from unittest import TestCase
+
+from nodes.inbox import Inbox
+from nodes.log import DummylogMixIn
+from nodes.node import Node, LNode, TNode
+
+
+class MySender(TNode, DummylogMixIn):
+    def __init__(self, n: int, delay: float = 0, **kwargs):
+        super().__init__(**kwargs)
+        self._n = n
+        self._delay = delay
+
+    def _work(self) -> None:
+        for i in range(self._n):
+            sleep(self._delay)
+            self._send([f"{self.name}:{i}"] * len(self.downstreams))
+
+
+class MyReceiver(LNode, DummylogMixIn):
+    def _work(self) -> None:
+        pass
+
+
+class TestInbox(TestCase):
+    def tearDown(self) -> None:
+        Node.terminate_all(1)
+
+    def test_gather(self):
+        inbox = Inbox()
+        slots = [inbox.slot(2) for _ in range(3)]
+        slots[0].put('a')
+        slots[2].put('c')
+        result = []
+        receiver = Thread(target=lambda: result.append(inbox.gather(slots)))
+        receiver.start()
+        receiver.join(0.1)
+        self.assertTrue(receiver.is_alive())
+        slots[1].put('b')
+        receiver.join(1)
+        self.assertListEqual([['a', 'b', 'c']], result)
+
+        # a full slot blocks its sender only
+        slots[0].put(1)
+        slots[0].put(2)
+        sender = Thread(target=slots[0].put, args=(3,))
+        sender.start()
+        sender.join(0.1)
+        self.assertTrue(sender.is_alive())
+        self.assertEqual(1, slots[0].get())
+        sender.join(1)
+        self.assertFalse(sender.is_alive())
+
+        # shutdown delivers the remaining messages
+        slots[0].shutdown()
+        self.assertEqual(2, slots[0].get())
+        self.assertEqual(3, slots[0].get())
+        with self.assertRaises(ShutDown):
+            slots[0].get()
+        with self.assertRaises(ShutDown):
+            slots[0].put(4)
+        slots[1].put('b')
+        with self.assertRaises(ShutDown):
+            inbox.gather(slots)
+
+    def test_gather_any(self):
+        inbox = Inbox()
+        slots = [inbox.slot() for _ in range(3)]
+        self.assertDictEqual({}, inbox.gather_any(slots, timeout=0.01))
+        Thread(target=lambda: (sleep(0.05), slots[1].put(None))).start()
+        self.assertDictEqual({1: None}, inbox.gather_any(slots))
+
+        slots[0].put('a')
+        slots[0].put('b')
+        slots[2].put('c')
+        self.assertDictEqual({0: 'a', 2: 'c'}, inbox.gather_any(slots))
+        self.assertDictEqual({0: 'b'}, inbox.gather_any(slots))
+
+        # immediate shutdown drops the messages
+        slots[0].put('d')
+        for slot in slots: slot.shutdown(immediate=True)
+        with self.assertRaises(ShutDown):
+            inbox.gather_any(slots)
+
+    def test_adaptive(self):
+        inbox = Inbox()
+        slot = inbox.slot(2, adaptive=True)
+        slot.window = 4
+        slot.put(0)
+        slot.put(1)
+        sender = Thread(target=slot.put, args=(2,))
+        sender.start()
+        sleep(0.05)
+        self.assertEqual(0, slot.get())
+        sender.join(1)
+        self.assertEqual(1, slot.get())
+        # both sides stalled within the window: grow
+        slot._waited(0.01)
+        slot.put(3)
+        stats = slot.stats
+        self.assertEqual(4, stats['capacity'])
+        self.assertEqual(4, stats['messages'])
+        self.assertGreater(stats['blocked'], 0.04)
+
+        # the receiver never waited: shrink
+        for i in range(4):
+            slot.get()
+            slot.put(i)
+        self.assertEqual(3, slot.stats['capacity'])
+
+        # the receiver waiting is accounted to the empty slots
+        other = inbox.slot(2)
+        Thread(target=lambda: (sleep(0.05), other.put('b'))).start()
+        inbox.gather([slot, other])
+        self.assertGreater(other.stats['waited'], 0.04)
+        self.assertEqual(0.01, slot.stats['waited'])
+
+    def test_edges(self):
+        senders = [MySender(name=f"sender{i}", n=3) for i in range(3)]
+        receiver = MyReceiver(name='receiver', qsize=2)
+        senders[0].connect_to(receiver)
+        senders[1].connect_to(receiver, qsize=7)
+        senders[2].connect_to(receiver, qsize=1, adaptive=True)
+        self.assertDictEqual({'sender0': 2, 'sender1': 7, 'sender2': 1},
+                             {name: stats['capacity'] for name, stats in receiver.edgestats.items()})
+        # replaced queues keep their size
+        senders[1]._rewire(receiver, Queue)
+        self.assertEqual(7, receiver.registerqueue('sender1', Queue).maxsize)
+        self.assertListEqual(['sender0', 'sender2'], list(receiver.edgestats.keys()))
+
+    def test_nodes(self):
+        senders = [MySender(name=f"sender{i}", n=3, delay=0.01 * i) for i in range(4)]
+        receiver = MyReceiver(name='receiver')
+        for sender in senders:
+            sender.connect_to(receiver)
+        Node.start_all()
+        self.assertListEqual([f"sender{j}:0" for j in range(4)], receiver._receive())
+
+        # the remaining messages, as they come
+        received = {f"sender{j}": [] for j in range(4)}
+        while True:
+            try:
+                msgs = receiver._receive_any(timeout=1)
+            except ShutDown:
+                break
+            self.assertTrue(msgs)
+            for name, msg in msgs.items(): received[name].append(msg)
+        self.assertDictEqual({f"sender{j}": [f"sender{j}:1", f"sender{j}:2"] for j in range(4)}, received)
@@ -0,0 +1,64 @@
+import logging
+from unittest import TestCase
+
+from nodes.log import AsyncLoggerMixIn, DummylogMixIn, LoggerMixIn
+from nodes.node import Node, LNode, TNode
+
+
+class MySource(AsyncLoggerMixIn, TNode):
+    def _step(self, msgs: list) -> list:
+        if self._n == 0:
+            raise StopIteration
+        self._n -= 1
+        self._log(f"sending {self._n}")
+        if self._isenabled(self.DEBUG):
+            self._log(f"expensive {list(range(self._n))}", self.DEBUG)
+        return [self._n] * len(self.downstreams)
+
+
+class MySink(LoggerMixIn, LNode):
+    def _step(self, msgs: list) -> None:
+        self._log(f"received {msgs}")
+
+
+class MyDummy(DummylogMixIn, LNode):
+    def _step(self, msgs: list) -> None:
+        pass
+
+
+class TestLog(TestCase):
+    def tearDown(self) -> None:
+        Node.terminate_all(1)
+        AsyncLoggerMixIn.stop()
+
+    def test_levels(self):
+        sink = MySink(name='sink')
+        logger = logging.getLogger('sink')
+        try:
+            logger.setLevel(logging.INFO)
+            self.assertTrue(sink._isenabled(sink.INFO))
+            self.assertFalse(sink._isenabled(sink.DEBUG))
+            logger.setLevel(logging.DEBUG)
+            self.assertTrue(sink._isenabled(sink.DEBUG))
+        finally:
+            logger.setLevel(logging.NOTSET)
+        self.assertFalse(MyDummy(name='dummy')._isenabled(MyDummy.ERROR))
+
+    def test_async(self):
+        sources = [MySource(name=f"source{i}") for i in range(3)]
+        sink = MySink(name='sink')
+        for source in sources:
+            source._n = 5
+            source.connect_to(sink)
+
+        with self.assertLogs(level='INFO') as logs:
+            Node.start_all()
+            Node.join_all()
+            AsyncLoggerMixIn.flush()
+        for i in range(3):
+            self.assertEqual([f"sending {n}" for n in reversed(range(5))] + ['Exit'],
+                             [r.getMessage() for r in logs.records if r.name == f"source{i}"])
+            self.assertFalse(logging.getLogger(f"source{i}").propagate)
+        self.assertEqual(5, sum(r.getMessage().startswith('received') for r in logs.records))
+        # debug messages are not even formatted
+        self.assertFalse(any('expensive' in r.getMessage() for r in logs.records))
@@ -1,6 +1,8 @@
 from pathlib import Path
 from unittest import TestCase
 
+import numpy as np
+
 from nodes.log import DummylogMixIn
 from nodes.node import Node, LNode, TNode, INode
 
@@ -25,6 +27,15 @@ class MyTNode(TNode, DummylogMixIn):
         self._send([msg] * len(self.downstreams))
 
 
+class MyRandomTNode(TNode, DummylogMixIn):
+    """
+    Sends one random number drawn from the global random state, then terminates.
+    """
+
+    def _work(self) -> None:
+        self._send([str(np.random.random())] * len(self.downstreams))
+
+
 class MyLNode(LNode, DummylogMixIn):
     """
     Receives messages.
@@ -41,12 +52,28 @@ class MyLNode(LNode, DummylogMixIn):
         return self._msg
 
 
+class MyFileLNode(LNode, DummylogMixIn):
+    """
+    Receives messages and writes them into a file, to observe the results of other processes.
+    """
+
+    def __init__(self, path: str, **kwargs):
+        super().__init__(**kwargs)
+        self._path = path
+
+    def _work(self) -> None:
+        Path(self._path).write_text(','.join(self._receive()))
+
+
 class TestNode(TestCase):
     def setUp(self) -> None:
         Node.terminate_all(1)
+        Path('_out').mkdir(exist_ok=True)
 
     def tearDown(self) -> None:
         Node.terminate_all(1)
+        Node.backend = 'thread'
+        Node.workers = None
 
     def test_node(self):
         # simplest node implementation
@@ -110,6 +137,39 @@ class TestNode(TestCase):
         #
         #
 
+    def test_process(self):
+        Node.backend = 'process'
+        Node.workers = 2
+
+        sender1 = MyTNode(name='sender1', msg='hello1')
+        sender2 = MyTNode(name='sender2', msg='hello2')
+        receiver = MyFileLNode(name='receiver', path='_out/process.txt')
+        sender1.connect_to(receiver)
+        sender2.connect_to(receiver)
+
+        Path('_out/process.txt').unlink(missing_ok=True)
+        MyTNode.start_all()
+        MyTNode.join_all()
+
+        self.assertListEqual(['hello1', 'hello2'], Path('_out/process.txt').read_text().split(','))
+        Node.terminate_all(1)
+
+        # workers draw independent random numbers, even if the global random state was initialized before forking
+        np.random.random()
+        sender1 = MyRandomTNode(name='sender1')
+        sender2 = MyRandomTNode(name='sender2')
+        receiver = MyFileLNode(name='receiver', path='_out/process.txt')
+        sender1.connect_to(receiver)
+        sender2.connect_to(receiver)
+        MyTNode.start_all()
+        MyTNode.join_all()
+        self.assertEqual(2, len(set(Path('_out/process.txt').read_text().split(','))))
+
+        # unknown backend
+        Node.backend = 'unknown'
+        with self.assertRaises(ValueError):
+            Node.start_all()
+
     def test_XNode(self):
         class SendNode(TNode, DummylogMixIn):
             def _work(self) -> None:
@@ -149,3 +209,16 @@ class TestNode(TestCase):
         middle._send(['tom3', 'tom4'])
         self.assertListEqual(['tom3'], receiver1._receive())
         self.assertListEqual(['tom4'], receiver2._receive())
+
+        # connect several at once, checked before connecting any
+        sender3 = SendNode(name='sender3')
+        sender3.connect_all([receiver2, receiver1], qsize=2)
+        self.assertListEqual(['receiver2', 'receiver1'], sender3.downstreams)
+        self.assertEqual(2, receiver1.edgestats['sender3']['capacity'])
+        with self.assertRaises(KeyError):
+            sender1.connect_all([receiver1, receiver1])
+        with self.assertRaises(KeyError):
+            sender3.connect_all([middle, receiver1])
+        with self.assertRaises(ValueError):
+            sender1.connect_all([receiver1, sender2])
+        self.assertListEqual(['middle'], sender1.downstreams)
@@ -0,0 +1,85 @@
+from time import sleep
+from unittest import TestCase
+
+from nodes.log import DummylogMixIn
+from nodes.node import Node, LNode, TNode, INode
+from nodes.profile import summary, folded, critical_path
+
+
+class MySource(TNode, DummylogMixIn):
+    def __init__(self, n: int, **kwargs):
+        super().__init__(**kwargs)
+        self._numbers = iter(range(n))
+
+    def _step(self, msgs: list) -> list:
+        return [next(self._numbers)] * len(self.downstreams)
+
+
+class MySlowRelay(INode, DummylogMixIn):
+    def _step(self, msgs: list) -> list:
+        sleep(0.01)
+        return [sum(msgs)] * len(self.downstreams)
+
+
+class MyFastRelay(INode, DummylogMixIn):
+    def _step(self, msgs: list) -> list:
+        return [sum(msgs)] * len(self.downstreams)
+
+
+class MyThreadSink(LNode, DummylogMixIn):
+    def _work(self) -> None:
+        while True:
+            self._receive()
+
+
+class TestProfile(TestCase):
+    def tearDown(self) -> None:
+        Node.terminate_all(1)
+        Node.profiling = False
+
+    def graph(self) -> list:
+        """
+        source --> slow --> sink, source --> fast --> sink
+        """
+        source = MySource(name='source', n=20)
+        slow = MySlowRelay(name='slow')
+        fast = MyFastRelay(name='fast')
+        sink = MyThreadSink(name='sink')
+        for relay in (slow, fast):
+            source.connect_to(relay)
+            relay.connect_to(sink)
+        return [source, slow, fast, sink]
+
+    def test_profile(self):
+        Node.profiling = True
+        source, slow, fast, sink = nodes = self.graph()
+        Node.start_all()
+        Node.join_all()
+
+        self.assertEqual(20, slow.profile.rounds)
+        self.assertEqual(21, source.profile.rounds)
+        self.assertGreaterEqual(slow.profile.wall['step'], 0.2)
+        self.assertLess(slow.profile.cpu, 0.1)
+        self.assertTrue(0.01 <= slow.profile.percentile(50) <= 0.02)
+        self.assertTrue(0.01 <= slow.profile.percentile(99) <= 0.04)
+        # the fast relay and the sink wait for the slow relay
+        self.assertGreater(sink.profile.wall['receive'], 0.15)
+        self.assertGreater(sink.profile.total, sink.profile.wall['receive'])
+        self.assertLess(sink.profile.work, 0.05)
+        self.assertGreater(fast.profile.wall['send'] + fast.profile.wall['receive'], 0.1)
+
+        table = summary(nodes).splitlines()
+        self.assertEqual(5, len(table))
+        self.assertTrue(table[1].startswith('slow'))
+        stacks = dict(line.rsplit(' ', 1) for line in folded(nodes).splitlines())
+        self.assertGreaterEqual(int(stacks['slow;work']), 200000)
+        self.assertIn('sink;receive', stacks)
+        self.assertListEqual(['source', 'slow', 'sink'], critical_path(nodes))
+
+    def test_disabled(self):
+        source, slow, fast, sink = self.graph()
+        Node.start_all()
+        Node.join_all()
+        self.assertEqual(0, slow.profile.rounds)
+        self.assertEqual(0, sink.profile.wall['receive'])
+        self.assertEqual(0, sink.profile.total)
@@ -0,0 +1,193 @@
+from pathlib import Path
+from queue import ShutDown
+from unittest import TestCase
+
+from nodes.log import DummylogMixIn
+from nodes.node import Node, LNode, TNode, INode
+from nodes.scheduler import partition, topological, Scheduler, DirectQueue
+
+
+class MySource(TNode, DummylogMixIn):
+    """
+    Sends the numbers 0..*n*-1, one in each round.
+    """
+
+    def __init__(self, n: int, **kwargs):
+        super().__init__(**kwargs)
+        self._numbers = iter(range(n))
+
+    def _step(self, msgs: list) -> list:
+        return [next(self._numbers)] * len(self.downstreams)
+
+
+class MyRelay(INode, DummylogMixIn):
+    """
+    Sums the messages of the upstreams.
+    """
+
+    def _step(self, msgs: list) -> list:
+        return [sum(msgs)] * len(self.downstreams)
+
+
+class MySink(LNode, DummylogMixIn):
+    """
+    Appends the sum of the received messages to a file, to observe the results of other processes.
+    """
+
+    def __init__(self, path: str, **kwargs):
+        super().__init__(**kwargs)
+        self._path = path
+        Path(path).unlink(missing_ok=True)
+
+    def _step(self, msgs: list) -> None:
+        with open(self._path, 'a') as f:
+            f.write(f"{sum(msgs)}\n")
+
+
+class MyFailingRelay(INode, DummylogMixIn):
+    def _step(self, msgs: list) -> list:
+        raise ValueError("failing relay")
+
+
+class MyThreadSink(LNode, DummylogMixIn):
+    def _work(self) -> None:
+        self._receive()
+
+
+class TestScheduler(TestCase):
+    def setUp(self) -> None:
+        Node.terminate_all(1)
+        Path('_out').mkdir(exist_ok=True)
+
+    def tearDown(self) -> None:
+        Node.terminate_all(1)
+        Node.backend = 'thread'
+        Node.workers = None
+
+    def chains(self, n: int) -> list:
+        """
+        Two independent chains: source --> relay --> sink, created interleaved.
+        """
+        sources = [MySource(name=f"source{i}", n=n) for i in range(2)]
+        relays = [MyRelay(name=f"relay{i}") for i in range(2)]
+        sinks = [MySink(name=f"sink{i}", path=f"_out/sink{i}.txt") for i in range(2)]
+        for source, relay, sink in zip(sources, relays, sinks):
+            source.connect_to(relay)
+            relay.connect_to(sink)
+        return [*sinks, *relays, *sources]
+
+    def test_topological(self):
+        nodes = self.chains(3)
+        order = [node.name for node in topological(nodes)]
+        for i in range(2):
+            self.assertLess(order.index(f"source{i}"), order.index(f"relay{i}"))
+            self.assertLess(order.index(f"relay{i}"), order.index(f"sink{i}"))
+
+        # cycle
+        a = MyRelay(name='a')
+        b = MyRelay(name='b')
+        a.connect_to(b)
+        b.connect_to(a)
+        with self.assertRaises(ValueError):
+            topological([a, b])
+
+    def test_partition(self):
+        nodes = self.chains(3)
+
+        # the chains are not connected, two groups should not cut any connection
+        groups = partition(nodes, 2)
+        self.assertEqual(2, len(groups))
+        for group in groups:
+            self.assertEqual(1, len({node.name[-1] for node in group}), [node.name for node in group])
+
+        self.assertEqual(1, len(partition(nodes, 1)))
+        self.assertEqual(6, len(partition(nodes, 10)))
+        self.assertListEqual([], partition([], 2))
+        with self.assertRaises(ValueError):
+            partition(nodes, 0)
+
+    def test_scheduler(self):
+        nodes = self.chains(3)
+        self.assertTrue(all(node.stepped for node in nodes))
+        Scheduler(topological(nodes)).run()
+        for i in range(2):
+            self.assertListEqual(['0', '1', '2'], Path(f"_out/sink{i}.txt").read_text().split())
+
+        with self.assertRaises(ValueError):
+            Scheduler([MyThreadSink(name='thread')])
+
+    def test_direct(self):
+        Node.backend = 'direct'
+        nodes = self.chains(3)
+        Node.start_all()
+        # nothing runs before join_all(), which runs the nodes in this thread
+        self.assertFalse(Path('_out/sink0.txt').exists())
+        Node.join_all()
+        for i in range(2):
+            self.assertListEqual(['0', '1', '2'], Path(f"_out/sink{i}.txt").read_text().split())
+        self.assertFalse(any(node.is_alive() for node in nodes))
+        Node.terminate_all(1)
+
+        # thread based nodes cannot be stepped
+        MyThreadSink(name='thread')
+        with self.assertRaises(ValueError):
+            Node.start_all()
+
+        # a queue of the direct backend never waits
+        queue = DirectQueue()
+        queue.put(1)
+        self.assertEqual(1, queue.get())
+        with self.assertRaises(RuntimeError):
+            queue.get()
+        queue.put(2)
+        queue.shutdown()
+        self.assertEqual(2, queue.get())
+        with self.assertRaises(ShutDown):
+            queue.get()
+        with self.assertRaises(ShutDown):
+            queue.put(3)
+
+    def test_backends(self):
+        for backend, workers in [('thread', None), ('thread', 2), ('process', 2), ('direct', None)]:
+            Node.backend = backend
+            Node.workers = workers
+            self.chains(100)
+            Node.start_all()
+            Node.join_all()
+            for i in range(2):
+                self.assertListEqual(list(map(str, range(100))), Path(f"_out/sink{i}.txt").read_text().split())
+            Node.terminate_all(1)
+
+    def test_step(self):
+        # neither _work() nor _step()
+        class MyEmptyNode(TNode, DummylogMixIn):
+            pass
+
+        with self.assertRaises(TypeError):
+            MyEmptyNode(name='empty')
+
+        # an exception completes the node, and its downstreams
+        source = MySource(name='source', n=10)
+        relay = MyFailingRelay(name='relay')
+        sink = MySink(name='sink', path='_out/sink.txt')
+        source.connect_to(relay)
+        relay.connect_to(sink)
+        with self.assertLogs(level='ERROR'):
+            Node.start_all()
+            sink.join(5)
+            relay.join(5)
+        self.assertFalse(sink.is_alive())
+        self.assertFalse(relay.is_alive())
+
+        # a source without downstreams may return None
+        class MyNoneSource(TNode, DummylogMixIn):
+            def _step(self, msgs: list) -> None:
+                if self._done:
+                    raise StopIteration
+
+        lonely = MyNoneSource(name='lonely')
+        lonely._done = False
+        lonely._round()
+        lonely._done = True
+        with self.assertRaises(StopIteration):
+            lonely._round()
@@ -0,0 +1,101 @@
+from pathlib import Path
+from queue import ShutDown
+from unittest import TestCase
+
+import numpy as np
+
+from nodes.log import DummylogMixIn
+from nodes.node import Node, LNode, TNode
+from nodes.shm import Codec, ShmQueue
+
+
+class MyCodec(Codec):
+    """
+    Passes integer arrays.
+    """
+    rows = 4
+
+    @property
+    def fields(self) -> dict[str, np.dtype]:
+        return {'value': np.dtype(np.int64)}
+
+    def encode(self, msg) -> dict[str, np.ndarray] | None:
+        return {'value': msg} if isinstance(msg, np.ndarray) else None
+
+    def decode(self, columns: dict[str, np.ndarray]):
+        return columns['value']
+
+
+class MySender(TNode, DummylogMixIn):
+    codec = MyCodec()
+
+    def _work(self) -> None:
+        for i in range(20):
+            self._send([np.arange(i)] * len(self.downstreams))
+
+
+class MyReceiver(LNode, DummylogMixIn):
+    def _work(self) -> None:
+        with open('_out/shm.txt', 'w') as f:
+            while True:
+                f.write(f"{sum(self._receive()[0])}\n")
+
+
+class TestShmQueue(TestCase):
+    def setUp(self) -> None:
+        Path('_out').mkdir(exist_ok=True)
+
+    def tearDown(self) -> None:
+        Node.terminate_all(1)
+        Node.backend = 'thread'
+        Node.workers = None
+
+    def test_queue(self):
+        queue = ShmQueue(2, MyCodec())
+
+        # shared memory, views of the slots
+        queue.put(np.array([1, 2, 3]))
+        queue.put(np.array([4]))
+        msg = queue.get()
+        self.assertListEqual([1, 2, 3], list(msg))
+        self.assertIsInstance(msg.base, np.ndarray)
+        self.assertListEqual([4], list(queue.get()))
+
+        # overflow, pickled
+        queue.put(np.arange(10))
+        queue.put('hello')
+        self.assertListEqual(list(range(10)), list(queue.get()))
+        self.assertEqual('hello', queue.get())
+
+        # shutdown delivers the remaining messages
+        queue.put(np.array([]))
+        queue.shutdown()
+        with self.assertRaises(ShutDown):
+            queue.put(np.array([1]))
+        self.assertListEqual([], list(queue.get()))
+        with self.assertRaises(ShutDown):
+            queue.get()
+        with self.assertRaises(ShutDown):
+            queue.get()
+
+        # receiver side shutdown does not block on a full queue
+        queue = ShmQueue(1, MyCodec())
+        queue.put(np.array([1]))
+        queue.shutdown()
+        self.assertListEqual([1], list(queue.get()))
+        with self.assertRaises(ShutDown):
+            queue.get()
+
+    def test_process(self):
+        Node.backend = 'process'
+        Node.workers = 2
+
+        sender = MySender(name='sender')
+        receiver = MyReceiver(name='receiver')
+        sender.connect_to(receiver)
+
+        Path('_out/shm.txt').unlink(missing_ok=True)
+        Node.start_all()
+        Node.join_all()
+
+        self.assertListEqual([str(i * (i - 1) // 2) for i in range(20)], Path('_out/shm.txt').read_text().split())
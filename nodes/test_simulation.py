@@ -0,0 +1,103 @@
+from threading import Thread
+from time import perf_counter
+from unittest import TestCase
+
+from nodes.log import DummylogMixIn
+from nodes.node import Node, LNode, TNode
+from nodes.simulation import Simulation
+
+
+class MySource(TNode, DummylogMixIn):
+    """
+    Sends the numbers 0..*n*-1, one in each round.
+    """
+
+    def __init__(self, n: int, **kwargs):
+        super().__init__(**kwargs)
+        self._numbers = iter(range(n))
+
+    def _step(self, msgs: list) -> list:
+        return [next(self._numbers)] * len(self.downstreams)
+
+
+class MySink(LNode, DummylogMixIn):
+    """
+    Keeps the sum of the received messages.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.total = 0
+
+    def _step(self, msgs: list) -> None:
+        self.total += sum(msgs)
+
+
+def build(n: int) -> MySink:
+    sources = [MySource(name=f"source{i}", n=n) for i in range(3)]
+    sink = MySink(name='sink')
+    for source in sources: source.connect_to(sink)
+    return sink
+
+
+class TestSimulation(TestCase):
+    def tearDown(self) -> None:
+        Node.terminate_all(1)
+
+    def test_context(self):
+        outside = MySink(name='outside')
+        with Simulation(backend='direct') as simulation:
+            sink = build(10)
+            self.assertIs(simulation, Simulation.current())
+            self.assertListEqual(['source0', 'source1', 'source2', 'sink'], [node.name for node in Node.list_all()])
+            with Simulation() as inner:
+                MySink(name='inner')
+                self.assertListEqual(['inner'], [node.name for node in inner.nodes])
+            self.assertListEqual([], inner.nodes)
+            simulation.start()
+            simulation.join()
+            self.assertEqual(3 * 45, sink.total)
+        # the nodes are released on exit
+        self.assertListEqual([], simulation.nodes)
+        self.assertListEqual([outside], Node.list_all())
+
+        # joining a simulation not started returns
+        Simulation().join()
+
+    def test_concurrent(self):
+        results = {}
+
+        def run(backend: str, workers: int | None) -> None:
+            with Simulation(backend=backend, workers=workers) as simulation:
+                sink = build(100)
+                simulation.start()
+                simulation.join()
+                results[backend, workers] = sink.total, len(simulation.nodes)
+
+        threads = [Thread(target=run, args=args) for args in [('thread', None), ('thread', 2), ('direct', None)]]
+        for thread in threads: thread.start()
+        for thread in threads: thread.join(10)
+        self.assertDictEqual({key: (3 * 4950, 4) for key in [('thread', None), ('thread', 2), ('direct', None)]},
+                             results)
+        self.assertListEqual([], Node.list_all())
+
+    def test_join(self):
+        with Simulation() as simulation:
+            build(1)
+            start = perf_counter()
+            simulation.start()
+            simulation.join()
+            # completion is signalled, not polled
+            self.assertLess(perf_counter() - start, 0.05)
+
+        with Simulation() as simulation:
+            # runs until terminated
+            build(10 ** 9)
+            simulation.start()
+            joined = Thread(target=simulation.join)
+            joined.start()
+            joined.join(0.1)
+            self.assertTrue(joined.is_alive())
+            simulation.terminate(1)
+            joined.join(1)
+            self.assertFalse(joined.is_alive())